@@ -0,0 +1,44 @@
+"""Bulk package string parsing on a synthetic 100k lines catalog."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo
+from depsolver.package \
+    import \
+        SlottedPackageInfo, parse_package_string
+from depsolver.version \
+    import \
+        SemanticVersion
+
+from .common \
+    import \
+        bench, make_package_strings
+
+V = SemanticVersion.from_string
+
+def main():
+    package_strings = make_package_strings(n_names=1000, n_versions=100)
+    n = len(package_strings)
+
+    bench("parse_package_string loop", lambda: [parse_package_string(s, V) for s in package_strings],
+          repeat=1, unit_count=n, unit="packages")
+    try:
+        from depsolver.package import parse_package_strings
+    except ImportError:
+        pass
+    else:
+        bench("parse_package_strings", lambda: list(parse_package_strings(package_strings)),
+              repeat=1, unit_count=n, unit="packages")
+    for package_class in (PackageInfo, SlottedPackageInfo):
+        if hasattr(package_class, "from_strings"):
+            bench("%s.from_strings" % package_class.__name__,
+                  lambda: list(package_class.from_strings(package_strings)),
+                  repeat=1, unit_count=n, unit="packages")
+        else:
+            bench("%s.from_string loop" % package_class.__name__,
+                  lambda: [package_class.from_string(s) for s in package_strings],
+                  repeat=1, unit_count=n, unit="packages")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""DebianVersion construction, comparisons and sorting, against the
+character by character comparison (_compare_part)."""
+from __future__ import print_function
+
+import functools
+import random
+import warnings
+
+from depsolver.debian_version \
+    import \
+        DebianVersion, _cmp, _compare_part
+
+from .common \
+    import \
+        bench
+
+def make_version_strings(n, seed=0):
+    rng = random.Random(seed)
+    version_strings = []
+    for i in range(n):
+        s = "%d.%d" % (rng.randint(0, 9), rng.randint(0, 30))
+        if rng.random() < 0.5:
+            s += ".%d" % rng.randint(0, 20)
+        if rng.random() < 0.2:
+            s += rng.choice(["~rc%d" % rng.randint(1, 3), "+dfsg", "a", "~beta%d" % rng.randint(1, 3)])
+        if rng.random() < 0.2:
+            s = "%d:%s" % (rng.randint(0, 2), s)
+        if rng.random() < 0.7:
+            s += "-%d" % rng.randint(0, 5)
+            if rng.random() < 0.2:
+                s += rng.choice(["ubuntu%d" % rng.randint(1, 3), "~bpo%d" % rng.randint(1, 3)])
+        version_strings.append(s)
+    return version_strings
+
+def _reference_cmp(left, right):
+    st = _cmp(int(left.epoch or 0), int(right.epoch or 0))
+    if st == 0:
+        st = _compare_part(left.upstream, right.upstream)
+    if st == 0:
+        st = _compare_part(left.revision or "0", right.revision or "0")
+    return st
+
+def main():
+    warnings.simplefilter("ignore")
+    version_strings = make_version_strings(20000)
+    n = len(version_strings)
+
+    bench("DebianVersion.from_string", lambda: [DebianVersion.from_string(s) for s in version_strings],
+          unit_count=n, unit="versions")
+
+    versions = [DebianVersion.from_string(s) for s in version_strings]
+    pairs = list(zip(versions, versions[1:] + versions[:1]))
+    bench("version < version", lambda: [a < b for a, b in pairs],
+          unit_count=n, unit="ops")
+    bench("version == version", lambda: [a == b for a, b in pairs],
+          unit_count=n, unit="ops")
+    bench("hash(version)", lambda: [hash(v) for v in versions],
+          unit_count=n, unit="ops")
+    bench("sorted(versions)", lambda: sorted(versions),
+          unit_count=n, unit="versions")
+    bench("sorted(versions), _compare_part",
+          lambda: sorted(versions, key=functools.cmp_to_key(_reference_cmp)),
+          unit_count=n, unit="versions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Micro-benchmarks of the package identity operations (hash, equality,
+unique_name, package_string) used by the rules generator, policy and
+transactions, for packages added to a pool."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository, Request, Requirement
+from depsolver.compat \
+    import \
+        OrderedDict
+from depsolver.package \
+    import \
+        SlottedPackageInfo
+from depsolver.solver.rules_generator \
+    import \
+        RulesGenerator
+
+from .common \
+    import \
+        bench, make_package_strings
+
+R = Requirement.from_string
+
+def main():
+    package_strings = make_package_strings(n_names=50, n_versions=20)
+    n = len(package_strings)
+
+    for package_class in (PackageInfo, SlottedPackageInfo):
+        label = package_class.__name__
+        packages = [package_class.from_string(s) for s in package_strings]
+        others = [package_class.from_string(s) for s in package_strings]
+        pool = Pool([Repository(packages), Repository(others)])
+        pairs = list(zip(packages, others))
+
+        bench("%s: hash" % label, lambda: [hash(p) for p in packages],
+              number=10, unit_count=n, unit="ops")
+        bench("%s: unique_name" % label, lambda: [p.unique_name for p in packages],
+              number=10, unit_count=n, unit="ops")
+        bench("%s: package_string" % label, lambda: [p.package_string for p in packages],
+              number=10, unit_count=n, unit="ops")
+        bench("%s: == (same package)" % label, lambda: [p == p for p in packages],
+              number=10, unit_count=n, unit="ops")
+        bench("%s: == (same content, other id)" % label,
+              lambda: [p == q for p, q in pairs],
+              number=10, unit_count=n, unit="ops")
+        table = dict((p, p.id) for p in packages)
+        bench("%s: dict lookup" % label, lambda: [table[p] for p in packages],
+              number=10, unit_count=n, unit="ops")
+
+        def rules():
+            request = Request(pool)
+            request.install(R("package10"))
+            list(RulesGenerator(pool, request, OrderedDict()).iter_rules())
+        bench("%s: rules for one request" % label, rules, repeat=1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Requirement interning: how many of the requirements of a synthetic
+catalog are shared, and the parsing time and memory of the catalog.
+
+Requires python 3.4 or later (tracemalloc).
+"""
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+from depsolver \
+    import \
+        PackageInfo
+
+from .common \
+    import \
+        bench, make_package_strings
+
+_KINDS = ["dependencies", "provides", "conflicts", "replaces", "suggests"]
+
+def main():
+    package_strings = make_package_strings(n_names=200, n_versions=50)
+    n = len(package_strings)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        packages = [PackageInfo.from_string(s) for s in package_strings]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    requirements = [requirement for package in packages
+                    for kind in _KINDS for requirement in getattr(package, kind)]
+    n_distinct = len(set(id(requirement) for requirement in requirements))
+    n_equal = len(set(requirements))
+    print("%d requirements, %d distinct objects, %d distinct values" \
+          % (len(requirements), n_distinct, n_equal))
+    print("dedup ratio: %.1f" % (len(requirements) / float(n_distinct)))
+    print("%-50s %10.0f bytes/package" % ("memory", size / n))
+    del packages
+
+    bench("PackageInfo.from_string", lambda: [PackageInfo.from_string(s) for s in package_strings],
+          repeat=1, unit_count=n, unit="packages")
+
+if __name__ == "__main__":
+    main()
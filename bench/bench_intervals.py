@@ -0,0 +1,63 @@
+"""Interval set operations, and the dependency rules saved by dropping
+redundant dependencies."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository, Request, Requirement
+from depsolver.compat \
+    import \
+        OrderedDict
+from depsolver.interval_set \
+    import \
+        IntervalSet
+from depsolver.solver.rules_generator \
+    import \
+        RulesGenerator
+from depsolver.version \
+    import \
+        SemanticVersion
+
+from .common \
+    import \
+        bench
+
+V = SemanticVersion.from_string
+R = Requirement.from_string
+
+def make_interval_set(k, offset):
+    return IntervalSet([(V("%d.0.0" % (4 * i + offset)), True,
+                         V("%d.0.0" % (4 * i + offset + 2)), False)
+                        for i in range(k)])
+
+def main():
+    for k in (1, 4, 16, 64):
+        left, right = make_interval_set(k, 0), make_interval_set(k, 1)
+        for operation in ("intersect", "union", "subsumes"):
+            method = getattr(left, operation)
+            bench("IntervalSet.%s, k = %d" % (operation, k), lambda: method(right),
+                  number=1000, unit_count=1, unit="ops")
+
+    # Every package depends on its predecessor twice: once with a lower
+    # bound, and once with a narrower range
+    package_strings = []
+    for i in range(100):
+        for j in range(10):
+            s = "package%d-1.%d.0" % (i, j)
+            if i > 0:
+                s += "; depends (package%d >= 1.0.0); depends (package%d >= 1.2.0, package%d < 1.8.0)" \
+                     % (i - 1, i - 1, i - 1)
+            package_strings.append(s)
+    pool = Pool([Repository([PackageInfo.from_string(s) for s in package_strings])])
+
+    def rules():
+        request = Request(pool)
+        request.install(R("package99"))
+        return RulesGenerator(pool, request, OrderedDict()).iter_rules()
+    rules_set = rules()
+    print("%d rules, %d dependency rules" % (len(rules_set),
+          len([rule for rule in rules_set if rule.reason == "package_requires"])))
+    bench("rules for one request", rules, repeat=1)
+
+if __name__ == "__main__":
+    main()
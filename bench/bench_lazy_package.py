@@ -0,0 +1,44 @@
+"""PackageInfo vs LazyPackageInfo, when most packages are never reached by
+the rules generator."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository, Request, Requirement
+from depsolver.compat \
+    import \
+        OrderedDict
+from depsolver.package \
+    import \
+        LazyPackageInfo
+from depsolver.solver.rules_generator \
+    import \
+        RulesGenerator
+
+from .common \
+    import \
+        bench, make_package_strings
+
+R = Requirement.from_string
+
+def main():
+    package_strings = make_package_strings(n_names=200, n_versions=50)
+    n = len(package_strings)
+
+    for package_class in (PackageInfo, LazyPackageInfo):
+        label = package_class.__name__
+        bench("%s.from_string" % label,
+              lambda: [package_class.from_string(s) for s in package_strings],
+              repeat=1, unit_count=n, unit="packages")
+
+        def build_and_generate():
+            packages = [package_class.from_string(s) for s in package_strings]
+            pool = Pool([Repository(packages)])
+            request = Request(pool)
+            request.install(R("package5"))
+            list(RulesGenerator(pool, request, OrderedDict()).iter_rules())
+        bench("%s: pool + rules for one request" % label, build_and_generate,
+              repeat=1, unit_count=n, unit="packages")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Memory used by a Pool vs a ColumnarPool holding the same packages.
+
+Requires python 3.4 or later (tracemalloc).
+"""
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository, Requirement
+from depsolver.pool \
+    import \
+        ColumnarPool
+
+from .common \
+    import \
+        make_package_strings
+
+R = Requirement.from_string
+
+def measure(label, func):
+    """Print the memory still allocated by the object func returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    print("%-50s %10.1f MB" % (label, size / 1024. / 1024.))
+    return result
+
+def main():
+    package_strings = make_package_strings(n_names=500, n_versions=40)
+    n = len(package_strings)
+
+    def pool():
+        return Pool([Repository([PackageInfo.from_string(s) for s in package_strings])])
+    measure("Pool (%d packages)" % n, pool)
+
+    def columnar_pool():
+        pool = ColumnarPool()
+        pool.add_package_strings(package_strings)
+        return pool
+    measure("ColumnarPool (%d packages)" % n, columnar_pool)
+
+    def columnar_pool_lookups():
+        pool = columnar_pool()
+        for i in range(0, 500, 10):
+            pool.what_provides(R("package%d" % i))
+        return pool
+    measure("ColumnarPool, 50 names looked up", columnar_pool_lookups)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Repository creation from package strings, serial vs parallel."""
+from __future__ import print_function
+
+import multiprocessing
+
+from depsolver \
+    import \
+        Repository
+
+from .common \
+    import \
+        bench, make_package_strings
+
+def main():
+    package_strings = make_package_strings(n_names=200, n_versions=50)
+    n = len(package_strings)
+
+    n_cpus = multiprocessing.cpu_count()
+    workers = sorted(set([1, 2, 4, n_cpus]))
+    for n_workers in workers:
+        bench("Repository.from_strings (%d workers)" % n_workers,
+              lambda: Repository.from_strings(package_strings, workers=n_workers),
+              repeat=1, unit_count=n, unit="packages")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Repeated parsing of the same requirement strings, as done by the rules
+generator, the policy and PackageRule."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository, Request, Requirement
+from depsolver.compat \
+    import \
+        OrderedDict
+from depsolver.requirement_parser \
+    import \
+        RawRequirementParser
+from depsolver.solver.rules_generator \
+    import \
+        RulesGenerator
+
+from .common \
+    import \
+        bench, make_package_strings
+
+R = Requirement.from_string
+
+def main():
+    package_strings = make_package_strings(n_names=50, n_versions=20)
+    packages = [PackageInfo.from_string(s) for s in package_strings]
+    names = [p.name for p in packages]
+    requirement_strings = [str(r) for p in packages for r in p.dependencies]
+
+    bench("Requirement.from_string(name)", lambda: [R(name) for name in names],
+          number=10, unit_count=len(names), unit="requirements")
+    bench("Requirement.from_string(requirement)",
+          lambda: [R(s) for s in requirement_strings],
+          number=10, unit_count=len(requirement_strings), unit="requirements")
+    parser = RawRequirementParser()
+    bench("RawRequirementParser.parse(requirement)",
+          lambda: [parser.parse(s) for s in requirement_strings],
+          number=10, unit_count=len(requirement_strings), unit="requirements")
+
+    pool = Pool([Repository(packages)])
+    def rules():
+        request = Request(pool)
+        request.install(R("package49"))
+        list(RulesGenerator(pool, request, OrderedDict()).iter_rules())
+    bench("rules for one request", rules, repeat=1)
+
+    try:
+        from depsolver.requirement import parse_cache_info
+    except ImportError:
+        pass
+    else:
+        print(parse_cache_info())
+
+if __name__ == "__main__":
+    main()
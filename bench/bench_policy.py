@@ -0,0 +1,48 @@
+"""DefaultPolicy.select_preferred_packages on wide version fans: many
+candidates for few names, as when the solver picks among every version of a
+package."""
+from __future__ import print_function
+
+import random
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository
+from depsolver.solver.policy \
+    import \
+        DefaultPolicy
+
+from .common \
+    import \
+        bench
+
+def make_pool(n_names, n_versions, seed=0):
+    rng = random.Random(seed)
+    package_strings = []
+    for i in range(n_names):
+        for j in range(n_versions):
+            version = "%d.%d.%d" % (j // 100, j % 100, rng.randint(0, 3))
+            if rng.random() < 0.2:
+                version += "-rc.%d" % rng.randint(1, 5)
+            package_strings.append("package%d-%s" % (i, version))
+    rng.shuffle(package_strings)
+    packages = [PackageInfo.from_string(s) for s in package_strings]
+    return Pool([Repository(packages)]), packages
+
+def main():
+    policy = DefaultPolicy()
+    for n_names, n_versions in [(1, 2000), (10, 500), (100, 50)]:
+        pool, packages = make_pool(n_names, n_versions)
+        queue = [p.id for p in packages]
+        installed_map = dict((p.id, True) for p in packages[:n_names])
+
+        policy.select_preferred_packages(pool, {}, queue)
+        bench("select_preferred_packages %d x %d" % (n_names, n_versions),
+              lambda: policy.select_preferred_packages(pool, {}, queue),
+              number=10, unit_count=len(queue), unit="candidates")
+        bench("  with installed packages",
+              lambda: policy.select_preferred_packages(pool, installed_map, queue),
+              number=10, unit_count=len(queue), unit="candidates")
+
+if __name__ == "__main__":
+    main()
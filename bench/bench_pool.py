@@ -0,0 +1,60 @@
+"""Throughput of Pool.what_provides, Pool.matches and Pool.what_requires."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository, Requirement
+
+from .common \
+    import \
+        bench, make_package_strings
+
+R = Requirement.from_string
+
+def main():
+    packages = [PackageInfo.from_string(s)
+                for s in make_package_strings(n_names=200, n_versions=50)]
+    # cache_size=0 disables the what_provides cache, so that we measure the
+    # lookup itself
+    pool = Pool([Repository(packages)], cache_size=0)
+
+    requirements = [R("package%d >= 1.0.0, package%d < 2.0.0" % (i, i))
+                    for i in range(200)]
+    requirements.extend(R("package%d" % i) for i in range(200))
+
+    def what_provides():
+        for requirement in requirements:
+            pool.what_provides(requirement)
+    bench("what_provides (%d requirements)" % len(requirements), what_provides,
+          number=5, unit_count=len(requirements), unit="lookups")
+
+    # package3 candidates are checked against their version, the others
+    # against their provides
+    candidates = [package for package in packages if package.name == "package3"]
+    candidates.extend(packages[:50])
+    requirement = R("package3 >= 1.0.0")
+    def matches():
+        for candidate in candidates:
+            pool.matches(candidate, requirement)
+    bench("matches (%d candidates)" % len(candidates), matches,
+          number=20, unit_count=len(candidates), unit="matches")
+
+    # Reverse dependencies of 5 packages, with the index vs scanning every
+    # package of the pool
+    targets = packages[::2000]
+    def what_requires():
+        for target in targets:
+            pool.what_requires(target)
+    bench("what_requires (%d packages)" % len(targets), what_requires,
+          unit_count=len(targets), unit="lookups")
+
+    def scan():
+        for target in targets:
+            [package for package in packages
+             if any(any(provider is target for provider in pool.what_provides(dependency))
+                    for dependency in package.dependencies)]
+    bench("what_requires by scanning (%d packages)" % len(targets), scan,
+          repeat=1, unit_count=len(targets), unit="lookups")
+
+if __name__ == "__main__":
+    main()
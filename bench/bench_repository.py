@@ -0,0 +1,38 @@
+"""Throughput of Repository lookups."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo, Repository
+
+from .common \
+    import \
+        bench, make_package_strings
+
+def main():
+    packages = [PackageInfo.from_string(s)
+                for s in make_package_strings(n_names=200, n_versions=50)]
+    repository = Repository(packages)
+    n = len(packages)
+
+    def find_package():
+        for package in packages:
+            repository.find_package(package.name, package.version)
+    bench("find_package (%d packages)" % n, find_package, unit_count=n,
+          unit="lookups")
+
+    def find_package_many():
+        repository.find_package_many((package.name, package.version)
+                                     for package in packages)
+    bench("find_package_many (%d packages)" % n, find_package_many,
+          unit_count=n, unit="lookups")
+
+    names = ["package%d" % i for i in range(200)]
+    def find_packages():
+        for name in names:
+            repository.find_packages(name)
+    bench("find_packages (%d names)" % len(names), find_packages, number=10,
+          unit_count=len(names), unit="lookups")
+
+if __name__ == "__main__":
+    main()
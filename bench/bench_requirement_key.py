@@ -0,0 +1,50 @@
+"""Requirement hashing and equality, as used for dict and set keys and
+package comparisons."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository, Requirement
+from depsolver.requirement_parser \
+    import \
+        RawRequirementParser
+
+from .common \
+    import \
+        bench, make_package_strings
+
+def main():
+    package_strings = make_package_strings(n_names=100, n_versions=20)
+    packages = [PackageInfo.from_string(s) for s in package_strings]
+    # Distinct but equal copies of the packages (not added to a pool, so
+    # that comparisons go down to the requirements)
+    def copy_packages():
+        return [PackageInfo(p.name, p.version, dependencies=list(p.dependencies),
+                            provides=list(p.provides)) for p in packages]
+    copies, other_copies = copy_packages(), copy_packages()
+    requirements = [r for p in packages for r in p.dependencies + p.provides]
+    n = len(requirements)
+
+    parser = RawRequirementParser()
+    specs = [(r.name, list(parser.parse(str(r)).values())[0]) for r in requirements]
+    bench("Requirement(...)", lambda: [Requirement(name, s) for name, s in specs],
+          unit_count=n, unit="requirements")
+
+    bench("hash(requirement)", lambda: [hash(r) for r in requirements],
+          number=10, unit_count=n, unit="ops")
+    bench("requirement == requirement", lambda: [r == r for r in requirements],
+          number=10, unit_count=n, unit="ops")
+    bench("set(requirements)", lambda: set(requirements),
+          number=10, unit_count=n, unit="requirements")
+    bench("package == equal package", lambda: [p == q for p, q in zip(copies, other_copies)],
+          number=10, unit_count=len(copies), unit="ops")
+
+    pool = Pool([Repository(packages)])
+    queries = requirements[:2000]
+    for r in queries:
+        pool.what_provides(r)
+    bench("cached pool.what_provides", lambda: [pool.what_provides(r) for r in queries],
+          number=10, unit_count=len(queries), unit="ops")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Requirement string parser throughput."""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        PackageInfo
+from depsolver.requirement_parser \
+    import \
+        RawRequirementParser
+
+from .common \
+    import \
+        bench, make_package_strings
+
+def main():
+    package_strings = make_package_strings(n_names=200, n_versions=50)
+    requirement_strings = []
+    for package_string in package_strings:
+        for section in package_string.split(";")[1:]:
+            requirement_strings.extend(section.strip()[:-1].split("(", 1)[1].split(","))
+    requirement_strings += ["numpy == 1.*", "numpy *", "mkl", "numpy != 1.3.0"] * 1000
+    n = len(requirement_strings)
+
+    parser = RawRequirementParser()
+    bench("RawRequirementParser.parse", lambda: [parser.parse(s) for s in requirement_strings],
+          unit_count=n, unit="requirements")
+    if hasattr(parser, "parse_tokens"):
+        bench("RawRequirementParser.parse_tokens",
+              lambda: [parser.parse_tokens(s) for s in requirement_strings],
+              unit_count=n, unit="requirements")
+    bench("PackageInfo.from_string", lambda: [PackageInfo.from_string(s) for s in package_strings],
+          repeat=1, unit_count=len(package_strings), unit="packages")
+
+if __name__ == "__main__":
+    main()
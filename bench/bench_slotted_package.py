@@ -0,0 +1,57 @@
+"""PackageInfo vs SlottedPackageInfo: construction time and memory per
+package.
+
+Requires python 3.4 or later (tracemalloc).
+"""
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository
+from depsolver.package \
+    import \
+        SlottedPackageInfo
+
+from .common \
+    import \
+        bench, make_package_strings
+
+def main():
+    package_strings = make_package_strings(n_names=200, n_versions=50)
+    n = len(package_strings)
+    # Versions and requirements are shared by every package below, so that
+    # only the package objects themselves are measured
+    parsed = [PackageInfo.from_string(s) for s in package_strings]
+    fields = [(p.name, p.version, p.version_factory, p.dependencies, p.provides)
+              for p in parsed]
+
+    for package_class in (PackageInfo, SlottedPackageInfo):
+        label = package_class.__name__
+        bench("%s.from_string" % label,
+              lambda: [package_class.from_string(s) for s in package_strings],
+              repeat=1, unit_count=n, unit="packages")
+
+        def construct():
+            return [package_class(name, version, version_factory,
+                                  dependencies=dependencies, provides=provides)
+                    for name, version, version_factory, dependencies, provides in fields]
+        bench("%s(...)" % label, construct, unit_count=n, unit="packages")
+        bench("%s: Pool(Repository(...))" % label,
+              lambda: Pool([Repository(construct())]),
+              repeat=1, unit_count=n, unit="packages")
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            packages = construct()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        print("%-50s %10.0f bytes/package" % ("%s memory" % label, size / n))
+        del packages
+
+if __name__ == "__main__":
+    main()
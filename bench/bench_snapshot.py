@@ -0,0 +1,43 @@
+"""Pool creation from package strings vs from a binary snapshot."""
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository
+from depsolver.pool \
+    import \
+        ColumnarPool
+
+from .common \
+    import \
+        bench, make_package_strings
+
+def main():
+    package_strings = make_package_strings(n_names=200, n_versions=50)
+    n = len(package_strings)
+
+    def from_strings():
+        return Pool([Repository([PackageInfo.from_string(s) for s in package_strings])])
+    bench("pool from %d package strings" % n, from_strings, unit_count=n,
+          unit="packages")
+
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, "pool.snapshot")
+        pool = from_strings()
+        bench("save_snapshot", lambda: pool.save_snapshot(path), unit_count=n,
+              unit="packages")
+        print("snapshot size: %d bytes" % os.path.getsize(path))
+        bench("load_snapshot", lambda: Pool.load_snapshot(path), unit_count=n,
+              unit="packages")
+        bench("load_snapshot (ColumnarPool)", lambda: ColumnarPool.load_snapshot(path),
+              unit_count=n, unit="packages")
+    finally:
+        shutil.rmtree(tempdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Peak RSS of loading a gzip JSON-lines index, list-based vs streaming.
+
+Each loading strategy runs in its own process, so that ru_maxrss measures it
+alone (unix only).
+"""
+from __future__ import print_function
+
+import gzip
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from depsolver \
+    import \
+        PackageInfo, Pool, Repository
+from depsolver.pool \
+    import \
+        ColumnarPool
+
+from .common \
+    import \
+        make_package_strings
+
+def _load_list(path):
+    # Read the whole index first, then build the packages
+    fp = gzip.GzipFile(path, "rb")
+    try:
+        package_strings = [json.loads(line.decode("utf-8")) for line in fp]
+    finally:
+        fp.close()
+    packages = [PackageInfo.from_string(s) for s in package_strings]
+    return Pool([Repository(packages)])
+
+def _load_stream(path):
+    return Pool([Repository.from_jsonl(path)])
+
+def _load_columnar(path):
+    pool = ColumnarPool()
+    pool.add_packages(Repository.iter_from_jsonl(path))
+    return pool
+
+_MODES = {"list": _load_list, "stream": _load_stream, "columnar": _load_columnar}
+
+def _max_rss():
+    # kB on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def main():
+    if len(sys.argv) == 3:
+        mode, path = sys.argv[1:]
+        baseline = _max_rss()
+        _MODES[mode](path)
+        print("%-50s %10.1f MB (%.1f MB above start)" \
+              % ("peak RSS (%s)" % mode, _max_rss() / 1024., (_max_rss() - baseline) / 1024.))
+        return
+
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, "index.jsonl.gz")
+        fp = gzip.GzipFile(path, "wb")
+        try:
+            for package_string in make_package_strings(n_names=500, n_versions=40):
+                fp.write(json.dumps(package_string).encode("utf-8") + b"\n")
+        finally:
+            fp.close()
+
+        for mode in ("list", "stream", "columnar"):
+            subprocess.check_call([sys.executable, "-m", "bench.bench_streaming", mode, path])
+    finally:
+        shutil.rmtree(tempdir)
+
+if __name__ == "__main__":
+    main()
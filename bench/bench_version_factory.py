@@ -0,0 +1,58 @@
+"""Version parsing with and without interning, on the version strings of a
+synthetic catalog (package versions and requirement versions)."""
+from __future__ import print_function
+
+import re
+
+from depsolver.package \
+    import \
+        SlottedPackageInfo
+from depsolver.requirement \
+    import \
+        Requirement
+from depsolver.version \
+    import \
+        SemanticVersion
+
+from .common \
+    import \
+        bench, make_package_strings
+
+_VERSION_STRING_RE = re.compile(r"\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?")
+
+def main():
+    package_strings = make_package_strings(n_names=200, n_versions=50)
+    version_strings = [s for package_string in package_strings
+                       for s in _VERSION_STRING_RE.findall(package_string)]
+    n = len(version_strings)
+    print("%d version strings, %d distinct" % (n, len(set(version_strings))))
+
+    bench("SemanticVersion.from_string", lambda: [SemanticVersion.from_string(s) for s in version_strings],
+          unit_count=n, unit="versions")
+    try:
+        from depsolver.version import InterningVersionFactory, clear_version_cache
+    except ImportError:
+        pass
+    else:
+        factory = InterningVersionFactory(SemanticVersion.from_string)
+        def cold():
+            clear_version_cache()
+            return [factory(s) for s in version_strings]
+        bench("InterningVersionFactory (cold)", cold, unit_count=n, unit="versions")
+        bench("InterningVersionFactory (warm)", lambda: [factory(s) for s in version_strings],
+              unit_count=n, unit="versions")
+
+    specs = [(r.name, r) for r in (Requirement.from_string("mkl >= %s, mkl < 11.0.0, mkl != 10.3.1" % s)
+                                   for s in version_strings[:5000])]
+    from depsolver.requirement_parser import RawRequirementParser
+    parser = RawRequirementParser()
+    raw_specs = [list(parser.parse(str(r)).items())[0] for _, r in specs]
+    bench("Requirement(name, specs)", lambda: [Requirement(name, s) for name, s in raw_specs],
+          unit_count=len(raw_specs), unit="requirements")
+
+    bench("SlottedPackageInfo.from_string loop",
+          lambda: [SlottedPackageInfo.from_string(s) for s in package_strings],
+          unit_count=len(package_strings), unit="packages")
+
+if __name__ == "__main__":
+    main()
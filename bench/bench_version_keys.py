@@ -0,0 +1,52 @@
+"""Matching a requirement against every version of a name: Python loops vs
+version_keys.match_mask, and Pool.what_provides with and without it.
+
+Requires NumPy.
+"""
+from __future__ import print_function
+
+from depsolver \
+    import \
+        Pool, Repository, Requirement
+from depsolver.package \
+    import \
+        SlottedPackageInfo
+from depsolver import pool as pool_module
+from depsolver import version_keys
+
+from .common \
+    import \
+        bench
+
+R = Requirement.from_string
+
+def main():
+    requirement = R("numpy >= 1.10.0, numpy != 1.20.0, numpy != 1.30.0, numpy < 3.0.0")
+    for n in (1000, 5000, 20000):
+        packages = [SlottedPackageInfo.from_string("numpy-%d.%d.0" % (i // 100, i % 100))
+                    for i in range(n)]
+        pool = Pool([Repository(packages)])
+        versions = pool._versions_by_name["numpy"]
+
+        bench("n = %d: loop of Requirement.matches" % n,
+              lambda: [p for p in packages if requirement.matches(p.version_requirement)],
+              unit_count=n, unit="versions")
+        bench("n = %d: loop of IntervalSet.contains" % n,
+              lambda: [v for v in versions if requirement.intervals.contains(v)],
+              unit_count=n, unit="versions")
+        bench("n = %d: pack_versions" % n, lambda: version_keys.pack_versions(versions),
+              unit_count=n, unit="versions")
+        distinct_versions, keys = version_keys.pack_versions(versions)
+        bench("n = %d: match_mask" % n,
+              lambda: version_keys.match_mask(requirement, distinct_versions, keys),
+              number=100, unit_count=n, unit="versions")
+
+        for label, threshold in (("bisect + filter", n + 1), ("match_mask", 1)):
+            pool_module._MATCH_MASK_THRESHOLD = threshold
+            pool._version_keys("numpy")
+            bench("n = %d: uncached what_provides, %s" % (n, label),
+                  lambda: pool._compute_what_provides(requirement, "composer"),
+                  number=100, unit_count=n, unit="versions")
+
+if __name__ == "__main__":
+    main()
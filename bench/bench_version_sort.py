@@ -0,0 +1,55 @@
+"""SemanticVersion comparisons and sorting."""
+from __future__ import print_function
+
+import random
+
+from depsolver.version \
+    import \
+        SemanticVersion
+
+from .common \
+    import \
+        bench
+
+V = SemanticVersion.from_string
+
+def make_version_strings(n, seed=0):
+    rng = random.Random(seed)
+    version_strings = []
+    for i in range(n):
+        s = "%d.%d.%d" % (rng.randint(0, 5), rng.randint(0, 20), rng.randint(0, 10))
+        if rng.random() < 0.3:
+            s += "-%s.%d" % (rng.choice(["alpha", "beta", "rc"]), rng.randint(1, 12))
+        if rng.random() < 0.2:
+            s += "+build.%d" % rng.randint(1, 100)
+        version_strings.append(s)
+    return version_strings
+
+def main():
+    version_strings = make_version_strings(20000)
+    n = len(version_strings)
+
+    bench("SemanticVersion.from_string", lambda: [V(s) for s in version_strings],
+          unit_count=n, unit="versions")
+
+    versions = [V(s) for s in version_strings]
+    pairs = list(zip(versions, versions[1:] + versions[:1]))
+    bench("version < version", lambda: [a < b for a, b in pairs],
+          number=10, unit_count=n, unit="ops")
+    bench("version <= version", lambda: [a <= b for a, b in pairs],
+          number=10, unit_count=n, unit="ops")
+    bench("version > version", lambda: [a > b for a, b in pairs],
+          number=10, unit_count=n, unit="ops")
+    bench("version == version", lambda: [a == b for a, b in pairs],
+          number=10, unit_count=n, unit="ops")
+    bench("hash(version)", lambda: [hash(v) for v in versions],
+          number=10, unit_count=n, unit="ops")
+    bench("sorted(versions)", lambda: sorted(versions),
+          unit_count=n, unit="versions")
+    if hasattr(SemanticVersion, "sort_key"):
+        bench("sorted(versions, key=sort_key)",
+              lambda: sorted(versions, key=lambda v: v.sort_key),
+              unit_count=n, unit="versions")
+
+if __name__ == "__main__":
+    main()
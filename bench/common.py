@@ -0,0 +1,48 @@
+"""Helpers shared by the benchmark scripts.
+
+Benchmarks are run from the top of the source tree, e.g.::
+
+    python -m bench.bench_pool
+"""
+from __future__ import print_function
+
+import random
+import timeit
+
+def make_package_strings(n_names=100, n_versions=20, seed=0):
+    """Return a list of package strings for a synthetic catalog.
+
+    Each of the n_names packages comes in n_versions versions, and depends on
+    a couple of other packages with version ranges. Every tenth package also
+    provides an alias.
+    """
+    rng = random.Random(seed)
+    names = ["package%d" % i for i in range(n_names)]
+    package_strings = []
+    for i, name in enumerate(names):
+        for j in range(n_versions):
+            version = "%d.%d.0" % (j // 10, j % 10)
+            sections = ["%s-%s" % (name, version)]
+            if i > 0:
+                dependencies = []
+                for dependency in rng.sample(names[:i], min(i, 2)):
+                    low = rng.randrange(n_versions // 2)
+                    dependencies.append("%s >= %d.%d.0" % (dependency, low // 10, low % 10))
+                sections.append("depends (%s)" % ", ".join(dependencies))
+            if i % 10 == 0:
+                sections.append("provides (%s_alias == %s)" % (name, version))
+            package_strings.append("; ".join(sections))
+    return package_strings
+
+def bench(label, func, number=1, repeat=3, unit_count=None, unit="ops"):
+    """Time func and print the best time, and optionally a throughput.
+
+    Returns the best time (in seconds) for number calls of func.
+    """
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    if unit_count is None:
+        print("%-50s %10.3f ms" % (label, best * 1e3))
+    else:
+        print("%-50s %10.3f ms %12.0f %s/s" \
+              % (label, best * 1e3, unit_count * number / best, unit))
+    return best
@@ -0,0 +1,182 @@
+"""Binary snapshots of a pool's packages.
+
+A snapshot holds every package of a pool, already parsed, so that a pool can
+be recreated without going through the package string parser. The file
+starts with a header giving the offset and size of each section::
+
+    magic (16 bytes) | format version, number of sections (2 x uint32) |
+    (offset, size) of each section (2 x uint64 per section) | sections...
+
+The strings section is a blob of utf-8 encoded strings. It includes the
+numbers of the versions, which are interned as strings by the package
+store, so that they can be arbitrarily large. The other sections are
+arrays of little endian int32, holding string indices, ids and offsets:
+
+    - string_offsets: the offset of each string of the package store in
+      the strings blob.
+    - the arrays of the package store, as listed in _store.ARRAYS.
+    - repository_names: the name of each repository, in pool order. The
+      repositories column of the package store indexes this section.
+    - scheduler_names, scheduler_constraints: the repository priority
+      constraints.
+    - meta: the next package id of the pool.
+
+See _store for the layout of the package store.
+"""
+import mmap
+import os
+import struct
+import sys
+
+import six
+
+from .errors \
+    import \
+        DepSolverError
+from ._store \
+    import \
+        ARRAYS, PackageStore, int_array
+
+_MAGIC = b"DEPSOLVER-POOL\0\0"
+# 2: version numbers are stored as strings
+_FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<16sII")
+_SECTION_ENTRY = struct.Struct("<QQ")
+
+_SECTIONS = ["strings", "string_offsets"] + ARRAYS + \
+            ["repository_names", "scheduler_names", "scheduler_constraints", "meta"]
+
+def _array_to_bytes(a):
+    if sys.byteorder == "big":
+        a = int_array(a)
+        a.byteswap()
+    if six.PY3:
+        return a.tobytes()
+    else:
+        return a.tostring()
+
+def _array_from_bytes(data):
+    a = int_array()
+    if six.PY3:
+        a.frombytes(data)
+    else:
+        a.fromstring(data)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+def _encode_strings(strings):
+    encoded_strings = [s.encode("utf-8") for s in strings]
+    offsets = int_array([0])
+    for encoded_string in encoded_strings:
+        offsets.append(offsets[-1] + len(encoded_string))
+    return b"".join(encoded_strings), offsets
+
+def _decode_strings(blob, offsets):
+    return [blob[offsets[i]:offsets[i+1]].decode("utf-8")
+            for i in range(len(offsets) - 1)]
+
+def save_snapshot(pool, store, path):
+    """Write a snapshot of the given pool, whose packages are in the given
+    store.
+
+    The repositories column of the store must index pool.repositories.
+    """
+    scheduler = pool._scheduler._scheduler
+    strings = list(store.strings)
+    string_indices = dict((s, i) for i, s in enumerate(strings))
+    def _string(s):
+        s = six.text_type(s)
+        index = string_indices.get(s)
+        if index is None:
+            index = string_indices[s] = len(strings)
+            strings.append(s)
+        return index
+
+    repository_names = int_array(_string(repository.name) for repository in pool.repositories)
+    scheduler_names = int_array(_string(name) for name in scheduler.names)
+    scheduler_constraints = int_array()
+    for name, afters in six.iteritems(scheduler.before):
+        for after in afters:
+            scheduler_constraints.extend([_string(name), _string(after)])
+
+    sections = {
+        "repository_names": repository_names,
+        "scheduler_names": scheduler_names,
+        "scheduler_constraints": scheduler_constraints,
+        "meta": int_array([pool._id]),
+    }
+    sections["strings"], sections["string_offsets"] = _encode_strings(strings)
+    for name in ARRAYS:
+        sections[name] = getattr(store, name)
+
+    data = []
+    for name in _SECTIONS:
+        section = sections[name]
+        if not isinstance(section, bytes):
+            section = _array_to_bytes(section)
+        data.append(section)
+
+    fp = open(path, "wb")
+    try:
+        offset = _HEADER.size + _SECTION_ENTRY.size * len(_SECTIONS)
+        fp.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(_SECTIONS)))
+        for section in data:
+            fp.write(_SECTION_ENTRY.pack(offset, len(section)))
+            offset += len(section)
+        for section in data:
+            fp.write(section)
+    finally:
+        fp.close()
+
+def _read_sections(buf):
+    if len(buf) < _HEADER.size:
+        raise DepSolverError("Invalid pool snapshot: file too small")
+    magic, format_version, n_sections = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC:
+        raise DepSolverError("Invalid pool snapshot: bad magic %r" % (magic,))
+    if format_version != _FORMAT_VERSION or n_sections != len(_SECTIONS):
+        raise DepSolverError("Unsupported pool snapshot format version %d" \
+                             % format_version)
+
+    sections = {}
+    for i, name in enumerate(_SECTIONS):
+        offset, size = _SECTION_ENTRY.unpack_from(buf, _HEADER.size + i * _SECTION_ENTRY.size)
+        if offset + size > len(buf):
+            raise DepSolverError("Invalid pool snapshot: truncated section %r" % name)
+        if name == "strings":
+            sections[name] = buf[offset:offset+size]
+        else:
+            sections[name] = _array_from_bytes(buf[offset:offset+size])
+    return sections
+
+def load_snapshot(pool, path):
+    """Add the repositories saved in the snapshot at path to the given empty
+    pool."""
+    fp = open(path, "rb")
+    try:
+        if os.fstat(fp.fileno()).st_size == 0:
+            raise DepSolverError("Invalid pool snapshot: empty file")
+        buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        fp.close()
+
+    try:
+        sections = _read_sections(buf)
+    finally:
+        buf.close()
+
+    strings = _decode_strings(sections["strings"], sections["string_offsets"])
+    store = PackageStore.from_arrays(strings, sections)
+    repository_names = [strings[index] for index in sections["repository_names"]]
+    pool._load_store(store, repository_names)
+
+    constraints = sections["scheduler_constraints"]
+    for index in sections["scheduler_names"]:
+        pool._scheduler.set_constraints(strings[index])
+    for i in range(0, len(constraints), 2):
+        pool._scheduler.set_constraints(strings[constraints[i]],
+                                        after=strings[constraints[i+1]])
+
+    pool._id = sections["meta"][0]
@@ -0,0 +1,349 @@
+"""Columnar storage of parsed packages.
+
+A PackageStore keeps packages as rows of int arrays instead of PackageInfo
+instances:
+
+    - ids, names, versions, repositories, factories: one int per package (the
+      package id, the index of its name in strings, the index of its version
+      in the version table, an index of repository chosen by the caller and
+      the tag of its version factory).
+    - requirement_offsets, requirements: the dependencies, provides,
+      conflicts, replaces and suggests of every package, in CSR layout:
+      requirements of kind k of package i are
+      requirements[requirement_offsets[i*5+k]:requirement_offsets[i*5+k+1]].
+
+Strings, versions and requirements are interned in tables, themselves made
+of int arrays:
+
+    - strings: the interned strings (names, version parts).
+    - version_rows: _VERSION_ROW_SIZE ints per version (see _encode_version).
+      The numbers of a version are interned as strings, as they may not fit
+      in a C int.
+    - requirement_rows, not_equals_offsets, not_equals: _REQUIREMENT_ROW_SIZE
+      ints per requirement (name, min bound, max bound, equal version,
+      cannot_match flag), and its excluded versions in CSR layout.
+
+PackageInfo instances are only built on demand by PackageStore.package, and
+the versions and requirements they refer to are decoded once and shared.
+"""
+import array
+
+import six
+
+from .debian_version \
+    import \
+        DebianVersion
+from .errors \
+    import \
+        DepSolverError
+from .package \
+    import \
+        PackageInfo
+from .requirement \
+    import \
+        Requirement
+from .version \
+    import \
+        BuildVersion, DEFAULT_VERSION_FACTORY, InterningVersionFactory, MaxVersion, \
+        MinVersion, PreReleaseVersion, SemanticVersion
+
+NONE = -1
+
+_SEMANTIC_VERSION = 1
+_DEBIAN_VERSION = 2
+_VERSION_ROW_SIZE = 6
+
+_REQUIREMENT_ROW_SIZE = 5
+
+REQUIREMENT_KINDS = ["dependencies", "provides", "conflicts", "replaces", "suggests"]
+_N_KINDS = len(REQUIREMENT_KINDS)
+_PROVIDES = REQUIREMENT_KINDS.index("provides")
+_REPLACES = REQUIREMENT_KINDS.index("replaces")
+
+# Interning factories compare equal to the factories they wrap, so packages
+# parsed with either get the same tag, and are decoded with the interning one
+_VERSION_FACTORIES = [
+    (_SEMANTIC_VERSION, DEFAULT_VERSION_FACTORY),
+    (_DEBIAN_VERSION, InterningVersionFactory(DebianVersion.from_string)),
+]
+_VERSION_FACTORY_BY_TAG = dict(_VERSION_FACTORIES)
+
+# Every array of a store, in the order used for (de)serialization
+ARRAYS = ["version_rows", "requirement_rows", "not_equals_offsets",
+          "not_equals", "ids", "names", "versions", "repositories",
+          "factories", "requirement_offsets", "requirements"]
+
+_INT_MIN = -2 ** 31
+_INT_MAX = 2 ** 31 - 1
+
+def int_array(values=()):
+    try:
+        a = array.array("i", values)
+    except OverflowError:
+        raise DepSolverError("Package store values must fit in 4 bytes C ints")
+    if a.itemsize != 4:
+        raise DepSolverError("Package stores require 4 bytes C ints")
+    return a
+
+def _ensure_int(value, what):
+    if not _INT_MIN <= value <= _INT_MAX:
+        raise DepSolverError("Cannot store %s %r: it does not fit in a 4 bytes C int" \
+                             % (what, value))
+    return value
+
+def version_factory_tag(version_factory):
+    """Returns the tag of the given version factory, which can be given to
+    version_factory_from_tag."""
+    for tag, factory in _VERSION_FACTORIES:
+        if version_factory == factory:
+            return tag
+    raise DepSolverError("Cannot store packages with version factory %r" \
+                         % (version_factory,))
+
+def version_factory_from_tag(tag):
+    return _VERSION_FACTORY_BY_TAG[tag]
+
+class PackageStore(object):
+    """Columnar storage of parsed packages (see the module docstring)."""
+    def __init__(self):
+        self.strings = []
+        self.version_rows = int_array()
+        self.requirement_rows = int_array()
+        self.not_equals_offsets = int_array([0])
+        self.not_equals = int_array()
+
+        self.ids = int_array()
+        self.names = int_array()
+        self.versions = int_array()
+        self.repositories = int_array()
+        self.factories = int_array()
+        self.requirement_offsets = int_array([0])
+        self.requirements = int_array()
+
+        # Interning dictionaries, only needed to append packages, and built
+        # on first use for stores created by from_arrays
+        self._string_indices = None
+        self._version_indices = None
+        self._requirement_indices = None
+
+        self._version_cache = {}
+        self._requirement_cache = {}
+
+    @classmethod
+    def from_arrays(cls, strings, arrays):
+        """Create a store from its strings and a dictionary of its arrays, as
+        listed in ARRAYS (see to_arrays)."""
+        store = cls()
+        store.strings = strings
+        for name in ARRAYS:
+            setattr(store, name, arrays[name])
+
+        n = len(store.ids)
+        for column in (store.names, store.versions, store.repositories, store.factories):
+            if len(column) != n:
+                raise DepSolverError("Inconsistent package store columns")
+        if len(store.requirement_offsets) != n * _N_KINDS + 1:
+            raise DepSolverError("Inconsistent package store columns")
+        return store
+
+    def to_arrays(self):
+        """Returns the strings of this store and a dictionary of its arrays,
+        as expected by from_arrays."""
+        return self.strings, dict((name, getattr(self, name)) for name in ARRAYS)
+
+    def __len__(self):
+        return len(self.ids)
+
+    #--------------
+    # Appending API
+    #--------------
+    def append(self, package, package_id, repository_index):
+        """Append the given package, and return its row.
+
+        Arguments
+        ---------
+        package: PackageInfo
+            package to append. It is not kept by the store.
+        package_id: int
+            id of the package
+        repository_index: int
+            index of the package repository, as understood by the caller
+        """
+        self._ensure_indices()
+        factory_tag = version_factory_tag(package.version_factory)
+        # Everything is encoded before the package columns are appended to,
+        # so that a package which cannot be stored does not leave a partial
+        # row behind
+        _ensure_int(package_id, "package id")
+        _ensure_int(repository_index, "repository index")
+        name = self._encode_string(package.name)
+        version = self._encode_version(package.version)
+        requirements = [[self._encode_requirement(requirement)
+                         for requirement in getattr(package, kind)]
+                        for kind in REQUIREMENT_KINDS]
+
+        row = len(self.ids)
+        self.ids.append(package_id)
+        self.names.append(name)
+        self.versions.append(version)
+        self.repositories.append(repository_index)
+        self.factories.append(factory_tag)
+        for kind_requirements in requirements:
+            self.requirements.extend(kind_requirements)
+            self.requirement_offsets.append(len(self.requirements))
+        return row
+
+    def _ensure_indices(self):
+        if self._string_indices is None:
+            self._string_indices = dict((s, i) for i, s in enumerate(self.strings))
+            self._version_indices = dict(
+                    (tuple(self.version_rows[i:i+_VERSION_ROW_SIZE]), i // _VERSION_ROW_SIZE)
+                    for i in range(0, len(self.version_rows), _VERSION_ROW_SIZE))
+            self._requirement_indices = dict(
+                    (self._requirement_key(i), i) for i in range(len(self.not_equals_offsets) - 1))
+
+    def _requirement_key(self, index):
+        start = index * _REQUIREMENT_ROW_SIZE
+        not_equals = self.not_equals[self.not_equals_offsets[index]:self.not_equals_offsets[index+1]]
+        return tuple(self.requirement_rows[start:start+_REQUIREMENT_ROW_SIZE]) + tuple(not_equals)
+
+    def _encode_string(self, s):
+        if s is None:
+            return NONE
+        s = six.text_type(s)
+        index = self._string_indices.get(s)
+        if index is None:
+            index = self._string_indices[s] = len(self.strings)
+            self.strings.append(s)
+        return index
+
+    def _encode_version(self, version):
+        if isinstance(version, (MinVersion, MaxVersion)) or version is None:
+            return NONE
+        elif isinstance(version, SemanticVersion):
+            pre_release = build = None
+            if version.pre_release is not None:
+                pre_release = ".".join(str(part) for part in version.pre_release.parts)
+            if version.build is not None:
+                build = ".".join(str(part) for part in version.build.parts)
+            row = (_SEMANTIC_VERSION, self._encode_string(version.major),
+                   self._encode_string(version.minor), self._encode_string(version.patch),
+                   self._encode_string(pre_release), self._encode_string(build))
+        elif isinstance(version, DebianVersion):
+            row = (_DEBIAN_VERSION, self._encode_string(version.epoch),
+                   self._encode_string(version.upstream),
+                   self._encode_string(version.revision), 0, 0)
+        else:
+            raise DepSolverError("Cannot store version of type %s" \
+                                 % type(version).__name__)
+
+        index = self._version_indices.get(row)
+        if index is None:
+            index = self._version_indices[row] = len(self.version_rows) // _VERSION_ROW_SIZE
+            self.version_rows.extend(row)
+        return index
+
+    def _encode_requirement(self, requirement):
+        not_equals = sorted(self._encode_version(version)
+                            for version in requirement._not_equals)
+        row = (self._encode_string(requirement.name),
+               self._encode_version(requirement._min_bound),
+               self._encode_version(requirement._max_bound),
+               self._encode_version(requirement._equal),
+               int(requirement._cannot_match))
+        key = row + tuple(not_equals)
+        index = self._requirement_indices.get(key)
+        if index is None:
+            index = self._requirement_indices[key] = len(self.not_equals_offsets) - 1
+            self.requirement_rows.extend(row)
+            self.not_equals.extend(not_equals)
+            self.not_equals_offsets.append(len(self.not_equals))
+        return index
+
+    #-------------
+    # Decoding API
+    #-------------
+    def package(self, row, package_class=PackageInfo):
+        """Build a new package for the package at the given row.
+
+        Arguments
+        ---------
+        row: int
+            row of the package
+        package_class: type
+            class of the built package (PackageInfo or SlottedPackageInfo)
+        """
+        kwargs = {}
+        offset = row * _N_KINDS
+        for k, kind in enumerate(REQUIREMENT_KINDS):
+            start, end = self.requirement_offsets[offset+k], self.requirement_offsets[offset+k+1]
+            kwargs[kind] = [self.requirement(index) for index in self.requirements[start:end]]
+        package = package_class(self.strings[self.names[row]],
+                                self.version(self.versions[row]),
+                                _VERSION_FACTORY_BY_TAG[self.factories[row]],
+                                **kwargs)
+        package.id = self.ids[row]
+        return package
+
+    def package_names(self, row):
+        """Returns the set of names the package at the given row can be
+        looked up by (its name, provides and replaces)."""
+        names = set([self.strings[self.names[row]]])
+        offset = row * _N_KINDS
+        for k in (_PROVIDES, _REPLACES):
+            start, end = self.requirement_offsets[offset+k], self.requirement_offsets[offset+k+1]
+            for index in self.requirements[start:end]:
+                names.add(self.strings[self.requirement_rows[index * _REQUIREMENT_ROW_SIZE]])
+        return names
+
+    def version(self, index):
+        """Returns the version at the given index of the version table."""
+        version = self._version_cache.get(index)
+        if version is None:
+            version = self._version_cache[index] = self._decode_version(index)
+        return version
+
+    def requirement(self, index):
+        """Returns the requirement at the given index of the requirement
+        table."""
+        requirement = self._requirement_cache.get(index)
+        if requirement is None:
+            requirement = self._requirement_cache[index] = self._decode_requirement(index)
+        return requirement
+
+    def _decode_version(self, index):
+        start = index * _VERSION_ROW_SIZE
+        tag, a, b, c, d, e = self.version_rows[start:start+_VERSION_ROW_SIZE]
+        strings = self.strings
+        if tag == _SEMANTIC_VERSION:
+            pre_release = build = None
+            if d != NONE:
+                pre_release = PreReleaseVersion(strings[d].split("."))
+            if e != NONE:
+                build = BuildVersion(strings[e].split("."))
+            return SemanticVersion(int(strings[a]), int(strings[b]), int(strings[c]),
+                                   pre_release, build)
+        elif tag == _DEBIAN_VERSION:
+            epoch = strings[a] if a != NONE else None
+            revision = strings[c] if c != NONE else None
+            return DebianVersion(strings[b], revision, epoch)
+        else:
+            raise DepSolverError("Invalid package store: unknown version tag %d" % tag)
+
+    def _optional_version(self, index, default):
+        if index == NONE:
+            return default
+        else:
+            return self.version(index)
+
+    def _decode_requirement(self, index):
+        start = index * _REQUIREMENT_ROW_SIZE
+        name, min_bound, max_bound, equal, cannot_match = \
+                self.requirement_rows[start:start+_REQUIREMENT_ROW_SIZE]
+        not_equals = [self.version(i) for i in
+                      self.not_equals[self.not_equals_offsets[index]:self.not_equals_offsets[index+1]]]
+        return Requirement._from_state(self.strings[name],
+                self._optional_version(min_bound, MinVersion()),
+                self._optional_version(max_bound, MaxVersion()),
+                self._optional_version(equal, None),
+                not_equals, bool(cannot_match))
@@ -20,6 +20,8 @@ _DEBIAN_REVISION_RE = re.compile("[a-zA-Z0-9+.~]+")
 
 _DIGITS_NO_DIGITS_RE = re.compile("(\d*)(\D*)")
 
+_NO_DIGITS_DIGITS_RE = re.compile("([^0-9]*)([0-9]*)")
+
 def _compute_comparable():
     comparable = dict((c, ord(c)) for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
     comparable["~"] = -1
@@ -30,6 +32,30 @@ def _compute_comparable():
 
 _COMPARABLE = _compute_comparable()
 
+def _weight(c):
+    # dpkg order: ~ < end of string < letters < any other character
+    weight = _COMPARABLE.get(c)
+    if weight is None:
+        weight = ord(c) + 256
+    return weight
+
+# Non digit run -> its key (see _part_key). Runs are mostly separators and
+# short suffixes, shared by most versions. The cache is emptied when full.
+_RUN_KEYS = {}
+_RUN_KEYS_SIZE = 4096
+
+def _run_key(no_digits):
+    key = _RUN_KEYS.get(no_digits)
+    if key is None:
+        if len(_RUN_KEYS) >= _RUN_KEYS_SIZE:
+            _RUN_KEYS.clear()
+        key = _RUN_KEYS[no_digits] = tuple(_weight(c) for c in no_digits) + (0,)
+    return key
+
+# Marks the end of a version part key. It sorts as an empty non digit run
+# (see _part_key)
+_END_OF_PART = (0,)
+
 def parse_version_string(version):
     epoch = None
     revision = None
@@ -97,6 +123,34 @@ def _compare_part(left, right):
                 return st
     return 0
 
+def _part_key(part):
+    """
+    Compute the key of a version part, such as comparing the keys of two
+    parts gives the same result as the Debian comparison algorithm.
+
+    The part is split into alternating runs of non digits and digits,
+    starting with a (maybe empty) non digit run. A non digit run becomes the
+    tuple of its character weights, followed by a 0 weight for its end, and
+    a digit run becomes its int value (0 if empty). _END_OF_PART is
+    appended: compared to a non digit run of a longer part, it sorts as the
+    end of string does.
+
+    Parameters
+    ----------
+    part: str
+        An upstream version or a debian revision
+    """
+    runs = _NO_DIGITS_DIGITS_RE.findall(part)
+    if len(runs) > 1:
+        # The last match is the empty one at the end of the part
+        del runs[-1]
+    key = []
+    for no_digits, digits in runs:
+        key.append(_run_key(no_digits))
+        key.append(int(digits) if digits else 0)
+    key.append(_END_OF_PART)
+    return tuple(key)
+
 class ComparablePart(object):
     def __init__(self, version):
         self._version = version
@@ -120,6 +174,21 @@ class ComparablePart(object):
             return NotImplemented
 
 class DebianVersion(Version):
+    """Create a DebianVersion instance
+
+    Versions are compared according to the dpkg algorithm. Comparisons and
+    hashing use a key computed once at construction: (epoch, upstream key,
+    revision key), see _part_key.
+
+    Arguments
+    ---------
+    upstream: str
+        The upstream version
+    revision: str
+        The debian revision, if any
+    epoch: str
+        The epoch, if any
+    """
     @classmethod
     def from_string(cls, version):
         epoch, upstream, revision = parse_version_string(version)
@@ -130,17 +199,20 @@ class DebianVersion(Version):
         self.revision = revision
         self.epoch = epoch
 
-        comparable_parts = []
         if epoch is None:
-            comparable_parts.append(0)
+            epoch_key = 0
         else:
-            comparable_parts.append(int(epoch))
-        comparable_parts.append(ComparablePart(upstream))
+            epoch_key = int(epoch)
         if revision is None:
-            comparable_parts.append(ComparablePart("0"))
-        else:
-            comparable_parts.append(ComparablePart(revision))
-        self._comparable_parts = comparable_parts
+            revision = "0"
+        self._key = (epoch_key, _part_key(upstream), _part_key(revision))
+        self._hash = hash(self._key)
+
+    @property
+    def sort_key(self):
+        """Total order key of this version: a tuple, such as comparing the
+        keys of two versions gives the same result as comparing them."""
+        return self._key
 
     def __str__(self):
         s = self.upstream
@@ -151,27 +223,50 @@ class DebianVersion(Version):
         return s
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
 
     def __cmp__(self, other):
         if isinstance(other, DebianVersion):
-            return cmp(self._comparable_parts, other._comparable_parts)
+            return _cmp(self._key, other._key)
         else:
             return NotImplemented
 
     def __eq__(self, other):
         if isinstance(other, DebianVersion):
-            return self._comparable_parts == other._comparable_parts
+            return self._key == other._key
+        else:
+            return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, DebianVersion):
+            return self._key != other._key
         else:
             return NotImplemented
 
     def __lt__(self, other):
         if isinstance(other, DebianVersion):
-            return self._comparable_parts < other._comparable_parts
+            return self._key < other._key
+        else:
+            return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, DebianVersion):
+            return self._key <= other._key
+        else:
+            return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, DebianVersion):
+            return self._key > other._key
+        else:
+            return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, DebianVersion):
+            return self._key >= other._key
         else:
             return NotImplemented
 
 if six.PY3:
     import functools
     ComparablePart = functools.total_ordering(ComparablePart)
-    DebianVersion = functools.total_ordering(DebianVersion)
@@ -0,0 +1,161 @@
+"""Sets of versions, represented as sorted lists of disjoint intervals.
+
+An interval is a (low, low_closed, high, high_closed) tuple, where low and
+high are Version instances (MinVersion() and MaxVersion() for unbounded
+intervals), and *_closed tells whether the bound itself is in the interval.
+The intervals of an IntervalSet are sorted, non empty and never overlap nor
+touch, so that every set of versions has exactly one representation.
+Intersection, union and inclusion are all computed in a single pass over
+the intervals of both sets.
+"""
+from .version \
+    import \
+        MaxVersion, MinVersion
+
+def _is_empty(low, low_closed, high, high_closed):
+    return low > high or (low == high and not (low_closed and high_closed))
+
+def _low_before(a, b):
+    """True if interval a starts strictly before interval b."""
+    return a[0] < b[0] or (a[0] == b[0] and a[1] and not b[1])
+
+def _high_before(a, b):
+    """True if interval a ends strictly before interval b."""
+    return a[2] < b[2] or (a[2] == b[2] and not a[3] and b[3])
+
+def _same_high(a, b):
+    return a[2] == b[2] and a[3] == b[3]
+
+def _connected(a, b):
+    """True if the interval b, which does not start before a, overlaps or
+    touches a."""
+    return b[0] < a[2] or (b[0] == a[2] and (a[3] or b[1]))
+
+def _merge(sorted_intervals):
+    merged = []
+    for interval in sorted_intervals:
+        if len(merged) > 0 and _connected(merged[-1], interval):
+            if _high_before(merged[-1], interval):
+                last = merged[-1]
+                merged[-1] = (last[0], last[1], interval[2], interval[3])
+        else:
+            merged.append(interval)
+    return merged
+
+def _insertion_sort(intervals):
+    # Versions only support the rich comparison operators, so intervals are
+    # sorted with _low_before rather than with a key. Requirements produce
+    # a handful of already sorted intervals.
+    result = []
+    for interval in intervals:
+        i = len(result)
+        while i > 0 and _low_before(interval, result[i-1]):
+            i -= 1
+        result.insert(i, interval)
+    return result
+
+def _format_bound(version):
+    if isinstance(version, MinVersion):
+        return "-inf"
+    elif isinstance(version, MaxVersion):
+        return "+inf"
+    else:
+        return str(version)
+
+class IntervalSet(object):
+    """An immutable set of versions (see the module docstring).
+
+    Arguments
+    ---------
+    intervals: seq
+        (low, low_closed, high, high_closed) tuples, in any order. They may
+        be empty, overlap or touch.
+    """
+    @classmethod
+    def everything(cls):
+        return cls([(MinVersion(), True, MaxVersion(), True)])
+
+    @classmethod
+    def single(cls, version):
+        return cls([(version, True, version, True)])
+
+    def __init__(self, intervals=()):
+        intervals = [interval for interval in intervals if not _is_empty(*interval)]
+        intervals = _insertion_sort(intervals)
+        self.intervals = tuple(_merge(intervals))
+
+    @classmethod
+    def _from_normalized(cls, intervals):
+        interval_set = cls.__new__(cls)
+        interval_set.intervals = tuple(intervals)
+        return interval_set
+
+    @property
+    def is_empty(self):
+        return len(self.intervals) == 0
+
+    def contains(self, version):
+        """True if the given version is in this set."""
+        for low, low_closed, high, high_closed in self.intervals:
+            if version < low or (version == low and not low_closed):
+                return False
+            if version < high or (version == high and high_closed):
+                return True
+        return False
+
+    def intersect(self, other):
+        """Returns the set of versions in both this set and other."""
+        intersection = []
+        left, right = self.intervals, other.intervals
+        i = j = 0
+        while i < len(left) and j < len(right):
+            a, b = left[i], right[j]
+            low = b if _low_before(a, b) else a
+            high = a if _high_before(a, b) else b
+            if not _is_empty(low[0], low[1], high[2], high[3]):
+                intersection.append((low[0], low[1], high[2], high[3]))
+            if _same_high(a, b):
+                i += 1
+                j += 1
+            elif high is a:
+                i += 1
+            else:
+                j += 1
+        return self._from_normalized(intersection)
+
+    def union(self, other):
+        """Returns the set of versions in this set or other."""
+        left, right = self.intervals, other.intervals
+        merged = []
+        i = j = 0
+        while i < len(left) or j < len(right):
+            if j == len(right) or (i < len(left) and not _low_before(right[j], left[i])):
+                merged.append(left[i])
+                i += 1
+            else:
+                merged.append(right[j])
+                j += 1
+        return self._from_normalized(_merge(merged))
+
+    def subsumes(self, other):
+        """True if every version of other is in this set."""
+        return self.intersect(other) == other
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalSet):
+            return False
+        return len(self.intervals) == len(other.intervals) \
+                and all(a[0] == b[0] and a[1] == b[1] and a[2] == b[2] and a[3] == b[3]
+                        for a, b in zip(self.intervals, other.intervals))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        if self.is_empty:
+            return "IntervalSet(<empty>)"
+        r = []
+        for low, low_closed, high, high_closed in self.intervals:
+            r.append("%s%s, %s%s" % ("[" if low_closed else "(", _format_bound(low),
+                                     _format_bound(high), "]" if high_closed else ")"))
+        return "IntervalSet(%s)" % " u ".join(r)
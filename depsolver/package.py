@@ -6,6 +6,12 @@ import six
 from .compat \
     import \
         OrderedDict
+from .constraints \
+    import \
+        Equal
+from .errors \
+    import \
+        DepSolverError
 from ._package_utils \
     import \
         parse_package_full_name
@@ -14,13 +20,13 @@ from .requirement \
         Requirement
 from .requirement_parser \
     import \
-        RawRequirementParser
+        _BLANK_RE, RawRequirementParser
 from .utils \
     import \
         Callable
 from .version \
     import \
-        SemanticVersion, Version
+        DEFAULT_VERSION_FACTORY, Version
 from .bundled.traitlets \
     import \
         HasTraits, Instance, List, Long, Unicode
@@ -37,6 +43,8 @@ _SECTION_RE = re.compile("""\
 """ % {"dependency_types": "|".join(_DEPENDENCY_TYPES)}, re.VERBOSE)
 
 
+_DISTRIBUTION_NAME_RE = re.compile(r"\s*([a-zA-Z_]\w*)")
+
 def _parse_name_version_part(name_version, version_factory):
     name, version_string = parse_package_full_name(name_version)
     version = version_factory(version_string)
@@ -48,15 +56,18 @@ def _parse_requirements_string(parser, s, version_factory):
         raise ValueError("invalid requirement string: %r" % s)
     else:
         requirements_type, requirements_string = m.groups()
-        requirements = OrderedDict()
-        for requirement_string in requirements_string.split(","):
-            for distribution_name, specs in parser.parse(requirement_string).items():
-                if not distribution_name in requirements:
-                    requirements[distribution_name] = []
-                requirements[distribution_name].extend(specs)
         return requirements_type, \
-               [Requirement(name, reqs, version_factory)
-                for name, reqs in six.iteritems(requirements)]
+               _parse_requirements(parser, requirements_string, version_factory)
+
+def _parse_requirements(parser, requirements_string, version_factory):
+    requirements = OrderedDict()
+    for requirement_string in requirements_string.split(","):
+        for distribution_name, specs in parser.parse(requirement_string).items():
+            if not distribution_name in requirements:
+                requirements[distribution_name] = []
+            requirements[distribution_name].extend(specs)
+    return [Requirement.interned(name, reqs, version_factory)
+            for name, reqs in six.iteritems(requirements)]
 
 def parse_package_string(package_string, version_factory):
     parser = RawRequirementParser()
@@ -77,38 +88,134 @@ def parse_package_string(package_string, version_factory):
 
     return name, version, provides, depends, conflicts, replaces, suggests
 
-class PackageInfo(HasTraits):
+# Maximum number of requirement clauses and version strings remembered by
+# parse_package_strings (the caches are emptied when full)
+_BULK_CACHE_SIZE = 1 << 17
+
+def parse_package_strings(package_strings, version_factory=DEFAULT_VERSION_FACTORY):
+    """Parse package strings in bulk.
+
+    Yields the same (name, version, provides, depends, conflicts, replaces,
+    suggests) tuples as parse_package_string, one per package string. Parser
+    state is shared by all the package strings: version strings and
+    requirement clauses (the text between commas) seen several times are
+    only parsed once, and give the same (immutable) Version and Requirement
+    instances.
+
+    Arguments
+    ---------
+    package_strings: iterable
+        The package strings, which are consumed lazily.
+    version_factory: callable
+        Version factory used to parse the packages.
     """
-    PackageInfoInfo instances contain exactly all the metadata needed for the
-    dependency management.
+    parser = RawRequirementParser()
+    versions = {}
+    clauses = {}
 
-    Parameters
-    ----------
+    for package_string in package_strings:
+        parts = package_string.split(";")
+        name, version_string = parse_package_full_name(parts[0])
+        version = versions.get(version_string)
+        if version is None:
+            if len(versions) >= _BULK_CACHE_SIZE:
+                versions.clear()
+            version = versions[version_string] = version_factory(version_string)
+
+        requirements_lists = dict((kind, []) for kind in _DEPENDENCY_TYPES)
+        for part in parts[1:]:
+            requirements_type, requirements_string = _split_section(part)
+            requirements = []
+            for clause in requirements_string.split(","):
+                clause_requirements = clauses.get(clause)
+                if clause_requirements is None:
+                    if len(clauses) >= _BULK_CACHE_SIZE:
+                        clauses.clear()
+                    clause_requirements = clauses[clause] = tuple(
+                            Requirement.interned(distribution_name, specs, version_factory)
+                            for distribution_name, specs in six.iteritems(parser.parse(clause)))
+                requirements.extend(clause_requirements)
+            if len(requirements) > 1 and \
+                    len(set(r.name for r in requirements)) < len(requirements):
+                # Clauses on the same name within a section are merged into
+                # a single requirement
+                requirements = _parse_requirements(parser, requirements_string, version_factory)
+            requirements_lists[requirements_type].extend(requirements)
+
+        yield name, version, requirements_lists["provides"], \
+              requirements_lists["depends"], requirements_lists["conflicts"], \
+              requirements_lists["replaces"], requirements_lists["suggests"]
+
+def parse_package_string_names(package_string):
+    """Cheaply extract the names a package string may be looked up by.
+
+    Only the package name and the names in its provides and replaces sections
+    are extracted: neither versions nor requirements are parsed.
+
+    Returns
+    -------
     name: str
-        Name of the package (i.e. distribution name)
-    version: object
-        Instance of Version
-    provides: None or sequence
-        Sequence of Requirements.
-    dependencies: None or sequence
-        Sequence of Requirements.
+        The package name
+    indirect_names: list
+        The names provided or replaced by the package.
     """
-    name = Unicode()
-    version = Instance(Version)
-    version_factory = Callable()
+    parts = package_string.split(";")
+    name, version_string = parse_package_full_name(parts[0])
 
-    dependencies = List(Instance(Requirement))
-    provides = List(Instance(Requirement))
-    conflicts = List(Instance(Requirement))
-    replaces = List(Instance(Requirement))
-    suggests = List(Instance(Requirement))
+    indirect_names = []
+    for part in parts[1:]:
+        requirements_type, requirements_string = _split_section(part)
+        if requirements_type in ("provides", "replaces"):
+            indirect_names.extend(_scan_requirement_names(requirements_string))
 
-    id = Long(-1)
+    return name, indirect_names
 
-    _repository = Instance("depsolver.repository.Repository")
+def _split_section(s):
+    m = _SECTION_RE.search(s)
+    if m is None:
+        raise ValueError("invalid requirement string: %r" % s)
+    return m.groups()
+
+def _scan_requirement_names(requirements_string):
+    """Extract the distribution names of a comma separated list of
+    requirements, without parsing them."""
+    names = []
+    for requirement_string in requirements_string.split(","):
+        # Like RawRequirementParser.parse, ignore blank blocks (i.e. an
+        # empty section or a trailing comma)
+        if _BLANK_RE.match(requirement_string):
+            continue
+        m = _DISTRIBUTION_NAME_RE.match(requirement_string)
+        if m is None:
+            raise DepSolverError("Invalid requirement string: %r" \
+                                 % requirement_string)
+        names.append(m.group(1))
+    return names
+
+# Package string section -> PackageInfo attribute
+_SECTION_ATTRIBUTES = {"depends": "dependencies", "provides": "provides",
+                       "replaces": "replaces", "conflicts": "conflicts",
+                       "suggests": "suggests"}
+
+class BasePackageInfo(object):
+    """Base class of the package implementations (PackageInfo,
+    SlottedPackageInfo), holding the methods they share.
+
+    Subclasses provide the name, version, version_factory, dependencies,
+    provides, conflicts, replaces, suggests and id attributes, and the
+    _repository and _version_requirement private attributes.
+
+    Once a package has been added to a pool, its identity (unique name, hash
+    and package string) is cached, and the package must not be modified.
+    """
+    __slots__ = ()
+
+    # (id, unique name, hash, package string or None), set by
+    # _cache_identity. Only valid while the id is the cached one.
+    _identity = None
 
     @classmethod
-    def from_string(cls, package_string, version_factory=SemanticVersion.from_string):
+    def from_string(cls, package_string, version_factory=DEFAULT_VERSION_FACTORY):
         """Create a new package from a string.
 
         Example
@@ -127,33 +234,71 @@ class PackageInfo(HasTraits):
                    dependencies=list(dependencies), conflicts=list(conflicts),
                    replaces=list(replaces), suggests=list(suggests))
 
-    def __init__(self, name, version,
-            version_factory=SemanticVersion.from_string, dependencies=None,
-            provides=None, conflicts=None, replaces=None, suggests=None, **kw):
-        if dependencies is None:
-            dependencies = []
-        if provides is None:
-            provides = []
-        if conflicts is None:
-            conflicts = []
-        if replaces is None:
-            replaces = []
-        if suggests is None:
-            suggests = []
-        super(PackageInfo, self).__init__(name=name, version=version,
-                                          version_factory=version_factory,
-                                          dependencies=dependencies,
-                                          provides=provides,
-                                          conflicts=conflicts,
-                                          replaces=replaces,
-                                          suggests=suggests,
-                                          **kw)
+    @classmethod
+    def from_strings(cls, package_strings, version_factory=DEFAULT_VERSION_FACTORY):
+        """Iterate over new packages created from the given package strings,
+        parsed in bulk (see parse_package_strings).
+
+        Example
+        -------
+        >>> [str(p) for p in PackageInfo.from_strings(["numpy-1.3.0", "mkl-10.3.0"])]
+        ['numpy-1.3.0', 'mkl-10.3.0']
+        """
+        for name, version, provides, dependencies, conflicts, replaces, suggests \
+                in parse_package_strings(package_strings, version_factory):
+            yield cls(name=name, version=version, version_factory=version_factory,
+                      provides=provides, dependencies=dependencies,
+                      conflicts=conflicts, replaces=replaces, suggests=suggests)
+
     @property
     def unique_name(self):
+        identity = self._identity
+        if identity is not None and identity[0] == self.id:
+            return identity[1]
         return self.name + "-" + str(self.version)
 
+    def _cache_identity(self):
+        """Cache the identity of this package for its current id. Called by
+        the pool once the package id is assigned."""
+        unique_name = self.name + "-" + str(self.version)
+        self._identity = (self.id, unique_name,
+                          hash("%s%d" % (unique_name, self.id)), None)
+
+    def requirement_names(self, kind):
+        """Returns the set of names of this package's requirements of the
+        given kind.
+
+        Arguments
+        ---------
+        kind: str
+            one of "dependencies", "provides", "conflicts", "replaces" or
+            "suggests"
+        """
+        return set(requirement.name for requirement in getattr(self, kind))
+
+    @property
+    def version_requirement(self):
+        """The requirement matching exactly this package, i.e. 'name ==
+        version'.
+
+        It is built from the already parsed version the first time it is
+        needed, and reused afterwards.
+        """
+        if self._version_requirement is None:
+            self._version_requirement = Requirement(self.name,
+                    [Equal(self.version)], self.version_factory)
+        return self._version_requirement
+
     @property
     def package_string(self):
+        identity = self._identity
+        if identity is not None and identity[0] == self.id:
+            if identity[3] is None:
+                self._identity = identity[:3] + (self._format_package_string(),)
+            return self._identity[3]
+        return self._format_package_string()
+
+    def _format_package_string(self):
         strings = ["%s-%s" % (self.name, self.version)]
         if self.dependencies:
             strings.append("depends (%s)" % ", ".join(str(s) for s in self.dependencies))
@@ -185,10 +330,192 @@ class PackageInfo(HasTraits):
         return self.unique_name
 
     def __eq__(self, other):
-        return self.name == other.name and self.version == other.version \
+        if self is other:
+            return True
+        # Comparing ids first is cheap, and enough to tell apart most
+        # packages of a pool
+        return self.id == other.id \
+                and self.name == other.name and self.version == other.version \
                 and self.provides == other.provides \
-                and self.dependencies == other.dependencies \
-                and self.id == other.id
+                and self.dependencies == other.dependencies
 
     def __hash__(self):
+        identity = self._identity
+        if identity is not None and identity[0] == self.id:
+            return identity[2]
         return hash("%s%d" % (str(self), self.id))
+
+class PackageInfo(HasTraits, BasePackageInfo):
+    """
+    PackageInfoInfo instances contain exactly all the metadata needed for the
+    dependency management.
+
+    Parameters
+    ----------
+    name: str
+        Name of the package (i.e. distribution name)
+    version: object
+        Instance of Version
+    provides: None or sequence
+        Sequence of Requirements.
+    dependencies: None or sequence
+        Sequence of Requirements.
+    """
+    name = Unicode()
+    version = Instance(Version)
+    version_factory = Callable()
+
+    dependencies = List(Instance(Requirement))
+    provides = List(Instance(Requirement))
+    conflicts = List(Instance(Requirement))
+    replaces = List(Instance(Requirement))
+    suggests = List(Instance(Requirement))
+
+    id = Long(-1)
+
+    _repository = Instance("depsolver.repository.Repository")
+    _version_requirement = Instance(Requirement)
+
+    def __init__(self, name, version,
+            version_factory=DEFAULT_VERSION_FACTORY, dependencies=None,
+            provides=None, conflicts=None, replaces=None, suggests=None, **kw):
+        if dependencies is None:
+            dependencies = []
+        if provides is None:
+            provides = []
+        if conflicts is None:
+            conflicts = []
+        if replaces is None:
+            replaces = []
+        if suggests is None:
+            suggests = []
+        super(PackageInfo, self).__init__(name=name, version=version,
+                                          version_factory=version_factory,
+                                          dependencies=dependencies,
+                                          provides=provides,
+                                          conflicts=conflicts,
+                                          replaces=replaces,
+                                          suggests=suggests,
+                                          **kw)
+
+class SlottedPackageInfo(BasePackageInfo):
+    """A lightweight PackageInfo, using __slots__ instead of traits.
+
+    It has the same API and equality semantics as PackageInfo, but its
+    attributes are not validated, which makes it much cheaper to create and
+    smaller in memory. Pools and repositories building packages accept a
+    package_class argument to use it instead of PackageInfo.
+    """
+    __slots__ = ["name", "version", "version_factory", "dependencies",
+                 "provides", "conflicts", "replaces", "suggests", "id",
+                 "_repository", "_version_requirement", "_identity"]
+
+    def __init__(self, name, version,
+            version_factory=DEFAULT_VERSION_FACTORY, dependencies=None,
+            provides=None, conflicts=None, replaces=None, suggests=None, id=-1):
+        self.name = six.text_type(name)
+        self.version = version
+        self.version_factory = version_factory
+        self.dependencies = list(dependencies or [])
+        self.provides = list(provides or [])
+        self.conflicts = list(conflicts or [])
+        self.replaces = list(replaces or [])
+        self.suggests = list(suggests or [])
+        self.id = id
+        self._repository = None
+        self._version_requirement = None
+        self._identity = None
+
+def _lazy_requirements(kind):
+    def _get(self):
+        requirements = self._requirements.get(kind)
+        if requirements is None:
+            requirements = self._requirements[kind] = self._parse_requirements(kind)
+        return requirements
+
+    def _set(self, requirements):
+        self._requirements[kind] = list(requirements)
+
+    return property(_get, _set, doc="Requirements of kind %r, parsed on first access." % kind)
+
+class LazyPackageInfo(PackageInfo):
+    """A PackageInfo whose requirements are only parsed when first accessed.
+
+    from_string only parses the name and version of the package, and keeps
+    the raw text of each requirements section. Each of dependencies,
+    provides, conflicts, replaces and suggests is parsed the first time it is
+    accessed. The names of the requirements are available through
+    requirement_names without parsing them, which is enough for a pool to
+    index the package.
+
+    Errors in requirement strings are only reported when the requirements
+    are parsed.
+    """
+    dependencies = _lazy_requirements("dependencies")
+    provides = _lazy_requirements("provides")
+    conflicts = _lazy_requirements("conflicts")
+    replaces = _lazy_requirements("replaces")
+    suggests = _lazy_requirements("suggests")
+
+    @classmethod
+    def from_string(cls, package_string, version_factory=DEFAULT_VERSION_FACTORY):
+        """Create a new package from a string, only parsing its name and
+        version.
+
+        Example
+        -------
+        >>> package = LazyPackageInfo.from_string("numpy-1.3.0; depends (mkl >= 10.3.0)")
+        >>> package.requirement_names("dependencies")
+        set([u'mkl'])
+        >>> package.dependencies
+        [mkl >= 10.3.0]
+        """
+        parts = package_string.split(";")
+        name, version = _parse_name_version_part(parts[0], version_factory)
+
+        raw_sections = collections.defaultdict(list)
+        for part in parts[1:]:
+            requirements_type, requirements_string = _split_section(part)
+            raw_sections[_SECTION_ATTRIBUTES[requirements_type]].append(requirements_string)
+        return cls(name=name, version=version, version_factory=version_factory,
+                   raw_sections=raw_sections)
+
+    @classmethod
+    def from_strings(cls, package_strings, version_factory=DEFAULT_VERSION_FACTORY):
+        """Iterate over new packages created from the given package strings,
+        only parsing their names and versions (see from_string)."""
+        for package_string in package_strings:
+            yield cls.from_string(package_string, version_factory)
+
+    def __init__(self, name, version,
+            version_factory=DEFAULT_VERSION_FACTORY, raw_sections=None, **kw):
+        # kind -> parsed requirements
+        self._requirements = {}
+        # kind -> list of raw requirements strings, not parsed yet
+        if raw_sections is None:
+            raw_sections = {}
+        self._raw_sections = dict(raw_sections)
+        super(LazyPackageInfo, self).__init__(name, version, version_factory, **kw)
+        # Requirements given as raw sections override the (empty) defaults
+        for kind in self._raw_sections:
+            self._requirements.pop(kind, None)
+
+    def requirement_names(self, kind):
+        if kind in self._requirements:
+            return super(LazyPackageInfo, self).requirement_names(kind)
+        else:
+            names = set()
+            for requirements_string in self._raw_sections.get(kind, []):
+                names.update(_scan_requirement_names(requirements_string))
+            return names
+
+    def _parse_requirements(self, kind):
+        parser = RawRequirementParser()
+        requirements = []
+        for requirements_string in self._raw_sections.get(kind, []):
+            requirements.extend(_parse_requirements(parser, requirements_string,
+                                                    self.version_factory))
+        # Only drop the raw section once it parsed, so that a malformed one
+        # keeps raising on every access
+        self._raw_sections.pop(kind, None)
+        return requirements
@@ -1,14 +1,22 @@
+import bisect
 import collections
+import operator
 
+import six
+
+from . import _snapshot
+from ._store \
+    import \
+        PackageStore, int_array
 from .bundled.traitlets \
     import \
-        HasTraits, Dict, Instance, List, Long, Unicode
+        HasTraits, Dict, Instance, List, Long, Type, Unicode
 from .errors \
     import \
         DepSolverError, MissingPackageInfoInPool
 from .package \
     import \
-        PackageInfo
+        BasePackageInfo, PackageInfo, parse_package_string_names
 from .repository \
     import \
         Repository
@@ -17,7 +25,11 @@ from .requirement \
         Requirement
 from .utils \
     import \
-        CachedScheduler
+        CachedScheduler, LRUCache
+from .version \
+    import \
+        DEFAULT_VERSION_FACTORY
+from . import version_keys
 
 MATCH_NONE = 0
 MATCH_NAME = 1
@@ -25,32 +37,78 @@ MATCH = 2
 MATCH_PROVIDE = 3
 MATCH_REPLACE = 4
 
+# Default maximum number of what_provides results kept per pool
+_WHAT_PROVIDES_CACHE_SIZE = 4096
+
+_WHAT_PROVIDES_MODES = ['composer', 'direct_only', 'include_indirect']
+
+# Minimum number of packages of a name for what_provides to match their
+# versions with version_keys.match_mask, when NumPy is available
+_MATCH_MASK_THRESHOLD = 1000
+
 class Pool(HasTraits):
     """Pool objects model a pool of repositories.
 
     Pools are able to find packages that provide a given requirements (handling
     the provides concept from package metadata).
+
+    Parameters
+    ----------
+    repositories: seq
+        Sequence of repositories to add to the pool.
+    cache_size: int or None
+        Maximum number of what_provides results cached by the pool. If None,
+        the cache is unbounded.
+    package_class: type
+        Class of the packages built by the pool itself, e.g. when loading a
+        snapshot (PackageInfo or SlottedPackageInfo).
     """
     repositories = List(Instance(Repository))
+    package_class = Type(PackageInfo, klass=BasePackageInfo)
 
     _packages_by_id = Dict()
     _packages_by_name = Dict()
+    _versions_by_name = Dict()
+    _version_keys_by_name = Dict()
+    _version_ranks_by_name = Dict()
+    _providers_by_name = Dict()
+    _dependents_by_name = Dict()
+    _conflicting_by_name = Dict()
+    _replacers_by_name = Dict()
 
     _id = Long(1)
 
     _repository_by_name = Instance(collections.defaultdict)
     _scheduler = Instance(CachedScheduler)
+    _what_provides_cache = Instance(LRUCache)
 
-    def __init__(self, repositories=None, **kw):
+    def __init__(self, repositories=None, cache_size=_WHAT_PROVIDES_CACHE_SIZE, **kw):
         scheduler = CachedScheduler()
         repository_by_name = collections.defaultdict(list)
+        what_provides_cache = LRUCache(cache_size)
         super(Pool, self).__init__(self, _scheduler=scheduler,
-                _repository_by_name=repository_by_name, **kw)
+                _repository_by_name=repository_by_name,
+                _what_provides_cache=what_provides_cache, **kw)
         if repositories is None:
             repositories = []
 
-        # provide.name -> package mapping
+        # name -> packages with that name, sorted by version
         self._packages_by_name = collections.defaultdict(list)
+        # name -> versions of _packages_by_name[name], used for bisection
+        self._versions_by_name = collections.defaultdict(list)
+        # name -> packed keys of _versions_by_name[name], only built for
+        # names with many packages (see version_keys)
+        self._version_keys_by_name = {}
+        # name -> package id -> rank of the package version among the
+        # versions of that name (see version_rank), built on first use
+        self._version_ranks_by_name = {}
+        # provide/replace name -> packages providing/replacing it
+        self._providers_by_name = collections.defaultdict(list)
+        # reverse dependency index: requirement name -> packages with a
+        # dependency, conflict or replace on that name
+        self._dependents_by_name = collections.defaultdict(list)
+        self._conflicting_by_name = collections.defaultdict(list)
+        self._replacers_by_name = collections.defaultdict(list)
 
         if len(repositories) > 0:
             for repository in repositories:
@@ -68,19 +126,236 @@ class Pool(HasTraits):
         repository: Repository
             repository to add
         """
+        self._add_repository(repository)
+
+    def save_snapshot(self, path):
+        """Save the repositories of this pool, and their priority constraints,
+        into a binary snapshot file.
+
+        The snapshot holds already parsed packages, and can be loaded much
+        faster than parsing the packages again (see load_snapshot).
+
+        Arguments
+        ---------
+        path: str
+            path of the snapshot file
+        """
+        store = PackageStore()
+        for i, repository in enumerate(self.repositories):
+            for package in repository.iter_packages():
+                store.append(package, package.id, i)
+        _snapshot.save_snapshot(self, store, path)
+
+    @classmethod
+    def load_snapshot(cls, path, **kw):
+        """Create a new pool from a snapshot file created by save_snapshot.
+
+        Packages keep the ids they had in the saved pool.
+
+        Arguments
+        ---------
+        path: str
+            path of the snapshot file
+        kw: dict
+            extra arguments given to the pool constructor
+        """
+        pool = cls(**kw)
+        _snapshot.load_snapshot(pool, path)
+        return pool
+
+    def _load_store(self, store, repository_names):
+        """Add the packages of the given store to this (empty) pool, in
+        repositories named after repository_names."""
+        repositories = [Repository(name=name) for name in repository_names]
+        for row in range(len(store)):
+            repositories[store.repositories[row]].add_package(
+                    store.package(row, self.package_class))
+        for repository in repositories:
+            self._add_repository(repository, keep_ids=True)
+
+    def _add_repository(self, repository, keep_ids=False):
         self.repositories.append(repository)
         self._repository_by_name[repository.name].append(repository)
 
         for package in repository.iter_packages():
+            self._add_package(package, keep_id=keep_ids)
+        self._invalidate_names(_package_names(repository.iter_packages()))
+
+    def remove_repository(self, repository):
+        """Remove a repository, and all its packages, from this pool.
+
+        The ids of the packages from other repositories are unchanged. If no
+        other repository with the same name is left in the pool, the priority
+        constraints set up for this name are removed as well.
+
+        Arguments
+        ---------
+        repository: Repository
+            repository to remove
+        """
+        index = self._repository_index(repository)
+        del self.repositories[index]
+        self._unregister_repository_name(repository)
+
+        for package in repository.iter_packages():
+            self._remove_package(package)
+        self._invalidate_names(_package_names(repository.iter_packages()))
+
+    def replace_repository(self, old_repository, new_repository):
+        """Replace a repository of this pool with a new one.
+
+        Only the difference between both repositories is applied to the pool:
+        a package of the new repository which has the same package string as a
+        package of the old one takes over its id, and the other packages are
+        removed or added. The new repository keeps the position, and thus the
+        priority, of the old one.
+
+        Arguments
+        ---------
+        old_repository: Repository
+            repository to replace
+        new_repository: Repository
+            repository replacing old_repository
+        """
+        index = self._repository_index(old_repository)
+        self.repositories[index] = new_repository
+        if old_repository.name == new_repository.name:
+            candidates = self._repository_by_name[old_repository.name]
+            candidates[_index_of_identical(candidates, old_repository)] = new_repository
+        else:
+            self._unregister_repository_name(old_repository)
+            self._repository_by_name[new_repository.name].append(new_repository)
+
+        old_packages = collections.defaultdict(collections.deque)
+        for package in old_repository.iter_packages():
+            old_packages[package.package_string].append(package)
+
+        added_packages = []
+        for package in new_repository.iter_packages():
+            candidates = old_packages.get(package.package_string)
+            if candidates:
+                self._replace_package(candidates.popleft(), package)
+            else:
+                added_packages.append(package)
+
+        for candidates in six.itervalues(old_packages):
+            for package in candidates:
+                self._remove_package(package)
+        for package in added_packages:
+            self._add_package(package)
+
+        # Unchanged packages are now different objects, so every name of both
+        # repositories is invalidated
+        names = _package_names(old_repository.iter_packages())
+        names.update(_package_names(new_repository.iter_packages()))
+        self._invalidate_names(names)
+
+    def _repository_index(self, repository):
+        try:
+            return _index_of_identical(self.repositories, repository)
+        except ValueError:
+            raise DepSolverError("Repository %r is not in this pool" % (repository.name,))
+
+    def _unregister_repository_name(self, repository):
+        candidates = self._repository_by_name[repository.name]
+        del candidates[_index_of_identical(candidates, repository)]
+        if len(candidates) == 0:
+            del self._repository_by_name[repository.name]
+            self._scheduler.remove(repository.name)
+
+    def _invalidate_names(self, names):
+        """Remove the cached what_provides results for the given names."""
+        if len(names) > 0:
+            cache = self._what_provides_cache
+            for key in cache.keys():
+                if key[0].name in names:
+                    cache.pop(key)
+
+    def _add_package(self, package, keep_id=False):
+        if not keep_id:
             package.id = self._id
             self._id += 1
-            self._packages_by_id[package.id] = package
+        package._cache_identity()
+        self._packages_by_id[package.id] = package
+
+        versions = self._versions_by_name[package.name]
+        # bisect_right keeps packages with the same version in id order
+        index = bisect.bisect_right(versions, package.version)
+        versions.insert(index, package.version)
+        self._packages_by_name[package.name].insert(index, package)
+        self._version_keys_by_name.pop(package.name, None)
+        self._version_ranks_by_name.pop(package.name, None)
+
+        for name in _provider_names(package):
+            self._providers_by_name[name].append(package)
+
+        for index, kind in self._reverse_indices():
+            for name in package.requirement_names(kind):
+                index[name].append(package)
+
+    def _remove_package(self, package):
+        del self._packages_by_id[package.id]
+
+        index = self._package_index(package)
+        packages = self._packages_by_name[package.name]
+        versions = self._versions_by_name[package.name]
+        del packages[index]
+        del versions[index]
+        self._version_keys_by_name.pop(package.name, None)
+        self._version_ranks_by_name.pop(package.name, None)
+        if len(packages) == 0:
+            del self._packages_by_name[package.name]
+            del self._versions_by_name[package.name]
+
+        for name in _provider_names(package):
+            providers = self._providers_by_name[name]
+            del providers[_index_of_identical(providers, package)]
+            if len(providers) == 0:
+                del self._providers_by_name[name]
+
+        for index, kind in self._reverse_indices():
+            for name in package.requirement_names(kind):
+                candidates = index[name]
+                del candidates[_index_of_identical(candidates, package)]
+                if len(candidates) == 0:
+                    del index[name]
+
+    def _replace_package(self, old_package, new_package):
+        """Put new_package in place of the identical old_package, keeping its
+        id."""
+        new_package.id = old_package.id
+        new_package._cache_identity()
+        self._packages_by_id[new_package.id] = new_package
+
+        index = self._package_index(old_package)
+        self._packages_by_name[new_package.name][index] = new_package
+        self._versions_by_name[new_package.name][index] = new_package.version
+        # The cached keys and ranks refer to the old version objects
+        self._version_keys_by_name.pop(new_package.name, None)
+        self._version_ranks_by_name.pop(new_package.name, None)
+
+        for name in _provider_names(old_package):
+            providers = self._providers_by_name[name]
+            providers[_index_of_identical(providers, old_package)] = new_package
+
+        for index, kind in self._reverse_indices():
+            for name in old_package.requirement_names(kind):
+                candidates = index[name]
+                candidates[_index_of_identical(candidates, old_package)] = new_package
 
-            self._packages_by_name[package.name].append(package)
-            for provide in package.provides:
-                self._packages_by_name[provide.name].append(package)
-            for replace in package.replaces:
-                self._packages_by_name[replace.name].append(package)
+    def _reverse_indices(self):
+        return [(self._dependents_by_name, "dependencies"),
+                (self._conflicting_by_name, "conflicts"),
+                (self._replacers_by_name, "replaces")]
+
+    def _package_index(self, package):
+        """Index of the given package in the version sorted list of packages
+        with its name."""
+        versions = self._versions_by_name[package.name]
+        start = bisect.bisect_left(versions, package.version)
+        end = bisect.bisect_right(versions, package.version)
+        packages = self._packages_by_name[package.name]
+        return start + _index_of_identical(packages[start:end], package)
 
     def package_by_id(self, package_id):
         """Retrieve a package from its id.
@@ -115,17 +390,109 @@ class Pool(HasTraits):
                   requirement directly or indirectly (i.e. includes packages
                   that provides this package)
         """
+        if not mode in _WHAT_PROVIDES_MODES:
+            raise ValueError("Invalid mode %r" % mode)
+
+        key = (requirement, mode)
+        packages = self._what_provides_cache.get(key)
+        if packages is None:
+            packages = self._compute_what_provides(requirement, mode)
+            self._what_provides_cache[key] = packages
+        # Callers are free to modify the returned list
+        return list(packages)
+
+    def _version_keys(self, name):
+        keys = self._version_keys_by_name.get(name)
+        if keys is None:
+            keys = self._version_keys_by_name[name] = \
+                    version_keys.pack_versions(self._versions_by_name[name])
+        return keys
+
+    def version_rank(self, package):
+        """Returns the rank of the given package version among the versions
+        of the packages with the same name in this pool.
+
+        Ranks are dense: the lowest version has rank 0, and each next
+        distinct version has the next rank (equal versions share theirs).
+        Ranks of packages with the same name thus compare as their versions
+        do, but as ints. They are recomputed when packages with that name
+        are added to or removed from the pool.
+
+        Arguments
+        ---------
+        package: PackageInfo
+            A package of this pool
+        """
+        try:
+            return self.version_ranks(package.name)[package.id]
+        except KeyError:
+            raise MissingPackageInfoInPool(package.id)
+
+    def version_ranks(self, name):
+        """Returns a package id -> version rank dictionary for the packages
+        of this pool with the given name (see version_rank). The dictionary
+        is shared, and must not be modified.
+
+        Arguments
+        ---------
+        name: str
+            A package name
+        """
+        ranks = self._version_ranks_by_name.get(name)
+        if ranks is None:
+            ranks = self._version_ranks_by_name[name] = self._compute_version_ranks(name)
+        return ranks
+
+    def _compute_version_ranks(self, name):
+        ranks = {}
+        rank = -1
+        previous_version = None
+        for package, version in zip(self._packages_by_name.get(name, []),
+                                    self._versions_by_name.get(name, [])):
+            if rank < 0 or version != previous_version:
+                rank += 1
+                previous_version = version
+            ranks[package.id] = rank
+        return ranks
+
+    def what_provides_cache_info(self):
+        """Returns the (hits, misses, maxsize, currsize) statistics of the
+        what_provides cache."""
+        return self._what_provides_cache.info()
+
+    def _compute_what_provides(self, requirement, mode):
         # FIXME: this is conceptually copied from whatProvides in Composer, but
         # I don't understand why the policy of preferring non-provided over
         # provided packages is handled here.
-        if not mode in ['composer', 'direct_only', 'include_indirect']:
-            raise ValueError("Invalid mode %r" % mode)
+        packages = self._packages_by_name.get(requirement.name, [])
+        # Any package with the requirement name is a name match, whatever its
+        # version
+        name_match = len(packages) > 0
 
-        strict_matches = []
-        provided_match = []
-        name_match = False
+        if requirement._cannot_match:
+            strict_matches = []
+        elif requirement.is_universal:
+            strict_matches = list(packages)
+        elif version_keys.HAS_NUMPY and len(packages) >= _MATCH_MASK_THRESHOLD:
+            distinct_versions, keys = self._version_keys(requirement.name)
+            mask = version_keys.match_mask(requirement, distinct_versions, keys)
+            strict_matches = [packages[i] for i in version_keys.np.flatnonzero(mask)]
+        else:
+            # Packages are sorted by version, so the candidates within the
+            # requirement bounds are a contiguous slice
+            versions = self._versions_by_name.get(requirement.name, [])
+            start = bisect.bisect_left(versions, requirement._min_bound)
+            end = bisect.bisect_right(versions, requirement._max_bound)
+            not_equals = requirement._not_equals
+            if len(not_equals) > 0:
+                strict_matches = [package for package in packages[start:end]
+                                  if not package.version in not_equals]
+            else:
+                strict_matches = packages[start:end]
 
-        for package in self._packages_by_name[requirement.name]:
+        provided_match = []
+        providers = self._providers_by_name.get(requirement.name, [])
+        for package in providers:
             match = self.matches(package, requirement)
             if match == MATCH_NONE:
                 pass
@@ -141,6 +508,9 @@ class Pool(HasTraits):
             else:
                 raise ValueError("Invalid match type: {}".format(match))
 
+        # Return matches in the order packages were added to the pool
+        strict_matches.sort(key=operator.attrgetter("id"))
+
         if mode == 'composer':
             if name_match:
                 return strict_matches
@@ -181,7 +551,7 @@ class Pool(HasTraits):
         True
         """
         if requirement.name == candidate.name:
-            candidate_requirement = Requirement.from_package_string(candidate.unique_name, candidate.version_factory)
+            candidate_requirement = candidate.version_requirement
             if requirement.is_universal or candidate_requirement.matches(requirement):
                 return MATCH
             else:
@@ -207,6 +577,72 @@ class Pool(HasTraits):
         else:
             return "-" + str(package)
 
+    #-------------------------
+    # Reverse dependencies API
+    #-------------------------
+    def what_requires(self, package, mode='composer'):
+        """Returns the packages which have a dependency the given package
+        provides, that is the packages for which one of the dependencies has
+        package in its what_provides results.
+
+        Arguments
+        ---------
+        package: PackageInfo
+            the required package
+        mode: str
+            what_provides mode used to match dependencies (see
+            what_provides).
+
+        Returns
+        -------
+        packages: list
+            dependent packages, sorted by id
+        """
+        return self._what_reverse(self._dependents_by_name, "dependencies",
+                                  package, mode)
+
+    def what_conflicts(self, package, mode='composer'):
+        """Returns the packages which conflict with the given package, that
+        is the packages for which one of the conflicts has package in its
+        what_provides results.
+
+        See what_requires.
+        """
+        return self._what_reverse(self._conflicting_by_name, "conflicts",
+                                  package, mode)
+
+    def what_replaces(self, package):
+        """Returns the packages which replace the given package, sorted by
+        id.
+
+        Arguments
+        ---------
+        package: PackageInfo
+            the replaced package
+        """
+        packages = []
+        for candidate in self._replacers_by_name.get(package.name, []):
+            for replace in candidate.replaces:
+                if self.matches(package, replace) == MATCH:
+                    packages.append(candidate)
+                    break
+        packages.sort(key=operator.attrgetter("id"))
+        return packages
+
+    def _what_reverse(self, index, kind, package, mode):
+        packages_by_id = {}
+        for name in _package_names([package]):
+            for candidate in index.get(name, []):
+                if candidate.id in packages_by_id:
+                    continue
+                for requirement in getattr(candidate, kind):
+                    if requirement.name == name:
+                        providers = self.what_provides(requirement, mode)
+                        if any(provider is package for provider in providers):
+                            packages_by_id[candidate.id] = candidate
+                            break
+        return [packages_by_id[package_id] for package_id in sorted(packages_by_id)]
+
     #------------------------
     # Repository priority API
     #------------------------
@@ -238,3 +674,352 @@ class Pool(HasTraits):
             return priorities.get(repository.name, 0) - (len(priorities) - 1)
         else:
             raise DepSolverError("Unknown repository name '%s'" % (repository.name,))
+
+def _index_of_identical(items, item):
+    """Like items.index(item), but comparing by identity instead of
+    equality."""
+    for i, candidate in enumerate(items):
+        if candidate is item:
+            return i
+    raise ValueError("%r is not in list" % (item,))
+
+def _provider_names(package):
+    """Returns the names the given package provides or replaces. A name both
+    provided and replaced is listed twice."""
+    return list(package.requirement_names("provides")) + \
+           list(package.requirement_names("replaces"))
+
+def _package_names(packages):
+    """Returns the set of names the given packages can be looked up by."""
+    names = set()
+    for package in packages:
+        names.add(package.name)
+        names.update(_provider_names(package))
+    return names
+
+class _PendingPackage(object):
+    """A package string waiting to be parsed by a LazyPool."""
+    __slots__ = ["package_string", "repository", "version_factory", "package"]
+
+    def __init__(self, package_string, repository, version_factory):
+        self.package_string = package_string
+        self.repository = repository
+        self.version_factory = version_factory
+        self.package = None
+
+class LazyPool(Pool):
+    """A pool which only parses packages when they are first looked up.
+
+    Package strings given to add_package_strings are only scanned for their
+    name, provides and replaces. The first time what_provides is called for a
+    given name, every package which has this name, or provides or replaces it,
+    is parsed, added to its repository and given an id. As the rules generator
+    only reaches packages through what_provides, the packages which end up
+    being parsed are the ones relevant to the request, whatever the size of
+    the catalog.
+
+    Packages are given ids in the order they are first looked up, and only
+    packages already looked up are known to package_by_id and has_package.
+    Likewise, what_requires and what_conflicts only return packages already
+    parsed.
+    """
+    # name -> pending packages with that name, or providing/replacing it
+    _pending_by_name = Dict()
+
+    def __init__(self, repositories=None, **kw):
+        super(LazyPool, self).__init__(repositories, **kw)
+        self._pending_by_name = collections.defaultdict(list)
+
+    def add_package_strings(self, package_strings, name="",
+                            version_factory=DEFAULT_VERSION_FACTORY):
+        """Add a repository made of the given package strings to this pool.
+
+        Arguments
+        ---------
+        package_strings: iterable
+            Package strings, as accepted by PackageInfo.from_string
+        name: str
+            Name of the created repository
+        version_factory: callable
+            Version factory used to parse the packages.
+
+        Returns
+        -------
+        repository: Repository
+            The created repository. It is filled as its packages get parsed.
+        """
+        repository = Repository(name=name)
+        self.add_repository(repository)
+
+        names = set()
+        for package_string in package_strings:
+            pending = _PendingPackage(package_string, repository, version_factory)
+            package_name, indirect_names = parse_package_string_names(package_string)
+            package_names = set(indirect_names)
+            package_names.add(package_name)
+            for package_name in package_names:
+                self._pending_by_name[package_name].append(pending)
+            names.update(package_names)
+
+        # Already looked up names may get new packages
+        self._invalidate_names(names)
+        return repository
+
+    def remove_repository(self, repository):
+        """Remove a repository, including its packages not parsed yet. See
+        Pool.remove_repository."""
+        self._drop_pending(repository)
+        super(LazyPool, self).remove_repository(repository)
+
+    def replace_repository(self, old_repository, new_repository):
+        """Replace a repository. Packages of old_repository not parsed yet are
+        simply dropped. See Pool.replace_repository."""
+        self._drop_pending(old_repository)
+        super(LazyPool, self).replace_repository(old_repository, new_repository)
+
+    def save_snapshot(self, path):
+        """Save the repositories of this pool into a binary snapshot file,
+        parsing every package not parsed yet first. See Pool.save_snapshot."""
+        for name in list(self._pending_by_name):
+            self._load_name(name)
+        super(LazyPool, self).save_snapshot(path)
+
+    def what_provides(self, requirement, mode='composer'):
+        """Returns a list of packages that provide the given requirement,
+        parsing the packages which may match it first.
+
+        See Pool.what_provides.
+        """
+        self._load_name(requirement.name)
+        return super(LazyPool, self).what_provides(requirement, mode)
+
+    def what_replaces(self, package):
+        """Returns the packages which replace the given package, parsing the
+        packages which may replace it first. See Pool.what_replaces."""
+        self._load_name(package.name)
+        return super(LazyPool, self).what_replaces(package)
+
+    def _drop_pending(self, repository):
+        """Forget the packages of the given repository not parsed yet."""
+        for name, pending_packages in list(self._pending_by_name.items()):
+            pending_packages = [pending for pending in pending_packages
+                                if pending.repository is not repository]
+            if len(pending_packages) > 0:
+                self._pending_by_name[name] = pending_packages
+            else:
+                del self._pending_by_name[name]
+
+    def _load_name(self, name):
+        # Once a name is loaded, every package it may match has been added to
+        # the pool, so loading other names never changes the what_provides
+        # results for that name, and the what_provides cache stays valid.
+        pending_packages = self._pending_by_name.pop(name, None)
+        if pending_packages is not None:
+            for pending in pending_packages:
+                if pending.package is None:
+                    package = self.package_class.from_string(pending.package_string,
+                                                             pending.version_factory)
+                    pending.package = package
+                    pending.package_string = None
+                    pending.repository.add_package(package)
+                    self._add_package(package)
+
+class ColumnarPool(Pool):
+    """A pool keeping its packages in a columnar store, and only building
+    PackageInfo instances for them when they are looked up.
+
+    Packages given to add_package_strings are parsed right away, but only
+    kept as a few ints in the arrays of a package store (see _store), with
+    their versions and requirements interned. The first time what_provides is
+    called for a given name, a PackageInfo is built for every package which
+    has this name, or provides or replaces it, and added to its repository.
+    This keeps the memory used by large catalogs low, as only the packages
+    relevant to a request are ever built.
+
+    Contrary to LazyPool, packages are given their ids when added, and
+    package_by_id and has_package know about every package of the pool.
+    As with LazyPool, what_requires and what_conflicts only return packages
+    already built. Repositories added with add_repository are handled as in
+    Pool.
+    """
+    _store = Instance(PackageStore)
+    # store repository index -> Repository, or None once removed
+    _store_repositories = List()
+    # name -> store rows of the packages with that name, or providing or
+    # replacing it, not built yet
+    _rows_by_name = Dict()
+    # package id -> store row, built on demand
+    _row_by_id = Dict()
+
+    def __init__(self, repositories=None, **kw):
+        super(ColumnarPool, self).__init__(repositories, **kw)
+        self._store = PackageStore()
+        self._rows_by_name = {}
+        self._row_by_id = None
+
+    def add_package_strings(self, package_strings, name="",
+                            version_factory=DEFAULT_VERSION_FACTORY):
+        """Add a repository made of the given package strings to this pool.
+
+        Arguments
+        ---------
+        package_strings: iterable
+            Package strings, as accepted by PackageInfo.from_string
+        name: str
+            Name of the created repository
+        version_factory: callable
+            Version factory used to parse the packages.
+
+        Returns
+        -------
+        repository: Repository
+            The created repository. It is filled as its packages get looked
+            up.
+        """
+        return self.add_packages(self.package_class.from_strings(package_strings, version_factory),
+                                 name)
+
+    def add_packages(self, packages, name=""):
+        """Add a repository made of the given packages to this pool.
+
+        The packages themselves are not kept: they are stored as they are
+        iterated over, so that a large index can be streamed in with bounded
+        memory, e.g. from Repository.iter_from_jsonl.
+
+        Arguments
+        ---------
+        packages: iterable
+            Packages to add
+        name: str
+            Name of the created repository
+
+        Returns
+        -------
+        repository: Repository
+            The created repository. It is filled as its packages get looked
+            up.
+        """
+        repository_index = self._add_store_repository(name)
+        store = self._store
+
+        names = set()
+        for package in packages:
+            row = store.append(package, self._id, repository_index)
+            self._id += 1
+            names.update(self._index_row(row))
+        self._row_by_id = None
+
+        # Already looked up names may get new packages
+        self._invalidate_names(names)
+        return self._store_repositories[repository_index]
+
+    def has_package(self, package):
+        if super(ColumnarPool, self).has_package(package):
+            return True
+        else:
+            return self._alive_row_by_id(package.id) is not None
+
+    def package_by_id(self, package_id):
+        row = self._alive_row_by_id(package_id)
+        if row is not None:
+            self._load_row(row)
+        return super(ColumnarPool, self).package_by_id(package_id)
+
+    def what_provides(self, requirement, mode='composer'):
+        """Returns a list of packages that provide the given requirement,
+        building the packages which may match it first.
+
+        See Pool.what_provides.
+        """
+        self._load_name(requirement.name)
+        return super(ColumnarPool, self).what_provides(requirement, mode)
+
+    def what_replaces(self, package):
+        """Returns the packages which replace the given package, building the
+        packages which may replace it first. See Pool.what_replaces."""
+        self._load_name(package.name)
+        return super(ColumnarPool, self).what_replaces(package)
+
+    def remove_repository(self, repository):
+        """Remove a repository, and all its packages, from this pool. See
+        Pool.remove_repository."""
+        self._load_store_repository(repository)
+        super(ColumnarPool, self).remove_repository(repository)
+
+    def replace_repository(self, old_repository, new_repository):
+        """Replace a repository of this pool with a new one. See
+        Pool.replace_repository."""
+        self._load_store_repository(old_repository)
+        super(ColumnarPool, self).replace_repository(old_repository, new_repository)
+
+    def save_snapshot(self, path):
+        """Save the repositories of this pool into a binary snapshot file,
+        building every package not built yet first. See Pool.save_snapshot."""
+        for row in range(len(self._store)):
+            self._load_row(row)
+        super(ColumnarPool, self).save_snapshot(path)
+
+    def _load_store(self, store, repository_names):
+        """Use the given store as the store of this (empty) pool, without
+        building any package."""
+        for name in repository_names:
+            self._add_store_repository(name)
+        self._store = store
+        for row in range(len(store)):
+            self._index_row(row)
+        self._row_by_id = None
+
+    def _add_store_repository(self, name):
+        repository = Repository(name=name)
+        self.add_repository(repository)
+        self._store_repositories.append(repository)
+        return len(self._store_repositories) - 1
+
+    def _index_row(self, row):
+        names = self._store.package_names(row)
+        for name in names:
+            rows = self._rows_by_name.get(name)
+            if rows is None:
+                rows = self._rows_by_name[name] = int_array()
+            rows.append(row)
+        return names
+
+    def _alive_row_by_id(self, package_id):
+        """Returns the store row of the given package id, or None if there is
+        none or if its repository has been removed."""
+        if self._row_by_id is None:
+            self._row_by_id = dict((package_id, row) for row, package_id in
+                                   enumerate(self._store.ids))
+        row = self._row_by_id.get(package_id)
+        if row is not None and \
+                self._store_repositories[self._store.repositories[row]] is not None:
+            return row
+        else:
+            return None
+
+    def _load_store_repository(self, repository):
+        """Build every package of the given repository, and detach the
+        repository from the store."""
+        for i, candidate in enumerate(self._store_repositories):
+            if candidate is repository:
+                for row, repository_index in enumerate(self._store.repositories):
+                    if repository_index == i:
+                        self._load_row(row)
+                self._store_repositories[i] = None
+
+    def _load_name(self, name):
+        # Once a name is loaded, every package it may match has been added to
+        # the pool, so loading other names never changes the what_provides
+        # results for that name, and the what_provides cache stays valid.
+        rows = self._rows_by_name.pop(name, None)
+        if rows is not None:
+            for row in rows:
+                self._load_row(row)
+
+    def _load_row(self, row):
+        store = self._store
+        repository = self._store_repositories[store.repositories[row]]
+        if repository is not None and not store.ids[row] in self._packages_by_id:
+            package = store.package(row, self.package_class)
+            repository.add_package(package)
+            self._add_package(package, keep_id=True)
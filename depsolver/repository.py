@@ -1,14 +1,34 @@
+import bz2
 import collections
+import gzip
+import json
+import multiprocessing
 
+import six
+
+from ._store \
+    import \
+        PackageStore, version_factory_from_tag, version_factory_tag
 from .bundled.traitlets \
     import \
-        HasTraits, Instance, List, Unicode
+        HasTraits, Dict, Instance, List, Unicode
+from .errors \
+    import \
+        DepSolverError
 from .package \
     import \
-        PackageInfo
+        BasePackageInfo, PackageInfo
 from .version \
     import \
-        Version
+        DEFAULT_VERSION_FACTORY, Version
+
+# Number of chunks given to each worker by Repository.from_strings, to even
+# out the load between workers
+_CHUNKS_PER_WORKER = 4
+
+# Requirement sections of package strings, in the order they are written
+# when converting json records
+_RECORD_SECTIONS = ["depends", "provides", "replaces", "conflicts", "suggests"]
 
 class Repository(HasTraits):
     """A repository is a container of packages.
@@ -17,16 +37,142 @@ class Repository(HasTraits):
     ----------
     packages: seq
         A sequence of packages
+
+    Notes
+    -----
+    Packages should only be added through add_package, which keeps the
+    lookup indices of the repository up to date.
     """
-    packages = List(Instance(PackageInfo))
+    packages = List(Instance(BasePackageInfo))
 
     name = Unicode()
 
+    # name -> packages with that name, in insertion order
+    _packages_by_name = Dict()
+    # (name, version string) -> first package with that name and version
+    _packages_by_key = Dict()
+
     def __init__(self, packages=None, name="", **kw):
         super(Repository, self).__init__(name=name, **kw)
+        self._packages_by_name = collections.defaultdict(list)
         for p in packages or []:
             self.add_package(p)
 
+    @classmethod
+    def from_strings(cls, package_strings, name="",
+                     version_factory=DEFAULT_VERSION_FACTORY, workers=1,
+                     package_class=PackageInfo):
+        """Create a new repository from package strings, parsing them in
+        parallel.
+
+        Each worker process parses a chunk of the package strings into a
+        compact columnar record (ints and interned strings), from which the
+        packages are rebuilt without parsing them again.
+
+        Parameters
+        ----------
+        package_strings: iterable
+            Package strings, as accepted by PackageInfo.from_string
+        name: str
+            Name of the repository
+        version_factory: callable
+            Version factory used to parse the packages. When using several
+            workers, only SemanticVersion.from_string and
+            DebianVersion.from_string are supported.
+        workers: int or None
+            Number of worker processes. If 1, the package strings are parsed
+            in the current process. If None, multiprocessing.cpu_count() is
+            used.
+        package_class: type
+            Class of the created packages (PackageInfo or
+            SlottedPackageInfo).
+
+        Example
+        -------
+        >>> repository = Repository.from_strings(["numpy-1.6.0", "mkl-10.3.0"], workers=2)
+        >>> len(repository)
+        2
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+
+        if workers <= 1:
+            packages = list(package_class.from_strings(package_strings, version_factory))
+            return cls(packages, name=name)
+
+        package_strings = list(package_strings)
+        factory_tag = version_factory_tag(version_factory)
+        n_chunks = workers * _CHUNKS_PER_WORKER
+        chunk_size = max(1, -(-len(package_strings) // n_chunks))
+        chunks = [(package_strings[i:i+chunk_size], factory_tag)
+                  for i in range(0, len(package_strings), chunk_size)]
+
+        process_pool = multiprocessing.Pool(workers)
+        try:
+            records = process_pool.map(_parse_package_strings, chunks)
+            process_pool.close()
+        except:
+            process_pool.terminate()
+            raise
+        finally:
+            process_pool.join()
+
+        repository = cls(name=name)
+        for strings, arrays in records:
+            store = PackageStore.from_arrays(strings, arrays)
+            for row in range(len(store)):
+                repository.add_package(store.package(row, package_class))
+        return repository
+
+    @classmethod
+    def iter_from_jsonl(cls, path, version_factory=DEFAULT_VERSION_FACTORY,
+                        package_class=PackageInfo):
+        """Iterate over the packages of a JSON-lines index file, building
+        them one at a time.
+
+        Each non empty line of the file is a JSON record, which is either a
+        package string, or an object with "name" and "version" keys, and
+        optional "depends", "provides", "replaces", "conflicts" and
+        "suggests" keys holding lists of requirement strings. gzip and bz2
+        compressed files are detected and decompressed on the fly.
+
+        Parameters
+        ----------
+        path: str
+            Path of the index file
+        version_factory: callable
+            Version factory used to parse the packages.
+        package_class: type
+            Class of the created packages (PackageInfo or
+            SlottedPackageInfo).
+        """
+        for package in package_class.from_strings(_iter_jsonl_package_strings(path),
+                                                  version_factory):
+            yield package
+
+    @classmethod
+    def from_jsonl(cls, path, name="", version_factory=DEFAULT_VERSION_FACTORY,
+                   package_class=PackageInfo):
+        """Create a new repository from a JSON-lines index file, without
+        reading the whole file first. See iter_from_jsonl.
+
+        Parameters
+        ----------
+        path: str
+            Path of the index file
+        name: str
+            Name of the repository
+        version_factory: callable
+            Version factory used to parse the packages.
+        package_class: type
+            Class of the created packages (PackageInfo or
+            SlottedPackageInfo).
+        """
+        repository = cls(name=name)
+        for package in cls.iter_from_jsonl(path, version_factory, package_class):
+            repository.add_package(package)
+        return repository
+
     def __len__(self):
         return len(self.packages)
 
@@ -50,6 +196,9 @@ class Repository(HasTraits):
         package.repository = self
         self.packages.append(package)
 
+        self._packages_by_name[package.name].append(package)
+        self._packages_by_key.setdefault(_package_key(package.name, package.version), package)
+
     def has_package(self, package):
         """Returns True if the given package is present in the repo, False
         otherwise.
@@ -59,7 +208,7 @@ class Repository(HasTraits):
         package: PackageInfo
             PackageInfo to look for.
         """
-        return self.find_package(package.name, package.version) is not None
+        return _package_key(package.name, package.version) in self._packages_by_key
 
     def has_package_name(self, name):
         """Returns True if one package with the given package name is present in
@@ -70,7 +219,7 @@ class Repository(HasTraits):
         name: str
             package name to look for.
         """
-        return len(self.find_packages(name)) > 0
+        return name in self._packages_by_name
 
     def find_package(self, name, version):
         """Find the package with the given name and version (exact match).
@@ -87,11 +236,7 @@ class Repository(HasTraits):
         package: PackageInfo or None
             The package if found, None otherwise.
         """
-        ref = PackageInfo(name=name, version=version)
-        for p in self.packages:
-            if p.unique_name == ref.unique_name:
-                return p
-        return None
+        return self._packages_by_key.get(_package_key(name, version))
 
     def find_packages(self, name):
         """Returns a list of packages with the given name.
@@ -112,4 +257,107 @@ class Repository(HasTraits):
         Does not consider provides, e.g. if package A provides package B,
         find_packages(b_name) will not include A
         """
-        return [p for p in self.packages if p.name == name]
+        return list(self._packages_by_name.get(name, []))
+
+    #---------------
+    # Bulk variants
+    #---------------
+    def has_package_many(self, packages):
+        """Returns a list of booleans telling whether each of the given
+        packages is present in the repo (see has_package)."""
+        packages_by_key = self._packages_by_key
+        return [_package_key(package.name, package.version) in packages_by_key
+                for package in packages]
+
+    def find_package_many(self, name_versions):
+        """Find the packages with the given names and versions (see
+        find_package).
+
+        Parameters
+        ----------
+        name_versions: seq
+            Sequence of (name, version) pairs
+
+        Returns
+        -------
+        packages: list
+            For each (name, version) pair, the package if found, None
+            otherwise.
+        """
+        packages_by_key = self._packages_by_key
+        return [packages_by_key.get(_package_key(name, version))
+                for name, version in name_versions]
+
+    def find_packages_many(self, names):
+        """Returns a dictionary mapping each of the given names to the list
+        of packages with that name (see find_packages).
+
+        Parameters
+        ----------
+        names: seq
+            Names of the packages to look for
+        """
+        packages_by_name = self._packages_by_name
+        return dict((name, list(packages_by_name.get(name, []))) for name in names)
+
+def _open_index(path):
+    """Open the given index file in binary mode, transparently decompressing
+    gzip and bz2 files."""
+    fp = open(path, "rb")
+    try:
+        magic = fp.read(3)
+    finally:
+        fp.close()
+
+    if magic[:2] == b"\x1f\x8b":
+        return gzip.GzipFile(path, "rb")
+    elif magic == b"BZh":
+        return bz2.BZ2File(path, "rb")
+    else:
+        return open(path, "rb")
+
+def _record_to_package_string(record):
+    if isinstance(record, six.string_types):
+        return record
+    elif isinstance(record, dict):
+        try:
+            sections = ["%s-%s" % (record["name"], record["version"])]
+        except KeyError as e:
+            raise DepSolverError("Missing key %s in package record" % e)
+        for section in _RECORD_SECTIONS:
+            requirements = record.get(section)
+            if requirements:
+                sections.append("%s (%s)" % (section, ", ".join(requirements)))
+        return "; ".join(sections)
+    else:
+        raise DepSolverError("Invalid package record: %r" % (record,))
+
+def _iter_jsonl_package_strings(path):
+    fp = _open_index(path)
+    try:
+        for i, line in enumerate(fp):
+            line = line.strip()
+            if line:
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except ValueError as e:
+                    raise DepSolverError("Invalid JSON record at line %d of %r: %s" \
+                                         % (i + 1, path, e))
+                yield _record_to_package_string(record)
+    finally:
+        fp.close()
+
+def _package_key(name, version):
+    # Packages are identical if they have the same unique name
+    return (name, str(version))
+
+def _parse_package_strings(args):
+    """Parse the given package strings into a package store, and return its
+    content (see PackageStore.to_arrays). Run in worker processes by
+    Repository.from_strings."""
+    package_strings, factory_tag = args
+    version_factory = version_factory_from_tag(factory_tag)
+    store = PackageStore()
+    for package in PackageInfo.from_strings(package_strings, version_factory):
+        store.append(package, package.id, 0)
+    return store.to_arrays()
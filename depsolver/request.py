@@ -6,13 +6,13 @@ from .requirement \
         Requirement
 from .package \
     import \
-        PackageInfo
+        BasePackageInfo
 from .pool \
     import \
         Pool
 
 class _Job(HasTraits):
-    packages = List(Instance(PackageInfo))
+    packages = List(Instance(BasePackageInfo))
     job_type = Enum(["install", "remove", "update", "upgrade"])
     requirement = Instance(Requirement)
 
@@ -1,3 +1,5 @@
+import weakref
+
 from ._package_utils \
     import \
         parse_package_full_name
@@ -7,15 +9,56 @@ from .errors \
 from .constraints \
     import \
         Equal, GEQ, GT, LEQ, LT, Not
+from .interval_set \
+    import \
+        IntervalSet
 from .package \
     import \
         parse_package_full_name
 from .requirement_parser \
     import \
         RawRequirementParser
+from .utils \
+    import \
+        LRUCache
 from .version \
     import \
-        MaxVersion, MinVersion, SemanticVersion
+        DEFAULT_VERSION_FACTORY, MaxVersion, MinVersion, Version
+
+# Requirements shared by Requirement.interned, keyed by the arguments they
+# were built from
+_INTERNED_REQUIREMENTS = weakref.WeakValueDictionary()
+
+# Maximum number of (requirement string, version factory) pairs whose
+# requirements are kept by RequirementParser.parse
+_PARSE_CACHE_SIZE = 8192
+
+# (requirement string, version factory) -> tuple of requirements
+_PARSE_CACHE = LRUCache(_PARSE_CACHE_SIZE)
+
+def parse_cache_info():
+    """Return the (hits, misses, maxsize, currsize) statistics of the
+    RequirementParser.parse (and so Requirement.from_string) cache."""
+    return _PARSE_CACHE.info()
+
+def clear_parse_cache():
+    """Empty the RequirementParser.parse cache."""
+    _PARSE_CACHE.clear()
+
+def _cached_parse(requirement_string, version_factory, parser=None):
+    key = (requirement_string, version_factory)
+    requirements = _PARSE_CACHE.get(key)
+    if requirements is None:
+        if parser is None:
+            parser = RequirementParser(version_factory)
+        requirements = _PARSE_CACHE[key] = tuple(parser.iter_parse(requirement_string))
+    return requirements
+
+def _to_version(version, version_factory):
+    if isinstance(version, Version):
+        return version
+    else:
+        return version_factory(version)
 
 class Requirement(object):
     """Requirements instances represent a 'package requirement', that is a
@@ -26,10 +69,13 @@ class Requirement(object):
     name: str
         PackageInfo name
     specs: seq
-        Sequence of constraints
+        Sequence of constraints. The constraints' versions may either be
+        version strings, or already parsed Version instances.
     """
+    _intervals = None
+
     @classmethod
-    def from_string(cls, requirement_string, version_factory=SemanticVersion.from_string):
+    def from_string(cls, requirement_string, version_factory=DEFAULT_VERSION_FACTORY):
         """Creates a new Requirement from a requirement string.
 
         Arguments
@@ -48,15 +94,14 @@ class Requirement(object):
         >>> Requirement.from_string("numpy >= 1.3.0")
         numpy >= 1.3.0
         """
-        parser = RequirementParser(version_factory)
-        requirements = parser.parse(requirement_string)
+        requirements = _cached_parse(requirement_string, version_factory)
         if len(requirements) != 1:
             raise DepSolverError("Invalid requirement string %r" % requirement_string)
         else:
             return requirements[0]
 
     @classmethod
-    def from_package_string(cls, package_string, version_factory=SemanticVersion.from_string):
+    def from_package_string(cls, package_string, version_factory=DEFAULT_VERSION_FACTORY):
         """Creates a new Requirement from a package string.
 
         This is equivalent to the requirement 'package.name == package.version'
@@ -69,7 +114,38 @@ class Requirement(object):
         name, version = parse_package_full_name(package_string)
         return cls(name, [Equal(version)], version_factory)
 
-    def __init__(self, name, specs, version_factory=SemanticVersion.from_string):
+    @classmethod
+    def _from_state(cls, name, min_bound, max_bound, equal, not_equals, cannot_match):
+        """Creates a new Requirement directly from its internal state, without
+        any parsing (e.g. when loading a pool snapshot)."""
+        requirement = cls.__new__(cls)
+        requirement.name = name
+        requirement._min_bound = min_bound
+        requirement._max_bound = max_bound
+        requirement._equal = equal
+        requirement._not_equals = set(not_equals)
+        requirement._cannot_match = cannot_match
+        requirement._set_key()
+        return requirement
+
+    @classmethod
+    def interned(cls, name, specs, version_factory=DEFAULT_VERSION_FACTORY):
+        """Returns a requirement equal to cls(name, specs, version_factory),
+        shared with every other interned requirement built from the same
+        name, constraints and version factory.
+
+        Requirements are never modified once created, so the same instance
+        can be used by any number of packages. Interned requirements are
+        only kept alive by their users.
+        """
+        key = (cls, name, version_factory,
+               frozenset((spec.__class__, getattr(spec, "version", None)) for spec in specs))
+        requirement = _INTERNED_REQUIREMENTS.get(key)
+        if requirement is None:
+            requirement = _INTERNED_REQUIREMENTS[key] = cls(name, specs, version_factory)
+        return requirement
+
+    def __init__(self, name, specs, version_factory=DEFAULT_VERSION_FACTORY):
         self.name = name
 
         self._min_bound = MinVersion()
@@ -83,35 +159,60 @@ class Requirement(object):
             self._equal = None
         elif len(equals) == 1:
             self._cannot_match = False
-            self._equal = version_factory(equals.pop().version)
+            self._equal = _to_version(equals.pop().version, version_factory)
             self._min_bound = self._max_bound = self._equal
         else:
             self._cannot_match = False
             self._equal = None
 
-        self._not_equals = set(version_factory(req.version) for req in specs if isinstance(req, Not))
+        self._not_equals = set(_to_version(req.version, version_factory) for req in specs if isinstance(req, Not))
 
         gts = [req for req in specs if isinstance(req, GT)]
         lts = [req for req in specs if isinstance(req, LT)]
 
         geq = [req for req in specs if isinstance(req, GEQ)]
         geq.extend(gts)
-        geq_versions = [version_factory(g.version) for g in geq]
+        geq_versions = [_to_version(g.version, version_factory) for g in geq]
         if len(geq_versions) > 0:
             self._min_bound = max(geq_versions)
 
         leq = [req for req in specs if isinstance(req, LEQ)]
         leq.extend(lts)
-        leq_versions = [version_factory(l.version) for l in leq]
+        leq_versions = [_to_version(l.version, version_factory) for l in leq]
         if len(leq_versions) > 0:
             self._max_bound = min(leq_versions)
 
-        self._not_equals.update(version_factory(gt.version) for gt in gts)
-        self._not_equals.update(version_factory(lt.version) for lt in lts)
+        self._not_equals.update(_to_version(gt.version, version_factory) for gt in gts)
+        self._not_equals.update(_to_version(lt.version, version_factory) for lt in lts)
 
         if self._min_bound > self._max_bound:
             self._cannot_match = True
 
+        self._set_key()
+
+    def _set_key(self):
+        """Compute the canonical key of this requirement, used for hashing
+        and equality.
+
+        Two requirements have the same key if and only if they have the same
+        string representation (up to the order of the != clauses).
+        """
+        if self._cannot_match:
+            key = (self.name, None)
+        elif self._equal:
+            key = (self.name, "==", str(self._equal))
+        else:
+            lower = upper = None
+            if self._min_bound != MinVersion():
+                lower = (self._min_bound in self._not_equals, str(self._min_bound))
+            if self._max_bound != MaxVersion():
+                upper = (self._max_bound in self._not_equals, str(self._max_bound))
+            not_equals = frozenset(str(neq) for neq in self._not_equals
+                                   if neq > self._min_bound and neq < self._max_bound)
+            key = (self.name, lower, upper, not_equals)
+        self._key = key
+        self._hash = hash(key)
+
     def __repr__(self):
         r = []
         if self._cannot_match:
@@ -145,10 +246,55 @@ class Requirement(object):
                 and len(self._not_equals) == 0
 
     def __eq__(self, other):
-        return repr(self) == repr(other)
+        if not isinstance(other, Requirement):
+            return False
+        return self._hash == other._hash and self._key == other._key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
+
+    @property
+    def intervals(self):
+        """The set of versions matched by this requirement, as an
+        IntervalSet."""
+        if self._intervals is None:
+            self._intervals = self._compute_intervals()
+        return self._intervals
+
+    def _compute_intervals(self):
+        if self._cannot_match:
+            return IntervalSet()
+        elif self._equal is not None:
+            if self._equal in self._not_equals:
+                return IntervalSet()
+            return IntervalSet.single(self._equal)
+        else:
+            intervals = []
+            low, low_closed = self._min_bound, self._min_bound not in self._not_equals
+            for neq in sorted(self._not_equals):
+                if neq > self._min_bound and neq < self._max_bound:
+                    intervals.append((low, low_closed, neq, False))
+                    low, low_closed = neq, False
+            intervals.append((low, low_closed, self._max_bound,
+                              self._max_bound not in self._not_equals))
+            return IntervalSet(intervals)
+
+    def subsumes(self, other):
+        """Return True if every version matched by other is matched by this
+        requirement.
+
+        Examples
+        --------
+        >>> req = Requirement.from_string("numpy >= 1.3.0")
+        >>> req.subsumes(Requirement.from_string("numpy >= 1.4.0, numpy < 2.0.0"))
+        True
+        >>> req.subsumes(Requirement.from_string("numpy"))
+        False
+        """
+        return self.name == other.name and self.intervals.subsumes(other.intervals)
 
     def _nonempty_interval_intersection(self, provider):
         return self._max_bound >= provider._min_bound and provider._max_bound >= self._min_bound
@@ -186,13 +332,18 @@ class Requirement(object):
             return False
 
 class RequirementParser(object):
-    def __init__(self, version_factory=SemanticVersion.from_string):
+    def __init__(self, version_factory=DEFAULT_VERSION_FACTORY):
         self._parser = RawRequirementParser()
         self.version_factory = version_factory
 
     def iter_parse(self, requirement_string):
         for distribution_name, specs in self._parser.parse(requirement_string).items():
-            yield Requirement(distribution_name, specs, self.version_factory)
+            yield Requirement.interned(distribution_name, specs, self.version_factory)
 
     def parse(self, requirement_string):
-        return [r for r in self.iter_parse(requirement_string)]
+        """Parse the given requirement string into a list of requirements.
+
+        Requirements are immutable, so results are cached by requirement
+        string and version factory (see parse_cache_info).
+        """
+        return list(_cached_parse(requirement_string, self.version_factory, self))
@@ -11,6 +11,9 @@ from .errors \
 from .constraints \
     import \
         Any, Equal, GEQ, GT, LEQ, LT, Not
+from .utils \
+    import \
+        LRUCache
 from .version \
     import \
         _LOOSE_VERSION_RE
@@ -29,6 +32,48 @@ _DEFAULT_SCANNER = re.Scanner([
     (" +", lambda scanner, token: None),
 ])
 
+# A whole requirement block (the text between two commas), matching the same
+# blocks as _DEFAULT_SCANNER followed by iter_over_requirement: a name,
+# optionally followed by either a comparison and a version, or by '*'. Like
+# the scanner, a version starting with a letter stops at the first non word
+# character, and only spaces are allowed between tokens.
+_REQUIREMENT_BLOCK_RE = re.compile(r"""
+    \ *(?P<name>[a-zA-Z_]\w*)
+    \ *(?:
+        (?P<operator>==|>=|<=|!=|>|<)
+        \ *(?P<version>[a-zA-Z_]\w*|[^=><!,\sa-zA-Z_][^,\s]+)
+        |
+        (?P<any>\*)
+    )?
+    \ *$""", re.VERBOSE)
+
+_BLANK_RE = re.compile(r"\ *$")
+
+# Maximum number of requirement strings whose parse result is kept by
+# RawRequirementParser.parse
+_PARSE_CACHE_SIZE = 8192
+
+# requirement string -> ((name, constraints), ...)
+_PARSE_CACHE = LRUCache(_PARSE_CACHE_SIZE)
+
+def parse_cache_info():
+    """Return the (hits, misses, maxsize, currsize) statistics of the
+    RawRequirementParser.parse cache."""
+    return _PARSE_CACHE.info()
+
+def clear_parse_cache():
+    """Empty the RawRequirementParser.parse cache."""
+    _PARSE_CACHE.clear()
+
+_OPERATOR_STRING_TO_SPEC = {
+        "==": Equal,
+        ">=": GEQ,
+        ">": GT,
+        "<=": LEQ,
+        "<": LT,
+        "!=": Not,
+}
+
 class Token(object):
     typ = None
     def __init__(self, value=None):
@@ -85,15 +130,18 @@ def iter_over_requirement(tokens):
     """
     while True:
         block = []
-        token = six.advance_iterator(tokens)
+        try:
+            token = six.advance_iterator(tokens)
+        except StopIteration:
+            return
         try:
             while not isinstance(token, CommaToken):
                 block.append(token)
                 token = six.advance_iterator(tokens)
             yield block
-        except StopIteration as e:
+        except StopIteration:
             yield block
-            raise e
+            return
 
 _OPERATOR_TO_SPEC = {
         EqualToken: Equal,
@@ -157,6 +205,60 @@ class RawRequirementParser(object):
             return iter(scanned)
 
     def parse(self, requirement_string):
+        """Parse the given requirement string into an ordered dictionary
+        distribution name -> list of constraints.
+
+        Each block between commas is matched with a single regular
+        expression. This gives the same constraints as parse_tokens, but
+        rejects a few malformed blocks parse_tokens lets through (e.g. a
+        version without distribution name).
+
+        Results are cached by requirement string (see parse_cache_info). The
+        returned dictionary and lists are new ones, which the caller may
+        modify.
+        """
+        cached = _PARSE_CACHE.get(requirement_string)
+        if cached is None:
+            parsed = self._parse(requirement_string)
+            _PARSE_CACHE[requirement_string] = tuple(
+                    (name, tuple(constraints)) for name, constraints in six.iteritems(parsed))
+            return parsed
+        else:
+            return OrderedDict((name, list(constraints)) for name, constraints in cached)
+
+    def _parse(self, requirement_string):
+        parsed = OrderedDict()
+        blocks = requirement_string.split(",")
+        for i, block in enumerate(blocks):
+            m = _REQUIREMENT_BLOCK_RE.match(block)
+            if m is None:
+                # Like the tokenizer, ignore an empty last block (i.e. a
+                # trailing comma or an empty string)
+                if i == len(blocks) - 1 and _BLANK_RE.match(block):
+                    break
+                raise DepSolverError("Invalid requirement string: %r" % requirement_string)
+
+            name, operator, version = m.group("name", "operator", "version")
+            constraints = parsed.get(name)
+            if constraints is None:
+                constraints = parsed[name] = []
+            if operator is None:
+                constraints.append(Any())
+            elif "*" in version:
+                if operator != "==":
+                    raise InvalidVersion("glob version %s can only be use with == operation" \
+                            % version)
+                constraints.extend(_glob_version_to_constraints(version))
+            else:
+                constraints.append(_OPERATOR_STRING_TO_SPEC[operator](version))
+        return parsed
+
+    def parse_tokens(self, requirement_string):
+        """Parse the given requirement string from its tokens (see
+        tokenize).
+
+        This is the reference implementation parse is checked against.
+        """
         parsed = OrderedDict()
 
         def _parse_full_block(requirement_block):
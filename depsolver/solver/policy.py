@@ -11,12 +11,11 @@ from ..errors \
 from ..requirement \
     import \
         Requirement
-from ..version \
-    import \
-        MaxVersion
-
 R = Requirement.from_string
 
+# Rank given to installed packages, so that they sort above every version
+_INSTALLED_RANK = float("inf")
+
 class DefaultPolicy(object):
     """A Policy class that implements 'reasonable' defaults.
 
@@ -73,15 +72,19 @@ class DefaultPolicy(object):
             self._compute_prefered_packages_installed_first(pool, installed_map,
                 decision_queue)
 
-        def package_id_to_version(package_id):
-            if package_id in installed_map:
-                return MaxVersion()
-            else:
-                package = pool.package_by_id(package_id)
-                return package.version
+        # Queues only hold packages with the same name, so they can be sorted
+        # on version ranks instead of versions
+        def rank_key(ranks):
+            def package_id_to_rank(package_id):
+                if package_id in installed_map:
+                    return _INSTALLED_RANK
+                else:
+                    return ranks[package_id]
+            return package_id_to_rank
 
         for package_name, package_queue in package_queues.items():
-            sorted_package_queue = sorted(package_queue, key=package_id_to_version)[::-1]
+            ranks = pool.version_ranks(package_name)
+            sorted_package_queue = sorted(package_queue, key=rank_key(ranks))[::-1]
             package_queues[package_name] = sorted_package_queue
 
         for package_name, package_queue in package_queues.items():
@@ -149,11 +152,13 @@ def prune_to_best_version(pool, package_ids):
     if len(package_ids) < 1:
         return []
     else:
-        best_package = pool.package_by_id(package_ids[0])
+        # All the packages have the same name, so their version ranks compare
+        # as their versions
+        ranks = pool.version_ranks(pool.package_by_id(package_ids[0]).name)
+        best_rank = ranks[package_ids[0]]
         best_version_only = [package_ids[0]]
         for package_id in package_ids[1:]:
-            package = pool.package_by_id(package_id)
-            if package.version < best_package.version:
+            if ranks[package_id] < best_rank:
                 break
             else:
                 best_version_only.append(package_id)
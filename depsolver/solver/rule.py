@@ -26,7 +26,7 @@ from ..requirement \
         Requirement
 from ..version \
     import \
-        SemanticVersion, Version
+        DEFAULT_VERSION_FACTORY, Version
 
 _RULE_REASONS = [
     "internal_allow_update",
@@ -106,7 +106,7 @@ class PackageRule(HasTraits):
             return cls(pool, literals, reason, reason_details, job, id)
 
     def __init__(self, pool, literals, reason, reason_details="", job=None,
-                 id=-1, version_factory=SemanticVersion.from_string, **kw):
+                 id=-1, version_factory=DEFAULT_VERSION_FACTORY, **kw):
         if reason == "job_install":
             if not is_valid_package_name(reason_details):
                 raise DepSolverError(
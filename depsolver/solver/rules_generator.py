@@ -29,6 +29,55 @@ from .rule \
 
 R = Requirement.from_string
 
+def _is_simple_range(requirement):
+    """True if the given requirement matches a non empty range of versions,
+    without any hole nor exact version.
+
+    Requirement.matches, used for provided packages, compares bounds and
+    exact versions rather than interval sets: only for such requirements does
+    it agree with subsumes.
+    """
+    intervals = requirement.intervals.intervals
+    return requirement._equal is None and len(intervals) == 1
+
+def _redundant_dependencies(dependencies):
+    """Returns the indices of the dependencies implied by another dependency
+    of the same package.
+
+    If a dependency b subsumes a dependency a, every package providing a
+    also provides b, so the rule (-P | providers of a) implies the rule
+    (-P | providers of b), and b is redundant. This is only relied upon for
+    simple ranges (see _is_simple_range). Of several equal dependencies, all
+    but the first are redundant.
+    """
+    by_name = collections.defaultdict(list)
+    for i, dependency in enumerate(dependencies):
+        by_name[dependency.name].append(i)
+
+    redundant = set()
+    for indices in six.itervalues(by_name):
+        if len(indices) < 2:
+            continue
+        for i in indices:
+            dependency = dependencies[i]
+            for j in indices:
+                if j == i or j in redundant:
+                    continue
+                if dependency == dependencies[j]:
+                    if j < i:
+                        redundant.add(i)
+                        break
+                    continue
+                if not (_is_simple_range(dependency) and _is_simple_range(dependencies[j])
+                        and dependency.subsumes(dependencies[j])):
+                    continue
+                # dependency is either strictly wider than another one, or
+                # matches the same versions as an earlier one
+                if j < i or not dependencies[j].subsumes(dependency):
+                    redundant.add(i)
+                    break
+    return redundant
+
 class RulesSet(HasTraits):
     """
     Simple container of rules
@@ -235,13 +284,15 @@ class RulesGenerator(HasTraits):
             if not p.id in self.added_package_ids:
                 self.added_package_ids.add(p.id)
 
-                for dependency in p.dependencies:
+                redundant = _redundant_dependencies(p.dependencies)
+                for i, dependency in enumerate(p.dependencies):
                     dependency_candidates = self.pool.what_provides(dependency)
                     #print [p.id for p in dependency_candidates]
-                    rule = self._create_dependency_rule(p,
-                            dependency_candidates, "package_requires",
-                            str(dependency))
-                    self._add_rule(rule, "package")
+                    if not i in redundant:
+                        rule = self._create_dependency_rule(p,
+                                dependency_candidates, "package_requires",
+                                str(dependency))
+                        self._add_rule(rule, "package")
 
                     for candidate in dependency_candidates:
                         work_queue.append(candidate)
@@ -181,6 +181,19 @@ class TestSelectPreferredPackages(unittest.TestCase):
         r_selected_ids = [self.numpy_1_7_1.id]
         self.assertEqual(r_selected_ids, selected_ids)
 
+    def test_wide_version_fan(self):
+        """Test we keep every package with the most recent version, across
+        repositories."""
+        packages = [P("numpy-1.%d.0" % i) for i in (3, 11, 0, 7)]
+        numpy_1_11_0 = P("numpy-1.11.0")
+        pool = Pool([Repository(packages), Repository([numpy_1_11_0])])
+
+        policy = DefaultPolicy()
+        selected_ids = policy.select_preferred_packages(pool, {},
+                [p.id for p in packages + [numpy_1_11_0]])
+
+        self.assertEqual(sorted(selected_ids), [packages[1].id, numpy_1_11_0.id])
+
     def test_multiple_providers(self):
         """
         Test we select the most recent version across a list of different
@@ -28,7 +28,7 @@ from depsolver.requirement \
 
 from depsolver.solver.rules_generator \
     import \
-        RulesSet, RulesGenerator
+        RulesSet, RulesGenerator, _redundant_dependencies
 from depsolver.solver.rule \
     import \
         PackageRule
@@ -128,6 +128,63 @@ class TestCreateClauses(unittest.TestCase):
 
         self.assertTrue(rule.is_equivalent(r_rule))
 
+    def test_redundant_dependencies(self):
+        dependencies = [R("mkl >= 10.1.0"), R("mkl >= 10.2.0, mkl < 11.0.0"),
+                        R("libgfortran"), R("mkl >= 10.1.0"),
+                        R("mkl >= 10.2.0, mkl < 11.0.0")]
+        self.assertEqual(_redundant_dependencies(dependencies), set([0, 3, 4]))
+        self.assertEqual(_redundant_dependencies([R("mkl >= 10.2.0"), R("mkl < 11.0.0")]),
+                         set())
+
+    def test_redundant_dependencies_not_simple_ranges(self):
+        # Conflicting == and != constraints match nothing, which every
+        # requirement subsumes, but Requirement.matches does not follow
+        # interval sets for them
+        self.assertEqual(_redundant_dependencies([R("mkl"), R("mkl == 10.3.0, mkl != 10.3.0")]),
+                         set())
+        self.assertEqual(_redundant_dependencies([R("mkl == 10.3.0"),
+                                                  R("mkl >= 10.3.0, mkl <= 10.3.0")]),
+                         set())
+        self.assertEqual(_redundant_dependencies([R("mkl >= 10.1.0"),
+                                                  R("mkl >= 10.2.0, mkl != 10.3.0")]),
+                         set())
+        # Equal requirements match the same packages, whatever they are
+        self.assertEqual(_redundant_dependencies([R("mkl == 10.3.0"), R("mkl == 10.3.0")]),
+                         set([1]))
+
+    def test_conflicting_dependency_rules(self):
+        numpy = P("numpy-1.7.0; depends (mkl >= 10.2.0); "
+                  "depends (mkl == 10.3.0, mkl != 10.3.0)")
+        self.pool.add_repository(Repository([numpy]))
+        # Neither dependency is dropped: the second one makes numpy
+        # uninstallable on its own
+        r_literals = [
+            [-numpy.id, self.mkl_10_2_0.id, self.mkl_10_3_0.id, self.mkl_11_0_0.id],
+            [-numpy.id],
+        ]
+
+        request = Request(self.pool)
+        request.install(R("numpy == 1.7.0"))
+        rules = RulesGenerator(self.pool, request, OrderedDict()).iter_rules()
+
+        dependency_rules = [rule for rule in rules if rule.reason == "package_requires"]
+        self.assertEqual([rule.literals for rule in dependency_rules], r_literals)
+
+    def test_redundant_dependency_rules(self):
+        numpy = P("numpy-1.7.0; depends (mkl >= 10.1.0); "
+                  "depends (mkl >= 10.2.0, mkl < 11.0.0); depends (mkl >= 10.1.0)")
+        self.pool.add_repository(Repository([numpy]))
+        r_rule = PackageRule.from_string(self.pool,
+                    "-numpy-1.7.0 | mkl-10.2.0 | mkl-10.3.0", None)
+
+        request = Request(self.pool)
+        request.install(R("numpy == 1.7.0"))
+        rules = RulesGenerator(self.pool, request, OrderedDict()).iter_rules()
+
+        dependency_rules = [rule for rule in rules if rule.reason == "package_requires"]
+        self.assertEqual(len(dependency_rules), 1)
+        self.assertTrue(dependency_rules[0].is_equivalent(r_rule))
+
     @unittest.expectedFailure
     def test_iter_conflict_rules(self):
         # Making sure single package corner-case works
@@ -9,10 +9,10 @@ import os.path as op
 
 from depsolver.pool \
     import \
-        Pool
+        LazyPool, Pool
 from depsolver.package \
     import \
-        PackageInfo
+        PackageInfo, SlottedPackageInfo
 from depsolver.repository \
     import \
         Repository
@@ -336,3 +336,51 @@ class TestSolverScenario(unittest.TestCase):
     def test_single_dependency_multiple_provides(self):
         scenario = "single_dependency_multiple_provides.yaml"
         self._compute_operations(scenario)
+
+class TestLazyPoolSolve(unittest.TestCase):
+    def _installed_packages(self, pool, installed_repo):
+        request = Request(pool)
+        request.install(R("scipy"))
+        decisions = Solver(pool, installed_repo)._solve(request)
+        return set(pool.package_by_id(decision.literal).unique_name
+                   for decision in decisions if decision.literal > 0)
+
+    def test_simple(self):
+        package_strings = [
+            "mkl-10.3.0",
+            "mkl-11.0.0",
+            "numpy-1.6.0; depends (mkl)",
+            "numpy-1.7.0; depends (mkl >= 11.0.0)",
+            "scipy-0.12.0; depends (numpy >= 1.6.0)",
+            "floupi-1.0.0; depends (scipy)",
+        ]
+
+        installed_repo = Repository()
+        pool = Pool([installed_repo, Repository([P(s) for s in package_strings])])
+        r_installed = self._installed_packages(pool, installed_repo)
+
+        installed_repo = Repository()
+        pool = LazyPool([installed_repo])
+        remote_repo = pool.add_package_strings(package_strings)
+        installed = self._installed_packages(pool, installed_repo)
+
+        self.assertEqual(installed, r_installed)
+        self.assertEqual(installed, set(["mkl-11.0.0", "numpy-1.7.0", "scipy-0.12.0"]))
+        self.assertEqual(set(p.name for p in remote_repo.iter_packages()),
+                         set(["mkl", "numpy", "scipy"]))
+
+    def test_slotted_packages(self):
+        package_strings = [
+            "mkl-10.3.0",
+            "mkl-11.0.0",
+            "numpy-1.6.0; depends (mkl)",
+            "numpy-1.7.0; depends (mkl >= 11.0.0)",
+            "scipy-0.12.0; depends (numpy >= 1.6.0)",
+        ]
+
+        installed_repo = Repository()
+        pool = Pool([installed_repo, Repository.from_strings(package_strings,
+                                                             package_class=SlottedPackageInfo)])
+        installed = self._installed_packages(pool, installed_repo)
+
+        self.assertEqual(installed, set(["mkl-11.0.0", "numpy-1.7.0", "scipy-0.12.0"]))
@@ -105,8 +105,10 @@ class Transaction(HasTraits):
         packages = copy.copy(install_map)
         packages.update(update_map)
 
-        roots = packages
+        roots = copy.copy(packages)
 
+        # A package removed from roots before being reached is not used to
+        # remove other roots
         for package_id, operation in six.iteritems(packages):
             package = operation["package"]
 
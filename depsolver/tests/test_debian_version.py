@@ -1,4 +1,6 @@
+import random
 import sys
+import warnings
 
 if sys.version_info[:2] < (2, 7):
     import unittest2 as unittest
@@ -7,7 +9,7 @@ else:
 
 from depsolver.debian_version \
     import \
-        DebianVersion, is_valid_debian_version
+        DebianVersion, _cmp, _compare_part, _part_key, is_valid_debian_version
 
 V = DebianVersion.from_string
 
@@ -47,3 +49,63 @@ class TestVersionComparison(unittest.TestCase):
         self.assertTrue(V("1.0beta1") > V("1.0-1"))
         self.assertTrue(V("1.0-1bpo1") > V("1.0-1"))
         self.assertTrue(V("1.0-1") > V("1.0-1~sarge1"))
+
+    def test_tilde(self):
+        self.assertTrue(V("1.0~rc1") < V("1.0"))
+        self.assertTrue(V("1.0~~") < V("1.0~"))
+        self.assertTrue(V("1.0~rc1") < V("1.0~rc2"))
+        self.assertTrue(V("1.0~") < V("1.0~a"))
+        self.assertTrue(V("1.0-1~bpo1") < V("1.0-1"))
+
+    def test_equivalent_spellings(self):
+        for left, right in [("1.2.3", "0:1.2.3"), ("1.2.3", "1.2.3-0"),
+                            ("1.02", "1.2"), ("1.0a", "1.0a0")]:
+            self.assertEqual(V(left), V(right))
+            self.assertEqual(hash(V(left)), hash(V(right)))
+
+    def test_revision_starting_with_letter(self):
+        self.assertTrue(V("1.0-a1") > V("1.0-1"))
+        self.assertTrue(V("1.0-~1") < V("1.0-1"))
+
+    def test_sort_key(self):
+        versions = [V(s) for s in ["1.0", "1:0.1", "1.0~rc1", "1.0-1", "1.0.1",
+                                   "1.0+dfsg", "1.0a", "0.9-3"]]
+        r_versions = [V(s) for s in ["0.9-3", "1.0~rc1", "1.0", "1.0-1", "1.0a",
+                                     "1.0+dfsg", "1.0.1", "1:0.1"]]
+
+        self.assertEqual(sorted(versions), r_versions)
+        self.assertEqual(sorted(versions, key=lambda v: v.sort_key), r_versions)
+
+class TestPartKeyDifferential(unittest.TestCase):
+    """Compare version part keys against _compare_part, the character by
+    character implementation of the Debian algorithm, on random parts."""
+    def _random_part(self, rng, alphabet, starts_with_digit):
+        part = "".join(rng.choice(alphabet) for i in range(rng.randint(0, 6)))
+        if starts_with_digit:
+            part = rng.choice("0123456789") + part
+        return part
+
+    def test_against_compare_part(self):
+        rng = random.Random(0)
+        alphabet = "0123456789" * 2 + "abZ~.+"
+        n_compared = 0
+        with warnings.catch_warnings():
+            # _compare_part splits on a pattern matching empty strings
+            warnings.simplefilter("ignore")
+            for i in range(5000):
+                starts_with_digit = rng.random() < 0.5
+                left = self._random_part(rng, alphabet, starts_with_digit)
+                if rng.random() < 0.3:
+                    right = left + rng.choice(["", "~", "0", "a", ".1", "~1"])
+                else:
+                    right = self._random_part(rng, alphabet, starts_with_digit)
+                try:
+                    r_result = _compare_part(left, right)
+                except KeyError:
+                    # _compare_part cannot compare a digit with an empty
+                    # string
+                    continue
+                n_compared += 1
+                self.assertEqual(_cmp(_part_key(left), _part_key(right)), r_result,
+                                 "%r vs %r" % (left, right))
+        self.assertTrue(n_compared > 4000)
@@ -0,0 +1,74 @@
+import unittest
+
+from depsolver.interval_set \
+    import \
+        IntervalSet
+from depsolver.version \
+    import \
+        MaxVersion, MinVersion, SemanticVersion
+
+V = SemanticVersion.from_string
+
+def closed(low, high):
+    return (V(low), True, V(high), True)
+
+def opened(low, high):
+    return (V(low), False, V(high), False)
+
+class TestIntervalSet(unittest.TestCase):
+    def test_normalization(self):
+        interval_set = IntervalSet([closed("2.0.0", "3.0.0"), closed("1.0.0", "2.0.0"),
+                                    opened("1.5.0", "1.5.0"), opened("4.0.0", "5.0.0"),
+                                    (V("5.0.0"), False, V("6.0.0"), True)])
+
+        self.assertEqual(interval_set.intervals,
+                         (closed("1.0.0", "3.0.0"), opened("4.0.0", "5.0.0"),
+                          (V("5.0.0"), False, V("6.0.0"), True)))
+        self.assertTrue(IntervalSet([opened("1.0.0", "1.0.0")]).is_empty)
+
+    def test_contains(self):
+        interval_set = IntervalSet([closed("1.0.0", "2.0.0"), opened("3.0.0", "4.0.0")])
+
+        for version in ["1.0.0", "1.5.0", "2.0.0", "3.5.0"]:
+            self.assertTrue(interval_set.contains(V(version)))
+        for version in ["0.1.0", "2.5.0", "3.0.0", "4.0.0", "5.0.0"]:
+            self.assertFalse(interval_set.contains(V(version)))
+        self.assertTrue(IntervalSet.everything().contains(V("1.0.0")))
+        self.assertFalse(IntervalSet().contains(V("1.0.0")))
+
+    def test_intersect(self):
+        left = IntervalSet([closed("1.0.0", "2.0.0"), closed("3.0.0", "4.0.0")])
+        right = IntervalSet([opened("1.5.0", "3.0.0"), closed("4.0.0", "5.0.0")])
+
+        self.assertEqual(left.intersect(right),
+                         IntervalSet([(V("1.5.0"), False, V("2.0.0"), True),
+                                      closed("4.0.0", "4.0.0")]))
+        self.assertEqual(right.intersect(left), left.intersect(right))
+        self.assertEqual(left.intersect(IntervalSet.everything()), left)
+        self.assertTrue(left.intersect(IntervalSet()).is_empty)
+
+    def test_union(self):
+        left = IntervalSet([closed("1.0.0", "2.0.0"), closed("3.0.0", "4.0.0")])
+        right = IntervalSet([opened("1.5.0", "3.0.0"), opened("4.0.0", "5.0.0")])
+
+        self.assertEqual(left.union(right), IntervalSet([(V("1.0.0"), True, V("5.0.0"), False)]))
+        self.assertEqual(right.union(left), left.union(right))
+        self.assertEqual(left.union(IntervalSet()), left)
+        self.assertEqual(IntervalSet([opened("1.0.0", "2.0.0")]).union(
+                            IntervalSet([opened("2.0.0", "3.0.0")])).intervals,
+                         (opened("1.0.0", "2.0.0"), opened("2.0.0", "3.0.0")))
+
+    def test_subsumes(self):
+        wide = IntervalSet([(V("1.0.0"), True, MaxVersion(), True)])
+        narrow = IntervalSet([closed("1.5.0", "2.0.0"), opened("3.0.0", "4.0.0")])
+
+        self.assertTrue(wide.subsumes(narrow))
+        self.assertFalse(narrow.subsumes(wide))
+        self.assertTrue(narrow.subsumes(narrow))
+        self.assertTrue(narrow.subsumes(IntervalSet()))
+        self.assertFalse(narrow.subsumes(IntervalSet.single(V("3.0.0"))))
+
+    def test_repr(self):
+        interval_set = IntervalSet([(MinVersion(), True, V("1.0.0"), False)])
+        self.assertEqual(repr(interval_set), "IntervalSet([-inf, 1.0.0))")
+        self.assertEqual(repr(IntervalSet()), "IntervalSet(<empty>)")
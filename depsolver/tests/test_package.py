@@ -8,7 +8,8 @@ from depsolver.errors \
         DepSolverError
 from depsolver.package \
     import \
-        PackageInfo, parse_package_full_name
+        LazyPackageInfo, PackageInfo, SlottedPackageInfo, parse_package_full_name, \
+        parse_package_string, parse_package_string_names, parse_package_strings
 from depsolver.repository \
     import \
         Repository
@@ -75,6 +76,12 @@ class TestPackageInfo(unittest.TestCase):
         else:
             self.assertEqual(repr(package), "PackageInfo(u'numpy-1.6.0; depends (mkl >= 10.3.0)')")
 
+    def test_version_requirement(self):
+        package = PackageInfo(name="numpy", version=V("1.3.0"))
+
+        self.assertEqual(package.version_requirement, R("numpy == 1.3.0"))
+        self.assertTrue(package.version_requirement is package.version_requirement)
+
     def test_set_repository(self):
         package = PackageInfo(name="numpy", version=V("1.3.0"))
         package.repository = Repository()
@@ -94,6 +101,14 @@ class TestPackageInfoFromString(unittest.TestCase):
         self.assertEqual(package.package_string, r_package_string)
         self.assertRaises(DepSolverError, lambda: PackageInfo.from_string("numpy 1.3.0"))
 
+    def test_shared_versions(self):
+        numpy = PackageInfo.from_string("numpy-1.3.0; depends (mkl == 10.3.917)")
+        other_numpy = PackageInfo.from_string("numpy-1.3.0")
+        mkl = PackageInfo.from_string("mkl-10.3.917")
+
+        self.assertTrue(numpy.version is other_numpy.version)
+        self.assertTrue(numpy.dependencies[0]._equal is mkl.version)
+
     def test_dependencies(self):
         r_package_string = "numpy-1.6.0; depends (mkl >= 10.3.0)"
         r_package = PackageInfo(name="numpy", version=V("1.6.0"), dependencies=[R("mkl >= 10.3.0")])
@@ -137,6 +152,152 @@ class TestPackageInfoFromString(unittest.TestCase):
         self.assertEqual(package, r_package)
         self.assertEqual(package.package_string, r_package_string)
 
+class TestLazyPackageInfo(unittest.TestCase):
+    def setUp(self):
+        self.package_string = "numpy-1.6.0; depends (mkl >= 10.3.0, mkl < 11.0.0, libgfortran); " \
+                              "provides (numeric == 1.6.0); conflicts (numpy_mkl); " \
+                              "replaces (numeric); suggests (scipy)"
+
+    def test_same_as_eager(self):
+        r_package = PackageInfo.from_string(self.package_string)
+        package = LazyPackageInfo.from_string(self.package_string)
+
+        self.assertEqual(package, r_package)
+        for kind in ("dependencies", "provides", "conflicts", "replaces", "suggests"):
+            self.assertEqual(getattr(package, kind), getattr(r_package, kind))
+        self.assertEqual(package.package_string, r_package.package_string)
+
+    def test_parsed_on_access(self):
+        package = LazyPackageInfo.from_string(self.package_string)
+
+        self.assertEqual(package.requirement_names("dependencies"),
+                         set(["mkl", "libgfortran"]))
+        self.assertEqual(package.requirement_names("provides"), set(["numeric"]))
+        self.assertEqual(package.requirement_names("suggests"), set(["scipy"]))
+        self.assertFalse("dependencies" in package._requirements)
+
+        self.assertEqual(package.dependencies,
+                         [R("mkl >= 10.3.0, mkl < 11.0.0"), R("libgfortran")])
+        self.assertTrue("dependencies" in package._requirements)
+        self.assertTrue(package.dependencies is package.dependencies)
+        self.assertFalse("suggests" in package._requirements)
+
+    def test_multiple_sections(self):
+        package_string = "numpy-1.6.0; depends (mkl); depends (libgfortran)"
+        package = LazyPackageInfo.from_string(package_string)
+
+        self.assertEqual(package.dependencies, [R("mkl"), R("libgfortran")])
+
+    def test_deferred_errors(self):
+        self.assertRaises(ValueError, lambda: LazyPackageInfo.from_string("numpy-1.6.0; floupi (mkl)"))
+
+        package = LazyPackageInfo.from_string("numpy-1.6.0; depends (mkl >= 1.0.0.0.0)")
+        self.assertRaises(DepSolverError, lambda: package.dependencies)
+
+    def test_deferred_errors_repeated(self):
+        package = LazyPackageInfo.from_string("numpy-1.6.0; depends (mkl >= 1.0.0.0.0)")
+
+        self.assertRaises(DepSolverError, lambda: package.dependencies)
+        self.assertRaises(DepSolverError, lambda: package.dependencies)
+        self.assertEqual(package.requirement_names("dependencies"), set(["mkl"]))
+
+    def test_blank_blocks(self):
+        for package_string in ["numpy-1.0.0; provides ()",
+                               "numpy-1.0.0; depends (mkl, )"]:
+            r_package = PackageInfo.from_string(package_string)
+            package = LazyPackageInfo.from_string(package_string)
+
+            for kind in ("dependencies", "provides"):
+                self.assertEqual(package.requirement_names(kind),
+                                 set(r.name for r in getattr(r_package, kind)))
+                self.assertEqual(getattr(package, kind), getattr(r_package, kind))
+
+    def test_set_requirements(self):
+        package = LazyPackageInfo.from_string(self.package_string)
+        package.dependencies = [R("mkl")]
+
+        self.assertEqual(package.dependencies, [R("mkl")])
+        self.assertEqual(package.requirement_names("dependencies"), set(["mkl"]))
+
+class TestSlottedPackageInfo(unittest.TestCase):
+    def setUp(self):
+        self.package_string = "numpy-1.6.0; depends (mkl >= 10.3.0, libgfortran); " \
+                              "provides (numeric == 1.6.0); conflicts (numpy_mkl); " \
+                              "replaces (numeric); suggests (scipy)"
+
+    def test_same_as_traited(self):
+        r_package = PackageInfo.from_string(self.package_string)
+        package = SlottedPackageInfo.from_string(self.package_string)
+
+        self.assertEqual(package, r_package)
+        self.assertEqual(hash(package), hash(r_package))
+        for kind in ("dependencies", "provides", "conflicts", "replaces", "suggests"):
+            self.assertEqual(getattr(package, kind), getattr(r_package, kind))
+        self.assertEqual(package.package_string, r_package.package_string)
+        self.assertEqual(package.unique_name, r_package.unique_name)
+        self.assertEqual(repr(package), repr(r_package))
+        self.assertEqual(str(package), str(r_package))
+        self.assertEqual(package.version_requirement, R("numpy == 1.6.0"))
+
+    def test_construction(self):
+        package = SlottedPackageInfo("numpy", V("1.3.0"), dependencies=[R("mkl")])
+
+        self.assertEqual(package.id, -1)
+        self.assertEqual(package.dependencies, [R("mkl")])
+        self.assertEqual(package.provides, [])
+        self.assertEqual(package.repository, None)
+        self.assertFalse(hasattr(package, "__dict__"))
+
+    def test_set_repository(self):
+        package = SlottedPackageInfo("numpy", V("1.3.0"))
+        package.repository = Repository()
+
+        def set_repository():
+            package.repository = Repository()
+        self.assertRaises(ValueError, set_repository)
+
+class TestParsePackageStrings(unittest.TestCase):
+    def setUp(self):
+        self.package_strings = [
+            "numpy-1.6.0; depends (mkl >= 10.3.0, mkl < 11.0.0, libgfortran); "
+            "provides (numeric == 1.6.0); conflicts (numpy_mkl); "
+            "replaces (numeric); suggests (scipy)",
+            "numpy-1.7.0; depends (mkl >= 10.3.0, libgfortran)",
+            "scipy-0.12.0; depends (numpy >= 1.6.0, MKL >= 10.3.0, numpy < 1.7.0)",
+            "scipy-0.13.0; depends (numpy); depends (numpy >= 1.6.0)",
+            "mkl-10.3.0",
+        ]
+
+    def test_same_as_parse_package_string(self):
+        parsed = list(parse_package_strings(self.package_strings))
+
+        self.assertEqual(len(parsed), len(self.package_strings))
+        for package_string, fields in zip(self.package_strings, parsed):
+            self.assertEqual(fields, parse_package_string(package_string, V))
+
+    def test_shared_instances(self):
+        (_, version1, _, dependencies1, _, _, _), (_, version2, _, dependencies2, _, _, _) = \
+                parse_package_strings(["numpy-1.6.0; depends (libgfortran)",
+                                       "scipy-1.6.0; depends (mkl, libgfortran)"])
+
+        self.assertTrue(version1 is version2)
+        self.assertTrue(dependencies1[0] is dependencies2[1])
+
+    def test_from_strings(self):
+        for package_class in (PackageInfo, SlottedPackageInfo, LazyPackageInfo):
+            packages = list(package_class.from_strings(self.package_strings))
+            r_packages = [PackageInfo.from_string(package_string)
+                          for package_string in self.package_strings]
+
+            self.assertEqual(packages, r_packages)
+            for package, r_package in zip(packages, r_packages):
+                self.assertTrue(isinstance(package, package_class))
+                self.assertEqual(package.package_string, r_package.package_string)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError,
+                          lambda: list(parse_package_strings(["numpy-1.6.0; floupi (mkl)"])))
+
 class TestParsePackageName(unittest.TestCase):
     def test_multiple_dependencies(self):
         r_package_string = "scipy-0.12.0; depends (numpy >= 1.6.0, " \
@@ -154,3 +315,28 @@ class TestParsePackageName(unittest.TestCase):
         name, version = parse_package_full_name("numpy-1.6.0")
         self.assertEqual(name, "numpy")
         self.assertEqual(version, "1.6.0")
+
+    def test_names(self):
+        name, indirect_names = parse_package_string_names("numpy-1.6.0")
+        self.assertEqual(name, "numpy")
+        self.assertEqual(indirect_names, [])
+
+        name, indirect_names = parse_package_string_names(
+                "nomkl_numpy-1.6.0; depends (mkl >= 10.3.0); "
+                "provides (numpy == 1.6.0, numpy_core); replaces (old_numpy)")
+        self.assertEqual(name, "nomkl_numpy")
+        self.assertEqual(indirect_names, ["numpy", "numpy_core", "old_numpy"])
+
+        self.assertRaises(ValueError,
+                lambda: parse_package_string_names("numpy-1.6.0; floupi (mkl)"))
+
+    def test_names_blank_blocks(self):
+        # Empty sections and trailing commas are accepted by the eager parser
+        for package_string in ["numpy-1.0.0; provides ()",
+                               "numpy-1.0.0; depends (mkl, )",
+                               "numpy-1.0.0; provides (numeric, )"]:
+            package = PackageInfo.from_string(package_string)
+            name, indirect_names = parse_package_string_names(package_string)
+            self.assertEqual(name, package.name)
+            self.assertEqual(set(indirect_names),
+                             set(r.name for r in package.provides + package.replaces))
@@ -1,15 +1,27 @@
+import os
+import shutil
+import tempfile
 import unittest
 
+from depsolver._store \
+    import \
+        PackageStore
+from depsolver.bundled.traitlets \
+    import \
+        TraitError
+from depsolver.debian_version \
+    import \
+        DebianVersion
 from depsolver.errors \
     import \
         DepSolverError, MissingPackageInfoInPool
 
 from depsolver.package \
     import \
-        PackageInfo
+        LazyPackageInfo, PackageInfo, SlottedPackageInfo
 from depsolver.pool \
     import \
-        MATCH, MATCH_NAME, MATCH_PROVIDE, Pool
+        MATCH, MATCH_NAME, MATCH_PROVIDE, MATCH_REPLACE, ColumnarPool, LazyPool, Pool
 from depsolver.repository \
     import \
         Repository
@@ -177,3 +189,665 @@ class TestPool(unittest.TestCase):
         self.assertEqual(pool.repository_priority(free_repo), -1)
         self.assertEqual(pool.repository_priority(another_repo), -1)
         self.assertEqual(pool.repository_priority(another_repo_wo_name), -1)
+
+class TestWhatProvidesCache(unittest.TestCase):
+    def setUp(self):
+        self.mkl_10_1_0 = P("mkl-10.1.0")
+        self.mkl_10_2_0 = P("mkl-10.2.0")
+        self.mkl_11_0_0 = P("mkl-11.0.0")
+
+    def test_hits_and_misses(self):
+        pool = Pool([Repository([self.mkl_10_1_0, self.mkl_10_2_0])])
+
+        self.assertEqual(pool.what_provides(R("mkl >= 10.2.0")), [self.mkl_10_2_0])
+        self.assertEqual(pool.what_provides(R("mkl >= 10.2.0")), [self.mkl_10_2_0])
+        self.assertEqual(pool.what_provides(R("mkl >= 10.2.0"), "direct_only"), [self.mkl_10_2_0])
+
+        info = pool.what_provides_cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.currsize, 2)
+
+    def test_returned_list_is_a_copy(self):
+        pool = Pool([Repository([self.mkl_10_1_0, self.mkl_10_2_0])])
+
+        pool.what_provides(R("mkl")).pop()
+        self.assertEqual(pool.what_provides(R("mkl")), [self.mkl_10_1_0, self.mkl_10_2_0])
+
+    def test_invalidated_by_add_repository(self):
+        pool = Pool([Repository([self.mkl_10_1_0, self.mkl_10_2_0])])
+        self.assertEqual(len(pool.what_provides(R("mkl"))), 2)
+
+        pool.add_repository(Repository([self.mkl_11_0_0]))
+        self.assertEqual(pool.what_provides_cache_info().currsize, 0)
+        self.assertEqual(len(pool.what_provides(R("mkl"))), 3)
+
+    def test_bounded(self):
+        pool = Pool([Repository([self.mkl_10_1_0, self.mkl_10_2_0])], cache_size=1)
+
+        pool.what_provides(R("mkl"))
+        pool.what_provides(R("mkl >= 10.2.0"))
+        pool.what_provides(R("mkl"))
+
+        info = pool.what_provides_cache_info()
+        self.assertEqual(info.hits, 0)
+        self.assertEqual(info.misses, 3)
+        self.assertEqual(info.currsize, 1)
+
+class TestWhatProvidesVersionIndex(unittest.TestCase):
+    def _reference_what_provides(self, pool, requirement, mode):
+        # Linear scan over every package, as done before the version index
+        strict_matches, provided_match, name_match = [], [], False
+        for package_id in sorted(pool._packages_by_id):
+            package = pool.package_by_id(package_id)
+            match = pool.matches(package, requirement)
+            if match in (MATCH, MATCH_NAME):
+                name_match = True
+            if match in (MATCH, MATCH_REPLACE):
+                strict_matches.append(package)
+            elif match == MATCH_PROVIDE:
+                provided_match.append(package)
+        if mode == "direct_only" or (mode == "composer" and name_match):
+            return strict_matches
+        else:
+            return strict_matches + provided_match
+
+    def test_against_linear_scan(self):
+        # Versions are deliberately not added in sorted order
+        repo1 = Repository([P("numpy-1.%d.0" % i) for i in (7, 3, 9, 0, 5)])
+        repo2 = Repository([
+            P("numpy-1.5.0"),
+            P("numpy-1.6.0"),
+            P("nomkl_numpy-1.6.0; provides (numpy == 1.6.0)"),
+            P("numpy_fork-2.0.0; replaces (numpy <= 1.3.0)"),
+            P("numpy-1.4.0-dev1"),
+        ])
+        pool = Pool([repo1, repo2])
+
+        for requirement_string in ["numpy", "numpy >= 1.4.0",
+                                   "numpy > 1.5.0, numpy < 1.9.0",
+                                   "numpy == 1.5.0", "numpy != 1.5.0",
+                                   "numpy <= 1.4.0", "numpy > 2.0.0",
+                                   "nomkl_numpy", "scipy"]:
+            requirement = R(requirement_string)
+            for mode in ("composer", "direct_only", "include_indirect"):
+                self.assertEqual(pool.what_provides(requirement, mode),
+                                 self._reference_what_provides(pool, requirement, mode))
+
+    def test_same_version_in_two_repositories(self):
+        numpy_1 = P("numpy-1.6.0")
+        numpy_2 = P("numpy-1.6.0")
+        pool = Pool([Repository([numpy_1]), Repository([numpy_2])])
+
+        self.assertEqual([p.id for p in pool.what_provides(R("numpy == 1.6.0"))],
+                         [numpy_1.id, numpy_2.id])
+
+class TestVersionRank(unittest.TestCase):
+    def test_dense_ranks(self):
+        numpy_1_7_0, numpy_1_3_0, numpy_1_5_0 = P("numpy-1.7.0"), P("numpy-1.3.0"), P("numpy-1.5.0")
+        other_numpy_1_5_0, mkl_10_3_0 = P("numpy-1.5.0"), P("mkl-10.3.0")
+        pool = Pool([Repository([numpy_1_7_0, numpy_1_3_0, numpy_1_5_0, mkl_10_3_0]),
+                     Repository([other_numpy_1_5_0])])
+
+        self.assertEqual([pool.version_rank(p) for p in
+                          (numpy_1_3_0, numpy_1_5_0, other_numpy_1_5_0, numpy_1_7_0)],
+                         [0, 1, 1, 2])
+        self.assertEqual(pool.version_rank(mkl_10_3_0), 0)
+        self.assertEqual(pool.version_ranks("mkl"), {mkl_10_3_0.id: 0})
+        self.assertEqual(pool.version_ranks("scipy"), {})
+
+    def test_recomputed(self):
+        numpy_1_3_0, numpy_1_5_0 = P("numpy-1.3.0"), P("numpy-1.5.0")
+        pool = Pool([Repository([numpy_1_3_0, numpy_1_5_0])])
+        self.assertEqual(pool.version_rank(numpy_1_5_0), 1)
+
+        numpy_1_4_0 = P("numpy-1.4.0")
+        repository = Repository([numpy_1_4_0])
+        pool.add_repository(repository)
+        self.assertEqual(pool.version_rank(numpy_1_4_0), 1)
+        self.assertEqual(pool.version_rank(numpy_1_5_0), 2)
+
+        pool.remove_repository(repository)
+        self.assertEqual(pool.version_rank(numpy_1_5_0), 1)
+        self.assertRaises(MissingPackageInfoInPool, lambda: pool.version_rank(numpy_1_4_0))
+
+class TestLazyPool(unittest.TestCase):
+    def setUp(self):
+        self.package_strings = [
+            "mkl-10.3.0",
+            "mkl-11.0.0",
+            "numpy-1.6.0; depends (mkl)",
+            "numpy-1.7.0; depends (mkl >= 11.0.0)",
+            "nomkl_numpy-1.7.0; provides (numpy == 1.7.0)",
+            "scipy-0.12.0; depends (numpy >= 1.6.0)",
+        ]
+
+    def test_nothing_parsed_upfront(self):
+        pool = LazyPool()
+        repository = pool.add_package_strings(self.package_strings, "remote")
+
+        self.assertEqual(len(repository), 0)
+        self.assertEqual(pool.repositories, [repository])
+
+    def test_what_provides(self):
+        pool = LazyPool()
+        repository = pool.add_package_strings(self.package_strings)
+
+        numpy_packages = pool.what_provides(R("numpy"), "include_indirect")
+        self.assertEqual(set(p.unique_name for p in numpy_packages),
+                         set(["numpy-1.6.0", "numpy-1.7.0", "nomkl_numpy-1.7.0"]))
+        # Only numpy and its providers have been parsed
+        self.assertEqual(len(repository), 3)
+        for package in numpy_packages:
+            self.assertTrue(pool.package_by_id(package.id) is package)
+            self.assertTrue(package.repository is repository)
+
+        mkl_packages = pool.what_provides(R("mkl >= 11.0.0"))
+        self.assertEqual([p.unique_name for p in mkl_packages], ["mkl-11.0.0"])
+        self.assertEqual(len(repository), 5)
+
+    def test_same_results_as_pool(self):
+        lazy_pool = LazyPool()
+        lazy_pool.add_package_strings(self.package_strings)
+        pool = Pool([Repository([P(s) for s in self.package_strings])])
+
+        for requirement_string in ["numpy", "numpy >= 1.7.0", "mkl", "scipy",
+                                   "nomkl_numpy", "floupi"]:
+            for mode in ("composer", "direct_only", "include_indirect"):
+                requirement = R(requirement_string)
+                self.assertEqual(
+                    set(p.package_string for p in lazy_pool.what_provides(requirement, mode)),
+                    set(p.package_string for p in pool.what_provides(requirement, mode)))
+
+    def test_blank_blocks_same_as_pool(self):
+        package_strings = ["mkl-10.3.0",
+                           "numpy-1.0.0; provides ()",
+                           "numpy-1.1.0; depends (mkl, )",
+                           "nomkl_numpy-1.1.0; provides (numpy == 1.1.0, )"]
+        lazy_pool = LazyPool()
+        lazy_pool.add_package_strings(package_strings)
+        pool = Pool([Repository([P(s) for s in package_strings])])
+
+        for requirement_string in ["numpy", "mkl", "nomkl_numpy"]:
+            for mode in ("composer", "direct_only", "include_indirect"):
+                requirement = R(requirement_string)
+                self.assertEqual(
+                    set(p.package_string for p in lazy_pool.what_provides(requirement, mode)),
+                    set(p.package_string for p in pool.what_provides(requirement, mode)))
+
+    def test_add_package_strings_invalidates_cache(self):
+        pool = LazyPool()
+        pool.add_package_strings(["mkl-10.3.0"])
+        self.assertEqual(len(pool.what_provides(R("mkl"))), 1)
+
+        pool.add_package_strings(["mkl-11.0.0"])
+        self.assertEqual(len(pool.what_provides(R("mkl"))), 2)
+
+    def test_eager_repositories(self):
+        pool = LazyPool([Repository([P("mkl-10.3.0")])])
+        pool.add_package_strings(["mkl-11.0.0"])
+
+        self.assertEqual(len(pool.what_provides(R("mkl"))), 2)
+
+class TestColumnarPool(unittest.TestCase):
+    def setUp(self):
+        self.package_strings = [
+            "mkl-10.3.0",
+            "mkl-11.0.0",
+            "numpy-1.6.0; depends (mkl)",
+            "numpy-1.7.0; depends (mkl >= 11.0.0, mkl != 11.0.1)",
+            "nomkl_numpy-1.7.0; provides (numpy == 1.7.0)",
+            "scipy-0.12.0-rc1; depends (numpy >= 1.6.0); replaces (scipy_old)",
+        ]
+
+    def test_nothing_built_upfront(self):
+        pool = ColumnarPool()
+        repository = pool.add_package_strings(self.package_strings, "remote")
+
+        self.assertEqual(len(repository), 0)
+        self.assertEqual(pool.repositories, [repository])
+
+        numpy_packages = pool.what_provides(R("numpy"), "include_indirect")
+        self.assertEqual(len(numpy_packages), 3)
+        self.assertEqual(len(repository), 3)
+        for package in numpy_packages:
+            self.assertTrue(pool.package_by_id(package.id) is package)
+            self.assertTrue(package.repository is repository)
+
+    def test_same_results_as_pool(self):
+        columnar_pool = ColumnarPool()
+        columnar_pool.add_package_strings(self.package_strings)
+        pool = Pool([Repository([P(s) for s in self.package_strings])])
+
+        for requirement_string in ["numpy", "numpy >= 1.7.0", "mkl", "scipy",
+                                   "scipy_old", "nomkl_numpy", "floupi"]:
+            for mode in ("composer", "direct_only", "include_indirect"):
+                requirement = R(requirement_string)
+                self.assertEqual(
+                    [(p.id, p.package_string) for p in columnar_pool.what_provides(requirement, mode)],
+                    [(p.id, p.package_string) for p in pool.what_provides(requirement, mode)])
+
+    def test_add_packages(self):
+        pool = ColumnarPool()
+        repository = pool.add_packages((P(s) for s in self.package_strings), "remote")
+
+        self.assertEqual(len(repository), 0)
+        self.assertEqual(repository.name, "remote")
+        self.assertEqual([p.package_string for p in pool.what_provides(R("mkl"))],
+                         ["mkl-10.3.0", "mkl-11.0.0"])
+
+    def test_package_by_id(self):
+        pool = ColumnarPool()
+        pool.add_package_strings(self.package_strings)
+
+        # Every package is known by id, even before being looked up
+        package = pool.package_by_id(4)
+        self.assertEqual(package.package_string, self.package_strings[3])
+        self.assertTrue(pool.package_by_id(4) is package)
+        self.assertTrue(pool.what_provides(R("numpy >= 1.7.0"), "direct_only")[0] is package)
+        self.assertRaises(MissingPackageInfoInPool, lambda: pool.package_by_id(7))
+
+    def test_shared_requirements(self):
+        pool = ColumnarPool()
+        pool.add_package_strings(["numpy-1.6.0; depends (mkl)",
+                                  "numpy-1.7.0; depends (mkl)"])
+
+        numpy_1_6_0, numpy_1_7_0 = pool.what_provides(R("numpy"))
+        self.assertTrue(numpy_1_6_0.dependencies[0] is numpy_1_7_0.dependencies[0])
+
+    def test_remove_repository(self):
+        pool = ColumnarPool()
+        repository = pool.add_package_strings(self.package_strings)
+        pool.add_package_strings(["mkl-12.0.0"])
+
+        pool.remove_repository(repository)
+        self.assertEqual([p.id for p in pool.what_provides(R("mkl"))], [7])
+        self.assertEqual(pool.what_provides(R("numpy")), [])
+        self.assertRaises(MissingPackageInfoInPool, lambda: pool.package_by_id(1))
+
+    def test_large_version_numbers(self):
+        package_strings = ["foo-20130101123000.0.0",
+                           "bar-1.0.0; depends (foo >= 20130101123000.0.0, foo != 4294967296.0.0)"]
+        pool = ColumnarPool()
+        pool.add_package_strings(package_strings)
+        other_pool = ColumnarPool()
+        other_pool.add_packages(P(s) for s in package_strings)
+
+        for columnar_pool in (pool, other_pool):
+            foo, = columnar_pool.what_provides(R("foo >= 20130101123000.0.0"))
+            self.assertEqual(foo.package_string, "foo-20130101123000.0.0")
+            bar, = columnar_pool.what_provides(R("bar"))
+            self.assertEqual(bar.dependencies,
+                             [R("foo >= 20130101123000.0.0, foo != 4294967296.0.0")])
+
+    def test_store_overflow(self):
+        store = PackageStore()
+        self.assertRaises(DepSolverError, lambda: store.append(P("foo-1.0.0"), 2 ** 40, 0))
+        self.assertEqual(len(store), 0)
+        self.assertEqual(len(store.requirement_offsets), 1)
+
+    def test_snapshot(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, "pool.snapshot")
+            r_pool = Pool([Repository([P(s) for s in self.package_strings])])
+            r_pool.save_snapshot(path)
+
+            pool = ColumnarPool.load_snapshot(path)
+            self.assertEqual(len(pool.repositories[0]), 0)
+            for requirement_string in ["numpy", "mkl >= 11.0.0", "scipy_old"]:
+                requirement = R(requirement_string)
+                self.assertEqual(
+                    [(p.id, p.package_string) for p in pool.what_provides(requirement)],
+                    [(p.id, p.package_string) for p in r_pool.what_provides(requirement)])
+
+            pool.save_snapshot(path)
+            pool = Pool.load_snapshot(path)
+            self.assertEqual(set(p.package_string for p in pool.repositories[0].iter_packages()),
+                             set(P(s).package_string for s in self.package_strings))
+        finally:
+            shutil.rmtree(tempdir)
+
+class TestReverseDependencies(unittest.TestCase):
+    def setUp(self):
+        self.mkl_10_3_0 = P("mkl-10.3.0")
+        self.mkl_11_0_0 = P("mkl-11.0.0")
+        self.numpy_1_6_0 = P("numpy-1.6.0; depends (mkl)")
+        self.numpy_1_7_0 = P("numpy-1.7.0; depends (mkl >= 11.0.0)")
+        self.nomkl_numpy_1_7_0 = P("nomkl_numpy-1.7.0; provides (numpy == 1.7.0); conflicts (mkl)")
+        self.scipy_0_12_0 = P("scipy-0.12.0; depends (numpy >= 1.7.0)")
+        self.scipy_ng_0_12_0 = P("scipy_ng-0.12.0; replaces (scipy <= 0.12.0)")
+
+        self.pool = Pool([Repository([self.mkl_10_3_0, self.mkl_11_0_0,
+                                      self.numpy_1_6_0, self.numpy_1_7_0,
+                                      self.nomkl_numpy_1_7_0, self.scipy_0_12_0,
+                                      self.scipy_ng_0_12_0])])
+
+    def test_what_requires(self):
+        pool = self.pool
+
+        self.assertEqual(pool.what_requires(self.mkl_10_3_0), [self.numpy_1_6_0])
+        self.assertEqual(pool.what_requires(self.mkl_11_0_0),
+                         [self.numpy_1_6_0, self.numpy_1_7_0])
+        self.assertEqual(pool.what_requires(self.numpy_1_6_0), [])
+        self.assertEqual(pool.what_requires(self.numpy_1_7_0), [self.scipy_0_12_0])
+        self.assertEqual(pool.what_requires(self.scipy_0_12_0), [])
+
+    def test_what_requires_mode(self):
+        pool = self.pool
+
+        # nomkl_numpy only provides numpy == 1.7.0
+        self.assertEqual(pool.what_requires(self.nomkl_numpy_1_7_0), [])
+        self.assertEqual(pool.what_requires(self.nomkl_numpy_1_7_0, "include_indirect"),
+                         [self.scipy_0_12_0])
+
+    def test_what_conflicts(self):
+        pool = self.pool
+
+        self.assertEqual(pool.what_conflicts(self.mkl_10_3_0), [self.nomkl_numpy_1_7_0])
+        self.assertEqual(pool.what_conflicts(self.numpy_1_7_0), [])
+
+    def test_what_replaces(self):
+        pool = self.pool
+
+        self.assertEqual(pool.what_replaces(self.scipy_0_12_0), [self.scipy_ng_0_12_0])
+        self.assertEqual(pool.what_replaces(self.numpy_1_7_0), [])
+
+    def test_updated_with_repositories(self):
+        pool = self.pool
+        scipy_0_13_0 = P("scipy-0.13.0; depends (numpy >= 1.6.0)")
+        repository = Repository([scipy_0_13_0])
+
+        pool.add_repository(repository)
+        self.assertEqual(pool.what_requires(self.numpy_1_6_0), [scipy_0_13_0])
+        self.assertEqual(pool.what_requires(self.numpy_1_7_0),
+                         [self.scipy_0_12_0, scipy_0_13_0])
+
+        new_scipy_0_13_0 = P("scipy-0.13.0; depends (numpy >= 1.6.0)")
+        pool.replace_repository(repository, Repository([new_scipy_0_13_0]))
+        self.assertEqual(pool.what_requires(self.numpy_1_6_0), [new_scipy_0_13_0])
+
+        pool.remove_repository(pool.repositories[-1])
+        self.assertEqual(pool.what_requires(self.numpy_1_6_0), [])
+
+    def test_lazy_pool(self):
+        pool = LazyPool()
+        pool.add_package_strings(["scipy-0.12.0", "scipy_ng-0.12.0; replaces (scipy)"])
+
+        scipy = pool.what_provides(R("scipy"), "direct_only")[0]
+        self.assertEqual([p.name for p in pool.what_replaces(scipy)], ["scipy_ng"])
+
+class TestLazyPackageInfo(unittest.TestCase):
+    def test_add_repository(self):
+        L = LazyPackageInfo.from_string
+        mkl = L("mkl-10.3.0")
+        numpy = L("numpy-1.6.0; depends (mkl >= 10.3.0)")
+        nomkl_numpy = L("nomkl_numpy-1.6.0; depends (libgfortran); provides (numpy == 1.6.0)")
+        pool = Pool([Repository([mkl, numpy, nomkl_numpy])])
+
+        # Adding packages does not parse their dependencies
+        self.assertFalse("dependencies" in numpy._requirements)
+        self.assertEqual(pool.what_provides(R("numpy"), "include_indirect"),
+                         [numpy, nomkl_numpy])
+        self.assertEqual(pool.what_requires(mkl), [numpy])
+        self.assertFalse("dependencies" in nomkl_numpy._requirements)
+
+    def test_blank_blocks(self):
+        L = LazyPackageInfo.from_string
+        mkl = L("mkl-10.3.0")
+        numpy = L("numpy-1.0.0; depends (mkl, )")
+        numeric = L("numeric-1.0.0; provides ()")
+        pool = Pool([Repository([mkl, numpy, numeric])])
+
+        self.assertEqual(pool.what_requires(mkl), [numpy])
+        self.assertEqual(pool.what_provides(R("numeric"), "include_indirect"), [numeric])
+
+class TestSlottedPackageInfo(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.package_strings = ["mkl-10.3.0", "numpy-1.6.0; depends (mkl >= 10.3.0)",
+                                "nomkl_numpy-1.6.0; provides (numpy == 1.6.0)"]
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_package_class(self):
+        path = os.path.join(self.tempdir, "pool.snapshot")
+        Pool([Repository([P(s) for s in self.package_strings])]).save_snapshot(path)
+
+        for pool in (Pool.load_snapshot(path, package_class=SlottedPackageInfo),
+                     LazyPool(package_class=SlottedPackageInfo),
+                     ColumnarPool(package_class=SlottedPackageInfo)):
+            if not pool.repositories:
+                pool.add_package_strings(self.package_strings)
+            packages = pool.what_provides(R("numpy"), "include_indirect")
+
+            self.assertEqual([p.package_string for p in packages],
+                             self.package_strings[1:])
+            for package in packages:
+                self.assertTrue(isinstance(package, SlottedPackageInfo))
+
+    def test_invalid_package_class(self):
+        self.assertRaises(TraitError, lambda: Pool(package_class=Repository))
+
+class TestPackageIdentity(unittest.TestCase):
+    def test_cached_identity(self):
+        for package_class in (PackageInfo, SlottedPackageInfo):
+            package_string = "numpy-1.6.0; depends (mkl >= 10.3.0)"
+            package = package_class.from_string(package_string)
+            r_hash = hash("numpy-1.6.0%d" % 1)
+
+            Pool([Repository([package])])
+
+            self.assertEqual(package.id, 1)
+            self.assertEqual(package._identity[:3], (1, "numpy-1.6.0", r_hash))
+            self.assertEqual(hash(package), r_hash)
+            self.assertEqual(package.unique_name, "numpy-1.6.0")
+            self.assertEqual(package.package_string, package_string)
+            self.assertEqual(package._identity[3], package_string)
+
+            # The cached identity is ignored once the id changes
+            package.id = 2
+            self.assertEqual(hash(package), hash("numpy-1.6.0%d" % 2))
+
+    def test_equality(self):
+        package = P("numpy-1.6.0; depends (mkl)")
+        same_package = P("numpy-1.6.0; depends (mkl)")
+        Pool([Repository([package])])
+        Pool([Repository([same_package])])
+
+        self.assertEqual(package, same_package)
+        self.assertEqual(hash(package), hash(same_package))
+
+        other_package = P("numpy-1.6.0; depends (mkl)")
+        Pool([Repository([P("mkl-10.3.0"), other_package])])
+        self.assertFalse(package == other_package)
+
+class TestIncrementalUpdates(unittest.TestCase):
+    def setUp(self):
+        self.mkl_10_3_0 = P("mkl-10.3.0")
+        self.mkl_11_0_0 = P("mkl-11.0.0")
+        self.numpy_1_6_0 = P("numpy-1.6.0; depends (mkl)")
+        self.numpy_1_7_0 = P("numpy-1.7.0; depends (mkl >= 11.0.0)")
+
+    def test_remove_repository(self):
+        mkl_repo = Repository([self.mkl_10_3_0, self.mkl_11_0_0], "mkl")
+        numpy_repo = Repository([self.numpy_1_6_0, self.numpy_1_7_0], "numpy")
+        pool = Pool([mkl_repo, numpy_repo])
+        numpy_ids = [self.numpy_1_6_0.id, self.numpy_1_7_0.id]
+
+        self.assertEqual(len(pool.what_provides(R("mkl"))), 2)
+        pool.remove_repository(mkl_repo)
+
+        self.assertEqual(pool.repositories, [numpy_repo])
+        self.assertEqual(pool.what_provides(R("mkl")), [])
+        self.assertFalse(pool.has_package(self.mkl_10_3_0))
+        self.assertEqual([p.id for p in pool.what_provides(R("numpy"))], numpy_ids)
+        self.assertRaises(DepSolverError, lambda: pool.repository_priority(mkl_repo))
+        self.assertRaises(DepSolverError, lambda: pool.remove_repository(mkl_repo))
+
+    def test_remove_repository_keeps_other_names_cached(self):
+        mkl_repo = Repository([self.mkl_10_3_0, self.mkl_11_0_0])
+        numpy_repo = Repository([self.numpy_1_6_0, self.numpy_1_7_0])
+        pool = Pool([mkl_repo, numpy_repo])
+
+        pool.what_provides(R("mkl"))
+        pool.what_provides(R("numpy"))
+        pool.remove_repository(mkl_repo)
+
+        self.assertEqual(pool.what_provides_cache_info().currsize, 1)
+
+    def test_remove_repository_priority(self):
+        paid_repo = Repository([self.mkl_11_0_0], "paid")
+        free_repo = Repository([self.mkl_10_3_0], "free")
+        numpy_repo = Repository([self.numpy_1_7_0], "numpy")
+        pool = Pool([paid_repo, free_repo, numpy_repo])
+        pool.set_repository_order("free", before="paid")
+        pool.set_repository_order("numpy", before="paid")
+
+        pool.remove_repository(free_repo)
+
+        self.assertEqual(pool.repository_priority(paid_repo), 0)
+        self.assertEqual(pool.repository_priority(numpy_repo), -1)
+
+    def test_replace_repository(self):
+        mkl_repo = Repository([self.mkl_10_3_0])
+        old_repo = Repository([self.numpy_1_6_0, self.numpy_1_7_0], "remote")
+        pool = Pool([mkl_repo, old_repo])
+        self.assertEqual(len(pool.what_provides(R("numpy"))), 2)
+
+        numpy_1_6_0 = P("numpy-1.6.0; depends (mkl)")
+        numpy_1_7_0 = P("numpy-1.7.0; depends (mkl >= 10.3.0)")
+        numpy_1_8_0 = P("numpy-1.8.0; depends (mkl)")
+        new_repo = Repository([numpy_1_6_0, numpy_1_7_0, numpy_1_8_0], "remote")
+        pool.replace_repository(old_repo, new_repo)
+
+        self.assertEqual(pool.repositories, [mkl_repo, new_repo])
+        # Unchanged package keeps its id, modified and new ones get new ids
+        self.assertEqual(numpy_1_6_0.id, self.numpy_1_6_0.id)
+        self.assertTrue(numpy_1_7_0.id > self.numpy_1_7_0.id)
+        self.assertTrue(numpy_1_8_0.id > numpy_1_7_0.id)
+        self.assertFalse(pool.has_package(self.numpy_1_7_0))
+        self.assertTrue(pool.package_by_id(numpy_1_6_0.id) is numpy_1_6_0)
+
+        packages = pool.what_provides(R("numpy"))
+        self.assertEqual(packages, [numpy_1_6_0, numpy_1_7_0, numpy_1_8_0])
+        for package in packages:
+            self.assertTrue(package.repository is new_repo)
+        self.assertEqual(pool.what_provides(R("numpy >= 1.7.0")), [numpy_1_7_0, numpy_1_8_0])
+
+    def test_replace_repository_provides(self):
+        old_repo = Repository([P("nomkl_numpy-1.7.0; provides (numpy == 1.7.0)")])
+        pool = Pool([old_repo])
+        self.assertEqual(len(pool.what_provides(R("numpy"))), 1)
+
+        new_repo = Repository([P("nomkl_numpy-1.7.0; provides (numpy == 1.7.0)")])
+        pool.replace_repository(old_repo, new_repo)
+
+        self.assertEqual(pool.what_provides(R("numpy")), list(new_repo.iter_packages()))
+
+    def test_lazy_pool_remove_repository(self):
+        pool = LazyPool()
+        repository = pool.add_package_strings(["mkl-10.3.0", "mkl-11.0.0", "numpy-1.7.0"])
+        self.assertEqual(len(pool.what_provides(R("mkl"))), 2)
+
+        pool.remove_repository(repository)
+
+        self.assertEqual(pool.what_provides(R("mkl")), [])
+        self.assertEqual(pool.what_provides(R("numpy")), [])
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, "pool.snapshot")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _assert_same_pools(self, pool, r_pool):
+        self.assertEqual([repository.name for repository in pool.repositories],
+                         [repository.name for repository in r_pool.repositories])
+        for repository, r_repository in zip(pool.repositories, r_pool.repositories):
+            self.assertEqual([(package.id, package.package_string) for package in repository.iter_packages()],
+                             [(package.id, package.package_string) for package in r_repository.iter_packages()])
+            self.assertEqual(pool.repository_priority(repository),
+                             r_pool.repository_priority(r_repository))
+
+    def test_round_trip(self):
+        repo1 = Repository([P("mkl-10.1.0"), P("mkl-10.2.0-rc1+build.2"),
+                            P("numpy-1.6.0; depends (mkl >= 10.1.0, mkl != 10.1.5, mkl < 11.0.0)"),
+                            P("nomkl_numpy-1.6.0; provides (numpy == 1.6.0); conflicts (mkl)")],
+                           name="repo1")
+        repo2 = Repository([P("mkl-11.0.0"), P("scipy-0.11.0; depends (numpy); replaces (scipy_old)")],
+                           name="repo2")
+        r_pool = Pool([repo1, repo2])
+        r_pool.set_repository_order("repo2", after="repo1")
+        # Ids are kept even when they are not contiguous
+        r_pool.remove_repository(repo1)
+        r_pool.add_repository(repo1)
+
+        r_pool.save_snapshot(self.path)
+        pool = Pool.load_snapshot(self.path)
+
+        self._assert_same_pools(pool, r_pool)
+        for requirement_string in ["mkl", "mkl >= 10.2.0", "numpy", "scipy_old",
+                                   "numpy == 1.6.0"]:
+            requirement = R(requirement_string)
+            self.assertEqual([package.id for package in pool.what_provides(requirement)],
+                             [package.id for package in r_pool.what_provides(requirement)])
+
+        numpy = pool.what_provides(R("numpy == 1.6.0"), "direct_only")[0]
+        self.assertEqual(numpy.dependencies, [R("mkl >= 10.1.0, mkl != 10.1.5, mkl < 11.0.0")])
+
+        # New packages get new ids
+        repo3 = Repository([P("mkl-12.0.0")])
+        pool.add_repository(repo3)
+        self.assertEqual(repo3.find_packages("mkl")[0].id, r_pool._id)
+
+    def test_debian_versions(self):
+        V = DebianVersion.from_string
+        package_strings = ["dpkg-1:1.16.0~rc1-2", "dpkg-1.15.8", "dpkg-1.15.8-1ubuntu2"]
+        repository = Repository([PackageInfo.from_string(package_string, V)
+                                 for package_string in package_strings])
+        r_pool = Pool([repository])
+        r_pool.save_snapshot(self.path)
+        pool = Pool.load_snapshot(self.path)
+
+        self._assert_same_pools(pool, r_pool)
+        packages = pool.what_provides(Requirement.from_string("dpkg >= 1.15.8-1", V))
+        self.assertEqual([str(package.version) for package in packages],
+                         ["1:1.16.0~rc1-2", "1.15.8-1ubuntu2"])
+
+    def test_large_version_numbers(self):
+        repository = Repository([P("foo-20130101123000.0.0"), P("foo-%d.0.0" % 2 ** 31),
+                                 P("bar-1.0.0; depends (foo > 2147483648.0.0)")],
+                                name="repo")
+        r_pool = Pool([repository])
+        r_pool.save_snapshot(self.path)
+        pool = Pool.load_snapshot(self.path)
+
+        self._assert_same_pools(pool, r_pool)
+        bar = pool.what_provides(R("bar"))[0]
+        self.assertEqual([package.version.major for package in pool.what_provides(bar.dependencies[0])],
+                         [20130101123000])
+
+        pool = ColumnarPool.load_snapshot(self.path)
+        pool.save_snapshot(self.path)
+        self._assert_same_pools(Pool.load_snapshot(self.path), r_pool)
+
+    def test_lazy_pool(self):
+        r_pool = LazyPool()
+        r_pool.add_package_strings(["mkl-10.1.0", "numpy-1.6.0; depends (mkl)"], name="repo")
+        r_pool.save_snapshot(self.path)
+
+        pool = LazyPool.load_snapshot(self.path)
+        self.assertEqual(len(pool.what_provides(R("mkl"))), 1)
+        self.assertEqual(len(pool.what_provides(R("numpy"))), 1)
+
+    def test_invalid(self):
+        fp = open(self.path, "wb")
+        try:
+            fp.write(b"not a snapshot, definitely not")
+        finally:
+            fp.close()
+        self.assertRaises(DepSolverError, lambda: Pool.load_snapshot(self.path))
@@ -1,8 +1,19 @@
+import bz2
+import gzip
+import os
+import shutil
+import tempfile
 import unittest
 
+from depsolver.debian_version \
+    import \
+        DebianVersion
+from depsolver.errors \
+    import \
+        DepSolverError
 from depsolver.package \
     import \
-        PackageInfo
+        PackageInfo, SlottedPackageInfo
 from depsolver.repository \
     import \
         Repository
@@ -66,3 +77,149 @@ class TestRepository(unittest.TestCase):
     def test_add_package_multiple_repositories(self):
         repo = Repository([self.numpy_1_6_1])
         self.assertRaises(ValueError, lambda: Repository([self.numpy_1_6_1]))
+
+    def test_find_packages(self):
+        repo = Repository([self.numpy_1_6_1, self.scipy_0_11_0, self.numpy_1_7_0])
+
+        self.assertEqual(repo.find_packages("numpy"), [self.numpy_1_6_1, self.numpy_1_7_0])
+        self.assertEqual(repo.find_packages("floupi"), [])
+        self.assertFalse(repo.has_package_name("floupi"))
+
+        # find_packages returns a copy
+        repo.find_packages("numpy").pop()
+        self.assertEqual(len(repo.find_packages("numpy")), 2)
+
+    def test_find_package_first_identical(self):
+        numpy_1_6_1 = P("numpy-1.6.1; depends (mkl)")
+        repo = Repository([self.numpy_1_6_1, numpy_1_6_1])
+
+        self.assertTrue(repo.find_package("numpy", V("1.6.1")) is self.numpy_1_6_1)
+        self.assertTrue(repo.find_package("numpy", V("1.6.2")) is None)
+
+    def test_bulk(self):
+        repo = Repository([self.numpy_1_6_1, self.numpy_1_7_0])
+
+        self.assertEqual(repo.has_package_many([self.numpy_1_7_0, self.scipy_0_11_0]),
+                         [True, False])
+        self.assertEqual(repo.find_package_many([("numpy", V("1.7.0")),
+                                                 ("scipy", V("0.11.0"))]),
+                         [self.numpy_1_7_0, None])
+        self.assertEqual(repo.find_packages_many(["numpy", "scipy"]),
+                         {"numpy": [self.numpy_1_6_1, self.numpy_1_7_0],
+                          "scipy": []})
+
+class TestFromStrings(unittest.TestCase):
+    def setUp(self):
+        self.package_strings = [
+            "mkl-10.3.0",
+            "mkl-11.0.0-rc1",
+            "numpy-1.6.0; depends (mkl)",
+            "numpy-1.7.0; depends (mkl >= 11.0.0, mkl != 11.0.1)",
+            "nomkl_numpy-1.7.0; provides (numpy == 1.7.0); conflicts (mkl)",
+            "scipy-0.12.0; depends (numpy >= 1.6.0); replaces (scipy_old)",
+        ]
+
+    def test_serial(self):
+        repository = Repository.from_strings(self.package_strings, "remote")
+
+        self.assertEqual(repository.name, "remote")
+        self.assertEqual(repository.list_packages(),
+                         [P(s) for s in self.package_strings])
+
+    def test_workers(self):
+        r_packages = [P(s) for s in self.package_strings]
+        repository = Repository.from_strings(self.package_strings, "remote", workers=2)
+
+        self.assertEqual(repository.name, "remote")
+        self.assertEqual([p.package_string for p in repository.iter_packages()],
+                         [p.package_string for p in r_packages])
+        for package in repository.iter_packages():
+            self.assertTrue(package.repository is repository)
+            self.assertEqual(package.id, -1)
+
+    def test_workers_large_version_numbers(self):
+        # Version numbers do not fit in the int32 columns of the package
+        # stores the workers send back
+        package_strings = ["foo-20130101123000.0.0",
+                           "bar-1.0.0; depends (foo >= 4294967296.0.0)"]
+        r_packages = Repository.from_strings(package_strings, workers=1).list_packages()
+        repository = Repository.from_strings(package_strings, workers=2)
+
+        self.assertEqual([p.package_string for p in repository.iter_packages()],
+                         [p.package_string for p in r_packages])
+        self.assertEqual(repository.list_packages(), r_packages)
+        self.assertEqual(repository.packages[0].version.major, 20130101123000)
+
+    def test_workers_debian(self):
+        D = DebianVersion.from_string
+        package_strings = ["dpkg-1:1.16.0~rc1-2", "dpkg-1.15.8-1ubuntu2"]
+        repository = Repository.from_strings(package_strings, version_factory=D, workers=2)
+
+        self.assertEqual([str(p.version) for p in repository.iter_packages()],
+                         ["1:1.16.0~rc1-2", "1.15.8-1ubuntu2"])
+        self.assertEqual(repository.packages[0].version_factory, D)
+
+    def test_package_class(self):
+        for workers in (1, 2):
+            repository = Repository.from_strings(self.package_strings, workers=workers,
+                                                 package_class=SlottedPackageInfo)
+
+            self.assertEqual(repository.list_packages(),
+                             [P(s) for s in self.package_strings])
+            for package in repository.iter_packages():
+                self.assertTrue(isinstance(package, SlottedPackageInfo))
+
+    def test_workers_unsupported_version_factory(self):
+        self.assertRaises(DepSolverError, lambda: Repository.from_strings(
+            self.package_strings, version_factory=lambda s: V(s), workers=2))
+
+class TestJsonLines(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.lines = [
+            b'"mkl-10.3.0"',
+            b'',
+            b'{"name": "numpy", "version": "1.6.0", "depends": ["mkl >= 10.3.0"]}',
+            b'{"name": "nomkl_numpy", "version": "1.6.0", "provides": ["numpy == 1.6.0"], "conflicts": ["mkl"]}',
+        ]
+        self.r_packages = [P("mkl-10.3.0"), P("numpy-1.6.0; depends (mkl >= 10.3.0)"),
+                           P("nomkl_numpy-1.6.0; provides (numpy == 1.6.0); conflicts (mkl)")]
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _write(self, filename, opener=open, lines=None):
+        if lines is None:
+            lines = self.lines
+        path = os.path.join(self.tempdir, filename)
+        fp = opener(path, "wb")
+        try:
+            fp.write(b"\n".join(lines) + b"\n")
+        finally:
+            fp.close()
+        return path
+
+    def _assert_packages(self, packages):
+        self.assertEqual([p.package_string for p in packages],
+                         [p.package_string for p in self.r_packages])
+
+    def test_plain(self):
+        path = self._write("index.jsonl")
+        self._assert_packages(list(Repository.iter_from_jsonl(path)))
+
+        repository = Repository.from_jsonl(path, "remote")
+        self.assertEqual(repository.name, "remote")
+        self._assert_packages(repository.iter_packages())
+
+    def test_compressed(self):
+        for filename, opener in [("index.jsonl.gz", gzip.GzipFile),
+                                 ("index.jsonl.bz2", bz2.BZ2File)]:
+            path = self._write(filename, opener)
+            self._assert_packages(Repository.from_jsonl(path).iter_packages())
+
+    def test_invalid(self):
+        path = self._write("invalid.jsonl", lines=[b'"mkl-10.3.0"', b'{"name": '])
+        self.assertRaises(DepSolverError, lambda: Repository.from_jsonl(path))
+
+        path = self._write("invalid.jsonl", lines=[b'{"name": "mkl"}'])
+        self.assertRaises(DepSolverError, lambda: Repository.from_jsonl(path))
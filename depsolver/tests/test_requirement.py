@@ -3,12 +3,18 @@ import unittest
 from depsolver.errors \
     import \
         DepSolverError
+from depsolver.interval_set \
+    import \
+        IntervalSet
+from depsolver.package \
+    import \
+        PackageInfo
 from depsolver.requirement \
     import \
-        Requirement, RequirementParser
+        Requirement, RequirementParser, clear_parse_cache, parse_cache_info
 from depsolver.requirement_parser \
     import \
-        Any, Equal, GEQ, LEQ
+        Any, Equal, GEQ, LEQ, LT
 from depsolver.version \
     import \
         SemanticVersion
@@ -162,3 +168,95 @@ class TestRequirementParser(unittest.TestCase):
         requirement = Requirement.from_package_string("numpy-1.3.0")
 
         self.assertEqual(requirement, r_requirement)
+
+    def test_parsed_versions(self):
+        def version_factory(version_string):
+            raise AssertionError("parsed versions should not be parsed again")
+
+        r_requirement = Requirement.from_string("numpy >= 1.3.0, numpy < 2.0.0")
+        requirement = Requirement("numpy", [GEQ(V("1.3.0")), LT(V("2.0.0"))],
+                                  version_factory)
+
+        self.assertEqual(requirement, r_requirement)
+
+    def test_interned(self):
+        R = Requirement.from_string
+
+        requirement = Requirement.interned("numpy", [GEQ("1.3.0"), LT("2.0.0")])
+
+        self.assertEqual(requirement, R("numpy >= 1.3.0, numpy < 2.0.0"))
+        self.assertTrue(requirement is Requirement.interned("numpy", [LT("2.0.0"), GEQ("1.3.0")]))
+        self.assertTrue(R("numpy >= 1.3.0, numpy < 2.0.0") is requirement)
+        self.assertFalse(Requirement.interned("numpy", [GEQ("1.3.0")]) is requirement)
+        self.assertFalse(Requirement.interned("numpy", [GEQ("1.3.0"), LT("2.0.0")],
+                                              lambda s: V(s)) is requirement)
+
+    def test_interned_from_package_strings(self):
+        P = PackageInfo.from_string
+
+        numpy = P("numpy-1.6.0; depends (mkl >= 10.3.0)")
+        scipy = P("scipy-0.12.0; depends (mkl >= 10.3.0, numpy)")
+
+        self.assertTrue(numpy.dependencies[0] is scipy.dependencies[0])
+
+    def test_equality(self):
+        R = Requirement.from_string
+
+        r_requirement = R("numpy >= 1.3.0, numpy < 2.0.0")
+        requirement = Requirement("numpy", [GEQ(V("1.3.0")), LT(V("2.0.0"))])
+
+        self.assertEqual(requirement, r_requirement)
+        self.assertEqual(hash(requirement), hash(r_requirement))
+        self.assertFalse(requirement != r_requirement)
+        self.assertNotEqual(R("numpy >= 1.3.0, numpy <= 2.0.0"), r_requirement)
+        self.assertNotEqual(R("numpy > 1.3.0, numpy < 2.0.0"), r_requirement)
+        self.assertNotEqual(R("scipy >= 1.3.0, scipy < 2.0.0"), r_requirement)
+        self.assertNotEqual(r_requirement, "numpy >= 1.3.0, numpy < 2.0.0")
+
+        # Requirements are equal iff their representations are
+        self.assertEqual(R("numpy >= 1.3.0, numpy >= 1.2.0"), R("numpy >= 1.3.0"))
+        self.assertEqual(R("numpy == 1.3.0, numpy == 1.4.0"), R("numpy < 1.0.0, numpy > 2.0.0"))
+        self.assertEqual(R("numpy != 1.3.0, numpy != 2.0.0"), R("numpy != 2.0.0, numpy != 1.3.0"))
+        self.assertEqual(R("numpy != 1.3.0, numpy >= 1.4.0"), R("numpy >= 1.4.0"))
+        self.assertEqual(R("numpy"), Requirement("numpy", [Any()]))
+
+    def test_intervals(self):
+        R = Requirement.from_string
+
+        self.assertEqual(R("numpy").intervals, IntervalSet.everything())
+        self.assertEqual(R("numpy == 1.3.0").intervals, IntervalSet.single(V("1.3.0")))
+        self.assertTrue(R("numpy == 1.3.0, numpy == 1.4.0").intervals.is_empty)
+        self.assertTrue(R("numpy > 2.0.0, numpy < 1.0.0").intervals.is_empty)
+        self.assertEqual(R("numpy > 1.3.0, numpy != 1.5.0, numpy <= 2.0.0").intervals,
+                         IntervalSet([(V("1.3.0"), False, V("1.5.0"), False),
+                                      (V("1.5.0"), False, V("2.0.0"), True)]))
+
+    def test_subsumes(self):
+        R = Requirement.from_string
+
+        self.assertTrue(R("numpy").subsumes(R("numpy >= 1.3.0")))
+        self.assertTrue(R("numpy >= 1.3.0").subsumes(R("numpy > 1.3.0, numpy != 1.5.0")))
+        self.assertTrue(R("numpy >= 1.3.0").subsumes(R("numpy >= 1.3.0")))
+        self.assertFalse(R("numpy > 1.3.0").subsumes(R("numpy >= 1.3.0")))
+        self.assertFalse(R("numpy != 1.5.0").subsumes(R("numpy >= 1.3.0")))
+        self.assertFalse(R("numpy").subsumes(R("scipy")))
+
+    def test_parse_cache(self):
+        r_requirements = [Requirement("numpy", [GEQ("1.3.0"), LT("2.0.0")]),
+                          Requirement("scipy", [Any()])]
+        clear_parse_cache()
+        r_hits, r_misses = parse_cache_info()[:2]
+        requirement_string = "numpy >= 1.3.0, numpy < 2.0.0, scipy"
+        parser = RequirementParser()
+
+        requirements = parser.parse(requirement_string)
+        hits, misses, maxsize, currsize = parse_cache_info()
+        self.assertEqual((hits - r_hits, misses - r_misses, currsize), (0, 1, 1))
+
+        requirements.pop()
+        self.assertEqual(parser.parse(requirement_string), r_requirements)
+        self.assertEqual(parse_cache_info().hits - r_hits, 1)
+
+        # The version factory is part of the key
+        RequirementParser(lambda s: V(s)).parse(requirement_string)
+        self.assertEqual(parse_cache_info().misses - r_misses, 2)
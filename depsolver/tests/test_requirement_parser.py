@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from depsolver.constraints \
@@ -8,8 +9,9 @@ from depsolver.errors \
         DepSolverError
 from depsolver.requirement_parser \
     import \
-        RawRequirementParser, CommaToken, DistributionNameToken, EqualToken, \
-        GEQToken, GTToken, LEQToken, LTToken, NotToken, VersionToken
+        RawRequirementParser, CommaToken, \
+        DistributionNameToken, EqualToken, GEQToken, GTToken, LEQToken, LTToken, \
+        NotToken, VersionToken, clear_parse_cache, iter_over_requirement, parse_cache_info
 
 class TestRawRequirementParser(unittest.TestCase):
     def test_lexer_simple(self):
@@ -108,3 +110,74 @@ class TestRawRequirementParser(unittest.TestCase):
         parser = RawRequirementParser()
 
         self.assertEqual(parser.parse("numpy *"), r_constraints)
+
+    def test_empty_blocks(self):
+        parser = RawRequirementParser()
+
+        self.assertEqual(parser.parse(""), {})
+        self.assertEqual(parser.parse("numpy, "), {"numpy": [Any()]})
+        self.assertRaises(DepSolverError, lambda: parser.parse(", numpy"))
+        self.assertRaises(DepSolverError, lambda: parser.parse("numpy,, scipy"))
+
+    def test_parse_cache(self):
+        clear_parse_cache()
+        r_hits, r_misses = parse_cache_info()[:2]
+        parser = RawRequirementParser()
+
+        parsed = parser.parse("numpy >= 1.3.0, numpy <= 2.0.0")
+        parsed["numpy"].append(Any())
+        parsed["scipy"] = [Any()]
+
+        self.assertEqual(parser.parse("numpy >= 1.3.0, numpy <= 2.0.0"),
+                         {"numpy": [GEQ("1.3.0"), LEQ("2.0.0")]})
+        hits, misses, maxsize, currsize = parse_cache_info()
+        self.assertEqual((hits - r_hits, misses - r_misses, currsize), (1, 1, 1))
+
+_PIECES = ["numpy", "mkl_2", " ", " ", ",", "==", ">=", ">", "<", "<=", "!=", "*",
+           "1.3.0", "2.0.0-rc1", "1.*", "1.3.*", "1.*-build", "a1.0", "1", "\t"]
+
+def _is_well_formed(requirement_string):
+    """True if every block of the given string is made of the tokens parse
+    expects, i.e. if parse and parse_tokens should agree."""
+    tokens = RawRequirementParser().tokenize(requirement_string)
+    for block in iter_over_requirement(tokens):
+        if len(block) == 0 or not isinstance(block[0], DistributionNameToken):
+            return False
+        if len(block) == 3 and not isinstance(block[2], (DistributionNameToken, VersionToken)):
+            return False
+    return True
+
+class TestParserDifferential(unittest.TestCase):
+    def _parse(self, parse, requirement_string):
+        try:
+            return parse(requirement_string), None
+        except (DepSolverError, NotImplementedError) as e:
+            return None, e.__class__
+
+    def test_random_strings(self):
+        rng = random.Random(0)
+        parser = RawRequirementParser()
+        n_parsed = 0
+        for i in range(5000):
+            requirement_string = "".join(rng.choice(_PIECES)
+                                         for j in range(rng.randint(0, 8)))
+            parsed, error = self._parse(parser.parse, requirement_string)
+            r_parsed, r_error = self._parse(parser.parse_tokens, requirement_string)
+
+            if r_error is not None:
+                self.assertTrue(error is not None, requirement_string)
+            elif error is None:
+                self.assertEqual(parsed, r_parsed, requirement_string)
+                n_parsed += 1
+            else:
+                # parse may only be stricter on malformed blocks
+                self.assertFalse(_is_well_formed(requirement_string), requirement_string)
+        self.assertTrue(n_parsed > 100)
+
+    def test_catalog_strings(self):
+        parser = RawRequirementParser()
+        for requirement_string in ["numpy >= 1.3.0, numpy < 2.0.0", "numpy>=1.3.0,numpy<2.0.0",
+                                   "numpy == 1.3.*", "numpy != 1.3.0, scipy", "numpy *",
+                                   "numpy == abc", "mkl >= 10.3.0-rc1+build.2"]:
+            self.assertEqual(parser.parse(requirement_string),
+                             parser.parse_tokens(requirement_string))
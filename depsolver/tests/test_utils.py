@@ -13,7 +13,7 @@ from depsolver.errors \
         DepSolverError
 from depsolver.utils \
     import \
-        Callable, CachedScheduler, Scheduler
+        Callable, CachedScheduler, LRUCache, Scheduler
 
 class TestScheduler(unittest.TestCase):
     def test_simple(self):
@@ -53,6 +53,17 @@ class TestScheduler(unittest.TestCase):
 
         self.assertEqual(scheduler.compute_priority(), r_priority)
 
+    def test_remove(self):
+        r_priority = dict((name, i) for i, name in \
+                           enumerate(["first", "third"]))
+
+        scheduler = Scheduler()
+        scheduler.set_constraints("second", "first", "third")
+        scheduler.remove("second")
+        scheduler.set_constraints("third", "first")
+
+        self.assertEqual(scheduler.compute_priority(), r_priority)
+
 class TestCachedScheduler(unittest.TestCase):
     def test_simple(self):
         r_priority = dict((name, i) for i, name in \
@@ -72,6 +83,38 @@ class TestCachedScheduler(unittest.TestCase):
                           enumerate(["first", "second", "third", "fourth", "fifth"]))
         self.assertEqual(scheduler.compute_priority(), r_priority)
 
+class TestLRUCache(unittest.TestCase):
+    def test_simple(self):
+        cache = LRUCache(2)
+        cache["a"] = 1
+        cache["b"] = 2
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), None)
+        self.assertEqual(cache.info(), (1, 1, 2, 2))
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache["a"] = 1
+        cache["b"] = 2
+        # "a" becomes the most recently used, so "b" is evicted first
+        cache.get("a")
+        cache["c"] = 3
+
+        self.assertTrue("a" in cache)
+        self.assertFalse("b" in cache)
+        self.assertTrue("c" in cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_unbounded(self):
+        cache = LRUCache(None)
+        for i in range(100):
+            cache[i] = i
+        self.assertEqual(len(cache), 100)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
 class TestCallableTrait(unittest.TestCase):
     def test_simple(self):
         class Foo(HasTraits):
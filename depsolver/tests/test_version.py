@@ -7,8 +7,12 @@ else:
 
 from depsolver.version \
     import \
-        BuildVersion, MaxVersion, MinVersion, PreReleaseVersion, \
-        SemanticVersion, is_version_valid
+        BuildVersion, DEFAULT_VERSION_FACTORY, InterningVersionFactory, MaxVersion, \
+        MinVersion, PreReleaseVersion, SemanticVersion, clear_version_cache, \
+        is_version_valid, version_cache_info
+from depsolver.errors \
+    import \
+        InvalidVersion
 
 V = SemanticVersion.from_string
 P = PreReleaseVersion.from_string
@@ -36,7 +40,9 @@ class TestVersion(unittest.TestCase):
     def test_construction_simple(self):
         r_v = V("1.2.0")
         v = SemanticVersion(1, 2, 0)
-        self.assertEqual(v.__dict__, r_v.__dict__)
+        for attribute in SemanticVersion.__slots__:
+            self.assertEqual(getattr(v, attribute), getattr(r_v, attribute))
+        self.assertFalse(hasattr(v, "__dict__"))
 
     def test_hashing(self):
         r_v = V("1.2.0")
@@ -123,6 +129,30 @@ class TestVersionComparison(unittest.TestCase):
             self.assertGreater(left, right)
             self.assertGreaterEqual(left, right)
 
+    def test_numeric_before_alphanumeric(self):
+        self.assertLess(V("1.0.0-1"), V("1.0.0-alpha"))
+        self.assertLess(V("1.0.0-alpha.2"), V("1.0.0-alpha.beta"))
+        self.assertLess(V("1.0.0+2"), V("1.0.0+build"))
+
+    def test_sort_key(self):
+        versions = [V("1.0.0"), V("1.0.0-rc.1"), V("0.9.0+build.2"), V("1.0.0-1"),
+                    V("0.9.0"), V("1.0.0+0.3.7"), V("0.9.0+build.11"), V("1.0.0-beta")]
+        r_versions = [V("0.9.0"), V("0.9.0+build.2"), V("0.9.0+build.11"),
+                      V("1.0.0-1"), V("1.0.0-beta"), V("1.0.0-rc.1"), V("1.0.0"),
+                      V("1.0.0+0.3.7")]
+
+        self.assertEqual(sorted(versions), r_versions)
+        self.assertEqual(sorted(versions, key=lambda v: v.sort_key), r_versions)
+        self.assertEqual(V("1.0.0-rc.1").sort_key, V("1.0.0-rc.1").sort_key)
+
+    def test_mixed_with_min_max(self):
+        versions = [MaxVersion(), V("1.0.0"), MinVersion(), V("0.1.0")]
+        self.assertEqual(sorted(versions),
+                         [MinVersion(), V("0.1.0"), V("1.0.0"), MaxVersion()])
+        self.assertTrue(V("1.0.0") > MinVersion())
+        self.assertTrue(V("1.0.0") <= MaxVersion())
+        self.assertFalse(V("1.0.0") == MaxVersion())
+
 class TestPreReleaseVersionComparison(unittest.TestCase):
     def test_simple_eq(self):
         self.assertTrue(V("1.2.0") == V("1.2.0"))
@@ -193,3 +223,38 @@ class TestMinMaxVersion(unittest.TestCase):
         self.assertFalse(mi >= ma)
         self.assertFalse(mi == ma)
         self.assertTrue(mi != ma)
+
+class TestInterningVersionFactory(unittest.TestCase):
+    def test_shared_instances(self):
+        factory = InterningVersionFactory(V)
+
+        version = factory("1.2.0-alpha")
+        self.assertEqual(version, V("1.2.0-alpha"))
+        self.assertTrue(factory("1.2.0-alpha") is version)
+        self.assertTrue(InterningVersionFactory(V)("1.2.0-alpha") is version)
+        self.assertFalse(factory("1.2.1") is version)
+
+    def test_equal_to_wrapped_factory(self):
+        self.assertEqual(DEFAULT_VERSION_FACTORY, V)
+        self.assertEqual(V, DEFAULT_VERSION_FACTORY)
+        self.assertEqual(InterningVersionFactory(V), DEFAULT_VERSION_FACTORY)
+        self.assertEqual(hash(DEFAULT_VERSION_FACTORY), hash(V))
+        self.assertNotEqual(DEFAULT_VERSION_FACTORY, P)
+
+    def test_cache_info(self):
+        clear_version_cache()
+        hits, misses, maxsize, currsize = version_cache_info()
+        self.assertEqual(currsize, 0)
+
+        DEFAULT_VERSION_FACTORY("1.2.0")
+        DEFAULT_VERSION_FACTORY("1.2.0")
+        DEFAULT_VERSION_FACTORY("1.3.0")
+
+        info = version_cache_info()
+        self.assertEqual(info.hits - hits, 1)
+        self.assertEqual(info.misses - misses, 2)
+        self.assertEqual(info.currsize, 2)
+
+    def test_invalid(self):
+        self.assertRaises(InvalidVersion, lambda: DEFAULT_VERSION_FACTORY("1.2.a"))
+        self.assertRaises(InvalidVersion, lambda: DEFAULT_VERSION_FACTORY("1.2.a"))
@@ -0,0 +1,123 @@
+import unittest
+
+from depsolver.errors \
+    import \
+        DepSolverError
+from depsolver.package \
+    import \
+        PackageInfo
+from depsolver.requirement \
+    import \
+        Requirement
+from depsolver.version \
+    import \
+        SemanticVersion
+from depsolver import pool as pool_module
+from depsolver import version_keys
+
+P = PackageInfo.from_string
+R = Requirement.from_string
+V = SemanticVersion.from_string
+
+REQUIREMENTS = ["numpy", "numpy >= 1.2.0", "numpy > 1.2.0, numpy < 1.5.0",
+                "numpy == 1.3.0", "numpy != 1.3.0", "numpy >= 1.1.0, numpy != 1.3.0, numpy <= 1.4.0",
+                "numpy == 2.0.0", "numpy > 2.0.0", "numpy < 1.0.0",
+                "numpy == 1.3.0, numpy == 1.4.0"]
+
+@unittest.skipIf(not version_keys.HAS_NUMPY, "NumPy is not available")
+class TestVersionKeys(unittest.TestCase):
+    def setUp(self):
+        self.versions = [V(s) for s in ["1.0.0", "1.1.0", "1.2.0", "1.2.0", "1.3.0",
+                                        "1.4.0-rc1", "1.4.0", "1.4.0", "1.5.0"]]
+
+    def test_pack_versions(self):
+        distinct_versions, keys = version_keys.pack_versions(self.versions)
+
+        self.assertEqual(distinct_versions, sorted(set(self.versions)))
+        self.assertEqual(keys.tolist(), [0, 1, 2, 2, 3, 4, 5, 5, 6])
+
+    def test_match_mask(self):
+        distinct_versions, keys = version_keys.pack_versions(self.versions)
+
+        for requirement_string in REQUIREMENTS:
+            requirement = R(requirement_string)
+            mask = version_keys.match_mask(requirement, distinct_versions, keys)
+            self.assertEqual(mask.tolist(),
+                             [requirement.intervals.contains(v) for v in self.versions],
+                             requirement_string)
+
+    def test_pool(self):
+        packages = [P("numpy-%s" % v) for v in self.versions]
+        old_threshold = pool_module._MATCH_MASK_THRESHOLD
+        pool_module._MATCH_MASK_THRESHOLD = 1
+        try:
+            pool = pool_module.Pool([pool_module.Repository(packages)])
+            for requirement_string in REQUIREMENTS:
+                requirement = R(requirement_string)
+                self.assertEqual(pool.what_provides(requirement),
+                                 [p for p in packages if requirement.intervals.contains(p.version)])
+            self.assertTrue("numpy" in pool._version_keys_by_name)
+
+            pool.add_repository(pool_module.Repository([P("numpy-1.3.1")]))
+            self.assertFalse("numpy" in pool._version_keys_by_name)
+            self.assertEqual([str(p.version) for p in pool.what_provides(R("numpy >= 1.3.0, numpy < 1.4.0"))],
+                             ["1.3.0", "1.4.0-rc1", "1.3.1"])
+        finally:
+            pool_module._MATCH_MASK_THRESHOLD = old_threshold
+
+    def _check_what_provides(self, pool):
+        packages = pool.what_provides(R("numpy"))
+        for requirement_string in REQUIREMENTS:
+            requirement = R(requirement_string)
+            self.assertEqual(pool.what_provides(requirement),
+                             [p for p in packages if requirement.intervals.contains(p.version)],
+                             requirement_string)
+
+    def test_pool_remove_repository(self):
+        old_threshold = pool_module._MATCH_MASK_THRESHOLD
+        pool_module._MATCH_MASK_THRESHOLD = 1
+        try:
+            repository = pool_module.Repository([P("numpy-%s" % v) for v in self.versions])
+            extra = pool_module.Repository([P("numpy-1.3.1"), P("numpy-1.6.0")], "extra")
+            pool = pool_module.Pool([repository, extra])
+            self._check_what_provides(pool)
+            self.assertTrue("numpy" in pool._version_keys_by_name)
+
+            pool.remove_repository(extra)
+            self.assertFalse("numpy" in pool._version_keys_by_name)
+            self._check_what_provides(pool)
+            self.assertEqual([str(p.version) for p in pool.what_provides(R("numpy > 1.3.0"))],
+                             ["1.4.0-rc1", "1.4.0", "1.4.0", "1.5.0"])
+        finally:
+            pool_module._MATCH_MASK_THRESHOLD = old_threshold
+
+    def test_pool_replace_repository(self):
+        old_threshold = pool_module._MATCH_MASK_THRESHOLD
+        pool_module._MATCH_MASK_THRESHOLD = 1
+        try:
+            repository = pool_module.Repository([P("numpy-%s" % v) for v in self.versions])
+            pool = pool_module.Pool([repository])
+            self._check_what_provides(pool)
+            self.assertTrue("numpy" in pool._version_keys_by_name)
+
+            # Only unchanged packages: they are replaced in place
+            pool.replace_repository(repository,
+                    pool_module.Repository([P("numpy-%s" % v) for v in self.versions]))
+            self.assertFalse("numpy" in pool._version_keys_by_name)
+            self._check_what_provides(pool)
+
+            # Removed and added packages
+            new_repository = pool_module.Repository([P("numpy-%s" % v) for v in
+                    ["1.0.0", "1.3.0", "1.3.1", "2.0.0"]])
+            pool.replace_repository(pool.repositories[0], new_repository)
+            self.assertFalse("numpy" in pool._version_keys_by_name)
+            self._check_what_provides(pool)
+            self.assertEqual([str(p.version) for p in pool.what_provides(R("numpy >= 1.3.0"))],
+                             ["1.3.0", "1.3.1", "2.0.0"])
+        finally:
+            pool_module._MATCH_MASK_THRESHOLD = old_threshold
+
+@unittest.skipIf(version_keys.HAS_NUMPY, "NumPy is available")
+class TestVersionKeysWithoutNumPy(unittest.TestCase):
+    def test_error(self):
+        self.assertRaises(DepSolverError, lambda: version_keys.pack_versions([V("1.0.0")]))
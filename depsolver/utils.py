@@ -3,6 +3,9 @@ import copy
 
 import six
 
+from .compat \
+    import \
+        OrderedDict
 from .errors \
     import \
         DepSolverError
@@ -106,6 +109,21 @@ class Scheduler(object):
         else:
             return res
 
+    def remove(self, name):
+        """
+        Remove the given name, and every constraint involving it.
+
+        Parameters
+        ----------
+        name: str
+            The name to remove.
+        """
+        self.names.pop(name, None)
+        self.before.pop(name, None)
+        for before in six.itervalues(self.before):
+            if name in before:
+                before.remove(name)
+
     def compute_priority(self):
         """
         Compute the name -> priority dictionary.
@@ -129,12 +147,80 @@ class CachedScheduler(object):
         self._cached = None
         self._scheduler.set_constraints(name, after, before)
 
+    def remove(self, name):
+        self._cached = None
+        self._scheduler.remove(name)
+
     def compute_priority(self):
         if self.invalidated:
             res = self._scheduler.compute_priority()
             self._cached = res
         return self._cached
 
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+class LRUCache(object):
+    """
+    Simple mapping which keeps at most maxsize items, discarding the least
+    recently used ones first.
+
+    Parameters
+    ----------
+    maxsize: int or None
+        Maximum number of items kept in the cache. If None, the cache is
+        unbounded.
+    """
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Return the value for key if in the cache, default otherwise. A
+        successful lookup marks the key as the most recently used one.
+        """
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        else:
+            self.hits += 1
+            self._data[key] = value
+            return value
+
+    def __setitem__(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def keys(self):
+        """Return the list of keys, from the least to the most recently
+        used."""
+        return list(self._data)
+
+    def pop(self, key, default=None):
+        """Remove key from the cache, and return its value (default if key is
+        not in the cache)."""
+        return self._data.pop(key, default)
+
+    def clear(self):
+        """Remove every item from the cache (hit/miss counters are kept)."""
+        self._data.clear()
+
+    def info(self):
+        """Return a CacheInfo (hits, misses, maxsize, currsize) tuple."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
 class Callable(TraitType):
     info_text = "a callable object"
 
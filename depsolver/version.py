@@ -5,6 +5,9 @@ import re
 from .errors \
     import \
         InvalidVersion
+from .utils \
+    import \
+        LRUCache
 
 PART = r"[0-9a-zA-Z-]+"
 
@@ -50,6 +53,22 @@ def _compute_comparable_parts(parts):
             comparable_parts.append(part)
     return tuple(part for part in comparable_parts)
 
+# Tags of the parts of a pre-release or build key: numeric parts sort before
+# alphanumeric ones
+_NUMERIC_PART = 0
+_ALPHANUMERIC_PART = 1
+
+def _tagged_parts(comparable_parts):
+    """Turn comparable parts into a tuple of (tag, value) pairs, which never
+    compares ints with strings."""
+    return tuple((_NUMERIC_PART, part) if isinstance(part, int) else (_ALPHANUMERIC_PART, part)
+                 for part in comparable_parts)
+
+# A version without pre-release sorts after all its pre-releases
+_NO_PRE_RELEASE_KEY = (1,)
+# A version without build sorts before all its builds
+_NO_BUILD_KEY = ()
+
 class PreReleaseVersion(object):
     @classmethod
     def from_string(cls, s):
@@ -156,7 +175,7 @@ class BuildVersion(object):
         return not self <= other
 
 class Version(object):
-    pass
+    __slots__ = ()
 
 class SemanticVersion(Version):
     """Create a SemanticVersion instance
@@ -177,7 +196,13 @@ class SemanticVersion(Version):
         The pre release part of the version
     build: BuildVersion
         The build version part of the version
+
+    Comparisons and hashing use a key computed once at construction: a tuple
+    of ints and (tag, value) pairs, compared natively.
     """
+    __slots__ = ["major", "minor", "patch", "pre_release", "build", "parts",
+                 "_key", "_hash"]
+
     @classmethod
     def from_string(cls, version_string):
         """Creates a SemanticVersion instance from a string specifiction
@@ -241,9 +266,22 @@ class SemanticVersion(Version):
         if self.build:
             self.parts.append(self.build.parts)
 
-        self._comparable_parts = [self.major, self.minor, self.patch]
-        self._comparable_parts.append(self.pre_release)
-        self._comparable_parts.append(self.build)
+        if self.pre_release:
+            pre_release_key = (0,) + _tagged_parts(self.pre_release._comparable_parts)
+        else:
+            pre_release_key = _NO_PRE_RELEASE_KEY
+        if self.build:
+            build_key = _tagged_parts(self.build._comparable_parts)
+        else:
+            build_key = _NO_BUILD_KEY
+        self._key = (self.major, self.minor, self.patch, pre_release_key, build_key)
+        self._hash = hash(self._key)
+
+    @property
+    def sort_key(self):
+        """Total order key of this version: a tuple, such as comparing the
+        keys of two versions gives the same result as comparing them."""
+        return self._key
 
     # Comparison API
     def _ensure_can_compare(self, other):
@@ -269,37 +307,41 @@ class SemanticVersion(Version):
         return s
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
 
     def __eq__(self, other):
         if other is None:
             return False
         if not isinstance(other, SemanticVersion):
             return NotImplemented
-        self._ensure_can_compare(other)
-        return self._comparable_parts == other._comparable_parts
+        return self._key == other._key
 
     def __ne__(self, other):
         if other is None:
             return True
         if not isinstance(other, SemanticVersion):
             return NotImplemented
-        return not self.__eq__(other)
+        return self._key != other._key
 
     def __lt__(self, other):
         if not isinstance(other, SemanticVersion):
             return NotImplemented
-        self._ensure_can_compare(other)
-        return self._comparable_parts < other._comparable_parts
+        return self._key < other._key
 
     def __le__(self, other):
-        return self < other or self == other
+        if not isinstance(other, SemanticVersion):
+            return NotImplemented
+        return self._key <= other._key
 
     def __gt__(self, other):
-        return not (self < other or self == other)
+        if not isinstance(other, SemanticVersion):
+            return NotImplemented
+        return self._key > other._key
 
     def __ge__(self, other):
-        return self > other or self == other
+        if not isinstance(other, SemanticVersion):
+            return NotImplemented
+        return self._key >= other._key
 
 class MinVersion(Version):
     """Subclass of Version such as MinVersion() < v for any Version instance v
@@ -348,3 +390,63 @@ class MaxVersion(Version):
 
     def __hash__(self):
         return hash("MaxVersion")
+
+# Maximum number of (version factory, version string) pairs whose version is
+# kept by InterningVersionFactory instances
+_VERSION_CACHE_SIZE = 65536
+
+# (version factory, version string) -> version, shared by every
+# InterningVersionFactory
+_VERSION_CACHE = LRUCache(_VERSION_CACHE_SIZE)
+
+def version_cache_info():
+    """Return the (hits, misses, maxsize, currsize) statistics of the cache
+    shared by the InterningVersionFactory instances."""
+    return _VERSION_CACHE.info()
+
+def clear_version_cache():
+    """Empty the cache shared by the InterningVersionFactory instances."""
+    _VERSION_CACHE.clear()
+
+class InterningVersionFactory(object):
+    """A version factory returning a shared instance for each version string.
+
+    Versions are immutable, so every package and requirement parsed with the
+    same factory from the same string can share a single instance, and the
+    string is only parsed once (as long as it stays in the cache, see
+    version_cache_info).
+
+    An InterningVersionFactory compares equal to the factory it wraps, as
+    they create equal versions.
+
+    Arguments
+    ---------
+    factory: callable
+        The wrapped version factory, e.g. SemanticVersion.from_string
+    """
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __call__(self, version_string):
+        key = (self.factory, version_string)
+        version = _VERSION_CACHE.get(key)
+        if version is None:
+            version = _VERSION_CACHE[key] = self.factory(version_string)
+        return version
+
+    def __eq__(self, other):
+        if isinstance(other, InterningVersionFactory):
+            return self.factory == other.factory
+        return self.factory == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.factory)
+
+    def __repr__(self):
+        return "InterningVersionFactory(%r)" % (self.factory,)
+
+#: Default version factory: interned semantic versions
+DEFAULT_VERSION_FACTORY = InterningVersionFactory(SemanticVersion.from_string)
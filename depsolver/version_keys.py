@@ -0,0 +1,84 @@
+"""Batch requirement matching over arrays of packed version keys.
+
+The versions of one package name are packed into integer keys: the key of a
+version is its rank among the sorted distinct versions of that name, so that
+comparing keys is the same as comparing versions. A requirement is then
+matched against all the versions at once, by turning each interval of its
+IntervalSet into a range of keys.
+
+This needs NumPy, which is an optional dependency: HAS_NUMPY tells whether it
+is available, and the functions below raise DepSolverError if it is not.
+"""
+import bisect
+
+from .errors \
+    import \
+        DepSolverError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+def _ensure_numpy():
+    if np is None:
+        raise DepSolverError("Batch requirement matching requires NumPy")
+
+def pack_versions(versions):
+    """Pack a sorted sequence of versions into keys.
+
+    Arguments
+    ---------
+    versions: seq
+        Versions of one package name, sorted (equal versions may appear
+        several times).
+
+    Returns
+    -------
+    distinct_versions: list
+        The sorted distinct versions. distinct_versions[key] is the version
+        of the given key.
+    keys: numpy array
+        The int64 key of each of the given versions.
+    """
+    _ensure_numpy()
+    distinct_versions = []
+    keys = np.empty(len(versions), dtype=np.int64)
+    for i, version in enumerate(versions):
+        if len(distinct_versions) == 0 or version != distinct_versions[-1]:
+            distinct_versions.append(version)
+        keys[i] = len(distinct_versions) - 1
+    return distinct_versions, keys
+
+def match_mask(requirement, distinct_versions, keys):
+    """Returns the boolean mask of the keys whose version matches the given
+    requirement.
+
+    Arguments
+    ---------
+    requirement: Requirement
+        The requirement to match. Only its version constraints are used: the
+        keys are assumed to be versions of a package with the requirement's
+        name.
+    distinct_versions: list
+        Sorted distinct versions the keys refer to, as returned by
+        pack_versions.
+    keys: numpy array
+        Version keys, as returned by pack_versions.
+    """
+    _ensure_numpy()
+    mask = np.zeros(len(keys), dtype=bool)
+    for low, low_closed, high, high_closed in requirement.intervals.intervals:
+        if low_closed:
+            start = bisect.bisect_left(distinct_versions, low)
+        else:
+            start = bisect.bisect_right(distinct_versions, low)
+        if high_closed:
+            end = bisect.bisect_right(distinct_versions, high)
+        else:
+            end = bisect.bisect_left(distinct_versions, high)
+        if start < end:
+            mask |= (keys >= start) & (keys < end)
+    return mask